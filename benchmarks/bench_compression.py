@@ -0,0 +1,66 @@
+"""
+Measure the bytes-on-wire vs CPU trade-off of compressing execute payloads.
+
+For each payload size and algorithm, reports the JSON envelope size, the
+client-side cost of serialize + compress + encrypt, and the estimated
+end-to-end send time (CPU + transfer) on a 10 Mbit/s and a 100 Mbit/s link.
+
+Run with: python benchmarks/bench_compression.py
+"""
+
+import os
+import random
+import timeit
+
+from lynkr.compression import Compression
+from lynkr.crypto import hybrid_encrypt
+from lynkr.utils import serialization
+
+SIZES = (512, 4_096, 65_536, 1_048_576)
+LINKS = {"10Mbit": 10e6 / 8, "100Mbit": 100e6 / 8}
+WORDS = "account order invoice shipped pending refund customer address attachment report".split()
+
+
+def make_payload(size):
+    """Email-like schema data of roughly ``size`` serialized bytes."""
+    rng = random.Random(size)
+    body = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS) if rng.random() < 0.9 else os.urandom(4).hex()
+        body.append(word)
+        length += len(word) + 1
+    return {"ref_id": "ref_1", "schema": {"fields": {
+        "to": {"value": "someone@example.com"},
+        "body": {"value": " ".join(body)},
+        "attachments": {"value": [f"file_{i}.pdf" for i in range(size // 2048)]},
+    }}}
+
+
+def main():
+    prewrapped = (os.urandom(32), os.urandom(256))
+    algorithms = [None, Compression("gzip", threshold=0)]
+    try:
+        algorithms.append(Compression("zstd", threshold=0))
+    except Exception:
+        print("zstandard not installed, skipping zstd")
+
+    print(f"{'size':>9} {'algo':>5} {'wire B':>9} {'cpu us':>9}" + "".join(f" {name + ' ms':>11}" for name in LINKS))
+    for size in SIZES:
+        payload = make_payload(size)
+        number = max(3, 200_000 // size)
+        for compression in algorithms:
+            options = {"compression": compression} if compression else {}
+
+            def send():
+                return serialization.dumps(hybrid_encrypt(payload, None, prewrapped=prewrapped, **options)[0])
+
+            wire = len(send())
+            cpu = min(timeit.repeat(send, number=number, repeat=5)) / number
+            name = compression.algorithm if compression else "none"
+            totals = "".join(f" {(cpu + wire / rate) * 1e3:>11.3f}" for rate in LINKS.values())
+            print(f"{size:>9} {name:>5} {wire:>9} {cpu * 1e6:>9.1f}{totals}")
+
+
+if __name__ == "__main__":
+    main()
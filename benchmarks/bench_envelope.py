@@ -0,0 +1,65 @@
+"""
+Compare the JSON and binary execute envelopes.
+
+Reports bytes on the wire and the client-side cost of building a request
+body and decoding a response for a range of payload sizes.
+
+Run with: python benchmarks/bench_envelope.py
+"""
+
+import base64
+import os
+import timeit
+
+from lynkr.crypto import decrypt_with_aes, encrypt_with_aes, get_public_key, hybrid_encrypt
+from lynkr.envelope import decrypt_envelope, encrypt_envelope, hybrid_encrypt_binary, parse_envelope
+from lynkr.utils import serialization
+
+SIZES = (1_000, 100_000, 5_000_000)
+
+
+def json_response(data, aes_key):
+    ciphertext, iv, tag = encrypt_with_aes(data, aes_key)
+    return serialization.dumps({"data": {
+        "payload": base64.b64encode(ciphertext).decode(),
+        "iv": base64.b64encode(iv).decode(),
+        "tag": base64.b64encode(tag).decode(),
+    }})
+
+
+def decode_json(body, aes_key):
+    data = serialization.loads(body)["data"]
+    return decrypt_with_aes(
+        base64.b64decode(data["payload"]), aes_key, base64.b64decode(data["iv"]), base64.b64decode(data["tag"])
+    )
+
+
+def bench(func, number):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    public_key = get_public_key()
+    aes_key = os.urandom(32)
+    prewrapped = (aes_key, os.urandom(256))
+    print(f"{'size':>10} {'mode':>7} {'request B':>11} {'response B':>11} {'encode us':>11} {'decode us':>11}")
+    for size in SIZES:
+        payload = {"ref_id": "ref_1", "schema": {"fields": {"body": {"value": "x" * size}}}}
+        data = os.urandom(size)
+        number = max(1, 2_000_000 // size)
+
+        request = serialization.dumps(hybrid_encrypt(payload, public_key, prewrapped=prewrapped)[0])
+        response = json_response(data, aes_key)
+        encode = bench(lambda: serialization.dumps(hybrid_encrypt(payload, public_key, prewrapped=prewrapped)[0]), number)
+        decode = bench(lambda: decode_json(response, aes_key), number)
+        print(f"{size:>10} {'json':>7} {len(request):>11} {len(response):>11} {encode:>11.1f} {decode:>11.1f}")
+
+        request = bytes(hybrid_encrypt_binary(payload, public_key, prewrapped)[0])
+        response = bytes(encrypt_envelope(data, aes_key))
+        encode = bench(lambda: bytes(hybrid_encrypt_binary(payload, public_key, prewrapped)[0]), number)
+        decode = bench(lambda: decrypt_envelope(parse_envelope(response), aes_key), number)
+        print(f"{size:>10} {'binary':>7} {len(request):>11} {len(response):>11} {encode:>11.1f} {decode:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
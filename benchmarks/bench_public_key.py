@@ -0,0 +1,46 @@
+"""
+Benchmark the per-execute cost of obtaining the RSA public key.
+
+Compares reading and parsing ``public_key.pem`` on every call (the old
+``execute`` behaviour) with the cached keyring lookup.
+
+Run with: python benchmarks/bench_public_key.py
+"""
+
+import timeit
+
+from lynkr.crypto import DEFAULT_PUBLIC_KEY_PATH, get_public_key, hybrid_encrypt, load_public_key
+
+PAYLOAD = {"ref_id": "ref_123", "schema": {"fields": {"name": {"value": "Alice"}}}}
+
+
+def per_call_load():
+    return load_public_key(DEFAULT_PUBLIC_KEY_PATH)
+
+
+def keyring_lookup():
+    return get_public_key()
+
+
+def execute_before():
+    hybrid_encrypt(PAYLOAD, load_public_key(DEFAULT_PUBLIC_KEY_PATH))
+
+
+def execute_after():
+    hybrid_encrypt(PAYLOAD, get_public_key())
+
+
+def main():
+    get_public_key()  # warm the keyring
+    for name, func, number in (
+        ("key: load_public_key per call", per_call_load, 2000),
+        ("key: keyring lookup", keyring_lookup, 200000),
+        ("execute encrypt: before", execute_before, 2000),
+        ("execute encrypt: after", execute_after, 2000),
+    ):
+        best = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f"{name:<32} {best * 1e6:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark the memory held by 10,000 cached schemas.
+
+Each schema is decoded from its own JSON document, as get_schema does, so
+nothing is shared between them up front. The schemas are drawn from a pool
+of services whose fields reuse common names and definitions, like real API
+responses. "dict" keeps the decoded dictionaries, which is what Schema held
+before it switched to interned field descriptors.
+
+Run with: python benchmarks/bench_schema_memory.py
+"""
+
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from lynkr.schema import Schema
+
+N_SCHEMAS = 10_000
+N_SERVICES = 500
+TYPES = ["string", "string", "string", "integer", "boolean", "array", "object"]
+COMMON_FIELDS = ["to", "from", "subject", "body", "api_key", "user_id", "email", "name", "limit", "cursor"]
+
+
+class DictSchema:
+    """The previous representation: the decoded response plus two cache dicts."""
+
+    def __init__(self, schema_data):
+        self._schema = schema_data
+        self._validators = {}
+        self._templates = {}
+
+
+def make_documents(rng):
+    services = []
+    for service in range(N_SERVICES):
+        names = rng.sample(COMMON_FIELDS, 4) + [f"service_{service}_field_{i}" for i in range(rng.randint(2, 12))]
+        fields = {}
+        for name in names:
+            spec = {"type": rng.choice(TYPES), "optional": rng.random() < 0.4, "sensitive": name == "api_key"}
+            if rng.random() < 0.3:
+                spec["description"] = f"The {name.replace('_', ' ')}"
+            fields[name] = spec
+        services.append(json.dumps({
+            "fields": fields,
+            "required_fields": [name for name, spec in fields.items() if not spec["optional"]],
+            "optional_fields": [name for name, spec in fields.items() if spec["optional"]],
+            "sensitive_fields": [name for name, spec in fields.items() if spec["sensitive"]],
+        }))
+    return [rng.choice(services) for _ in range(N_SCHEMAS)]
+
+
+def measure(factory, documents):
+    """Return (bytes held, seconds to decode and build) for one representation."""
+    started = time.perf_counter()
+    held = [factory(json.loads(document)) for document in documents]
+    elapsed = time.perf_counter() - started
+    del held
+
+    gc.collect()
+    tracemalloc.start()
+    held = [factory(json.loads(document)) for document in documents]
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current, elapsed
+
+
+def main():
+    documents = make_documents(random.Random(0))
+    results = {}
+    for name, factory in (("dict", DictSchema), ("Schema", Schema)):
+        current, elapsed = measure(factory, documents)
+        results[name] = current
+        print(
+            f"{name:<8} {current / 2**20:8.2f} MiB   {current / N_SCHEMAS:8.0f} B/schema   "
+            f"decode+build {elapsed / N_SCHEMAS * 1e6:6.1f} us/schema"
+        )
+    print(f"Schema holds {results['Schema'] / results['dict']:.0%} of the dict representation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark Schema.validate against the pre-compilation implementation.
+
+Run with: python benchmarks/bench_schema_validate.py
+"""
+
+import timeit
+
+from lynkr.schema import Schema
+
+TYPES = ["string", "integer", "number", "boolean", "array", "object"]
+VALUES = {"string": "x", "integer": 1, "number": 1.5, "boolean": True, "array": [], "object": {}}
+
+
+def make_schema(n_fields):
+    fields = {f"field_{i}": {"type": TYPES[i % len(TYPES)]} for i in range(n_fields)}
+    return {
+        "fields": fields,
+        "required_fields": [f"field_{i}" for i in range(0, n_fields, 2)],
+    }
+
+
+def make_payload(schema_data):
+    return {name: VALUES[spec["type"]] for name, spec in schema_data["fields"].items()}
+
+
+def legacy_validate(schema_data, data):
+    """The if/elif implementation Schema.validate used before compile()."""
+    errors = []
+    for field in schema_data.get("required_fields", []):
+        if field not in data:
+            errors.append(f"Missing required field: {field}")
+    fields = schema_data.get("fields", {})
+    for field_name, field_value in data.items():
+        if field_name in fields:
+            field_type = fields[field_name].get("type")
+            if field_type == "string" and not isinstance(field_value, str):
+                errors.append(f"Field '{field_name}' must be a string")
+            elif field_type == "number" and not isinstance(field_value, (int, float)):
+                errors.append(f"Field '{field_name}' must be a number")
+            elif field_type == "integer" and not isinstance(field_value, int):
+                errors.append(f"Field '{field_name}' must be an integer")
+            elif field_type == "boolean" and not isinstance(field_value, bool):
+                errors.append(f"Field '{field_name}' must be a boolean")
+            elif field_type == "array" and not isinstance(field_value, list):
+                errors.append(f"Field '{field_name}' must be an array")
+            elif field_type == "object" and not isinstance(field_value, dict):
+                errors.append(f"Field '{field_name}' must be an object")
+    return errors
+
+
+def main():
+    for n_fields in (5, 20, 100):
+        schema_data = make_schema(n_fields)
+        schema = Schema(schema_data)
+        payload = make_payload(schema_data)
+        invalid = {name: object() for name in list(payload)[1:]}
+        assert legacy_validate(schema_data, payload) == schema.validate(payload) == []
+        assert legacy_validate(schema_data, invalid) == schema.validate(invalid)
+
+        number = max(200000 // n_fields, 1000)
+        for label, func in (
+            ("legacy", lambda: legacy_validate(schema_data, payload)),
+            ("compiled", lambda: schema.validate(payload)),
+            ("legacy invalid", lambda: legacy_validate(schema_data, invalid)),
+            ("compiled invalid", lambda: schema.validate(invalid)),
+            ("compiled fail-fast", lambda: schema.validate(invalid, fail_fast=True)),
+        ):
+            best = min(timeit.repeat(func, number=number, repeat=5)) / number
+            print(f"{n_fields:>4} fields  {label:<20} {best * 1e6:8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark Schema.validate_many against validating records one at a time.
+
+Run with: python benchmarks/bench_schema_validate_many.py
+"""
+
+import time
+
+from lynkr.schema import Schema
+
+try:
+    import numpy
+except ImportError:  # NumPy columns are benchmarked only when available
+    numpy = None
+
+N_ROWS = 50000
+TYPES = ["string", "integer", "number", "boolean"]
+VALUES = {"string": "x", "integer": 1, "number": 1.5, "boolean": True}
+
+
+def make_schema(n_fields):
+    fields = {f"field_{i}": {"type": TYPES[i % len(TYPES)]} for i in range(n_fields)}
+    return {"fields": fields, "required_fields": list(fields)}
+
+
+def make_rows(schema_data, n_rows):
+    row = {name: VALUES[spec["type"]] for name, spec in schema_data["fields"].items()}
+    rows = [dict(row) for _ in range(n_rows)]
+    for i in range(0, n_rows, 100):
+        rows[i]["field_1"] = "bad"  # 1% invalid
+    return rows
+
+
+def timed(func):
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    for n_fields in (8, 32):
+        schema_data = make_schema(n_fields)
+        schema = Schema(schema_data)
+        rows = make_rows(schema_data, N_ROWS)
+        columns = {name: [row[name] for row in rows] for name in schema_data["fields"]}
+
+        cases = [
+            ("validate() per row", lambda: [schema.validate(row) for row in rows]),
+            ("validate_many(rows)", lambda: schema.validate_many(rows)),
+            ("validate_many(columns)", lambda: schema.validate_many(columns)),
+        ]
+        if numpy is not None:
+            arrays = {
+                name: numpy.array(values, dtype=object if name == "field_1" else None)
+                for name, values in columns.items()
+            }
+            cases.append(("validate_many(numpy)", lambda: schema.validate_many(arrays)))
+
+        for label, func in cases:
+            print(f"{N_ROWS} rows x {n_fields:>2} fields  {label:<24} {timed(func) * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark JSON serialization on the execute path with each installed backend.
+
+Measures encoding the execute payload, encoding the encrypted envelope,
+decoding a response envelope and decoding a large decrypted result, plus
+the old ``json.dumps(...).encode()`` / ``response.json()`` pattern.
+
+Run with: python benchmarks/bench_serialization.py
+"""
+
+import json
+import timeit
+
+from lynkr.crypto import get_public_key, hybrid_encrypt
+from lynkr.exceptions import ConfigurationError
+from lynkr.utils import serialization
+
+PAYLOAD = {
+    "ref_id": "ref_123",
+    "schema": {"fields": {f"field_{i}": {"value": f"value {i}"} for i in range(20)}},
+}
+ENVELOPE, _ = hybrid_encrypt(PAYLOAD, get_public_key())
+RESULT = json.dumps({"rows": [{"id": i, "name": f"user {i}", "score": i * 0.5, "active": i % 2 == 0} for i in range(5000)]}).encode()
+RESPONSE = json.dumps({"data": ENVELOPE}).encode()
+
+
+def bench(name, func, number):
+    best = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"{name:<36} {best * 1e6:10.2f} us/call")
+
+
+def main():
+    print("[stdlib, before]")
+    bench("payload dumps", lambda: json.dumps(PAYLOAD).encode(), 20000)
+    bench("envelope dumps", lambda: json.dumps(ENVELOPE).encode(), 20000)
+    bench("response loads", lambda: json.loads(RESPONSE.decode()), 20000)
+    bench("5000-row result loads", lambda: json.loads(RESULT.decode()), 50)
+
+    for name in serialization.BACKENDS:
+        try:
+            serialization.set_backend(name)
+        except ConfigurationError:
+            print(f"[{name}] not installed")
+            continue
+        dumps, loads = serialization.dumps, serialization.loads
+        print(f"[{name}]")
+        bench("payload dumps", lambda: dumps(PAYLOAD), 20000)
+        bench("envelope dumps", lambda: dumps(ENVELOPE), 20000)
+        bench("response loads", lambda: loads(RESPONSE), 20000)
+        bench("5000-row result loads", lambda: loads(RESULT), 50)
+    serialization.set_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Microbenchmark suite for the SDK hot paths.
+
+Measures per-call time and peak allocation of hybrid_encrypt,
+decrypt_with_aes, Schema.validate, Schema.template,
+KeyManager.match_keys_to_schema, get_schema response parsing and the
+execute path across payload and schema sizes, and compares the results
+with a stored baseline. Execute runs against an in-process stub transport,
+so the suite needs no network.
+
+The bench_*.py scripts next to this file compare alternative
+implementations; this suite guards the current one against regressions.
+
+Run with: python benchmarks/suite.py
+    --save                  record the results as the new baseline
+    --threshold 0.3         fail when a case is more than 30% slower than
+                            the baseline (the default)
+    --alloc-threshold 0.1   fail when a case's peak allocation grows by more
+                            than 10% (the default)
+    -k encrypt              only run cases whose name contains "encrypt"
+
+Timings are machine-dependent: record the baseline on the machine that runs
+the check. When the baseline comes from a different Python version, machine
+or JSON backend, only allocations are compared. Cases that look slower are
+measured a second time before being reported, to filter out scheduler noise.
+"""
+
+import argparse
+import base64
+import json
+import os
+import platform
+import sys
+import timeit
+import tracemalloc
+import typing as t
+
+import requests
+from requests.adapters import BaseAdapter
+
+from lynkr.client import LynkrClient
+from lynkr.crypto import decrypt_with_aes, encrypt_with_aes, get_public_key, hybrid_encrypt
+from lynkr.keys.key_manager import KeyManager
+from lynkr.schema import Schema
+from lynkr.utils import serialization
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BASE_URL = "https://api.lynkr.test"
+
+PAYLOAD_SIZES = (1_000, 64_000, 1_000_000)
+SCHEMA_SIZES = (10, 100, 1_000)
+KEY_COUNTS = (5, 100)
+TYPES = ("string", "integer", "number", "boolean", "array", "object")
+VALUES = {"string": "x", "integer": 1, "number": 1.5, "boolean": True, "array": [], "object": {}}
+
+# Differences below these are noise, whatever the ratio
+MIN_TIME_DELTA_US = 1.0
+MIN_ALLOC_DELTA_BYTES = 1024
+
+
+class StubAdapter(BaseAdapter):
+    """``requests`` transport that answers every request in-process with a canned body."""
+
+    def __init__(self, body: bytes, content_type: str = "application/json"):
+        super().__init__()
+        self.body = body
+        self.content_type = content_type
+
+    def send(self, request: requests.PreparedRequest, **kwargs: t.Any) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = self.content_type
+        response._content = self.body
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def make_schema(n_fields: int) -> t.Dict[str, t.Any]:
+    fields = {f"field_{i}": {"type": TYPES[i % len(TYPES)]} for i in range(n_fields)}
+    return {"fields": fields, "required_fields": [f"field_{i}" for i in range(0, n_fields, 2)]}
+
+
+def make_data(n_bytes: int) -> t.Dict[str, t.Any]:
+    """Schema data whose serialized size is roughly ``n_bytes``."""
+    n_fields = max(n_bytes // 100, 1)
+    return {f"field_{i}": "v" * 80 for i in range(n_fields)}
+
+
+def label(n: int) -> str:
+    return f"{n // 1_000_000}M" if n >= 1_000_000 else f"{n // 1_000}k" if n >= 1_000 else str(n)
+
+
+def cases() -> t.Iterator[t.Tuple[str, t.Callable[[], t.Any]]]:
+    """Yield (name, zero-argument callable) for every benchmark case."""
+    public_key = get_public_key()
+    aes_key = os.urandom(32)
+
+    for size in PAYLOAD_SIZES:
+        payload = {"ref_id": "ref_1", "schema": {"fields": make_data(size)}}
+        yield f"hybrid_encrypt[{label(size)}]", lambda payload=payload: hybrid_encrypt(payload, public_key)
+
+    for size in PAYLOAD_SIZES:
+        ciphertext, iv, tag = encrypt_with_aes(os.urandom(size), aes_key)
+        yield (
+            f"decrypt_with_aes[{label(size)}]",
+            lambda ciphertext=ciphertext, iv=iv, tag=tag: decrypt_with_aes(ciphertext, aes_key, iv, tag),
+        )
+
+    for n_fields in SCHEMA_SIZES:
+        schema_data = make_schema(n_fields)
+        schema = Schema(schema_data)
+        data = {name: VALUES[spec["type"]] for name, spec in schema_data["fields"].items()}
+        yield f"schema_validate[{n_fields}]", lambda schema=schema, data=data: schema.validate(data)
+        yield f"schema_template[{n_fields}]", lambda schema=schema: schema.template()
+
+    for n_keys in KEY_COUNTS:
+        manager = KeyManager()
+        for i in range(n_keys):
+            manager.add(f"service_{i}", f"secret_{i}", [f"service_{i}_api_key"])
+        for n_fields in SCHEMA_SIZES:
+            required = [f"field_{i}" for i in range(n_fields)] + [f"service_{n_keys - 1}_api_key"]
+            filled = {f"field_{i}": "x" for i in range(0, n_fields, 2)}
+            yield (
+                f"match_keys_to_schema[{n_keys}keys,{n_fields}]",
+                lambda manager=manager, filled=filled, required=required: manager.match_keys_to_schema(filled, required),
+            )
+            # Without the per-signature memo, i.e. a schema seen for the first time
+            yield (
+                f"match_keys_to_schema_cold[{n_keys}keys,{n_fields}]",
+                lambda manager=manager, filled=filled, required=required: (
+                    manager._plans.clear(), manager.match_keys_to_schema(filled, required)
+                ),
+            )
+
+    client = LynkrClient(api_key="bench", base_url=BASE_URL)
+    for n_fields in SCHEMA_SIZES:
+        response = serialization.dumps(
+            {"ref_id": "ref_1", "schema": make_schema(n_fields), "metadata": {"service": "bench"}}
+        )
+        yield (
+            f"parse_schema_response[{n_fields}]",
+            lambda response=response: client._parse_schema_response(serialization.loads(response)),
+        )
+
+    for size in PAYLOAD_SIZES:
+        data = make_data(size)
+        yield (
+            f"build_execute_request[{label(size)}]",
+            lambda data=data: client._build_execute_request(data, "ref_1"),
+        )
+
+    for size in PAYLOAD_SIZES:
+        data = make_data(size)
+        result = serialization.dumps({"rows": [data]})
+        ciphertext, iv, tag = encrypt_with_aes(result, aes_key)
+        response = serialization.dumps({"data": {
+            "payload": base64.b64encode(ciphertext).decode(),
+            "iv": base64.b64encode(iv).decode(),
+            "tag": base64.b64encode(tag).decode(),
+        }})
+        yield (
+            f"parse_execute_response[{label(size)}]",
+            lambda response=response: client._parse_execute_response(serialization.loads(response), aes_key),
+        )
+
+    for size in PAYLOAD_SIZES:
+        stub = LynkrClient(api_key="bench", base_url=BASE_URL)
+        stub.http_client.session.mount("https://", StubAdapter(serialization.dumps({"data": {"id": 1}})))
+        data = make_data(size)
+        yield f"execute[{label(size)}]", lambda stub=stub, data=data: stub.execute(data, ref_id="ref_1")
+
+
+def measure(func: t.Callable[[], t.Any]) -> t.Dict[str, float]:
+    """
+    Time and trace one case.
+
+    Returns:
+        Dictionary with ``us`` (best per-call time in microseconds over five
+        runs) and ``peak_bytes`` (peak traced allocation of a single call)
+    """
+    func()  # warm caches and lazy imports
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = min(timer.repeat(repeat=5, number=number)) / number
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"us": per_call * 1e6, "peak_bytes": peak}
+
+
+def slower(result: t.Dict[str, float], base: t.Dict[str, float], threshold: t.Optional[float]) -> bool:
+    if threshold is None:
+        return False
+    return result["us"] > base["us"] * (1 + threshold) and result["us"] - base["us"] > MIN_TIME_DELTA_US
+
+
+def regressions(
+    results: t.Dict[str, t.Dict[str, float]],
+    baseline: t.Dict[str, t.Dict[str, float]],
+    threshold: t.Optional[float],
+    alloc_threshold: float,
+) -> t.List[str]:
+    """
+    Describe every case that got slower or allocates more than the thresholds allow.
+
+    Timings are not compared when ``threshold`` is None.
+    """
+    found = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if slower(result, base, threshold):
+            found.append(f"{name}: {base['us']:.1f} -> {result['us']:.1f} us")
+        if (
+            result["peak_bytes"] > base["peak_bytes"] * (1 + alloc_threshold)
+            and result["peak_bytes"] - base["peak_bytes"] > MIN_ALLOC_DELTA_BYTES
+        ):
+            found.append(f"{name}: {base['peak_bytes']} -> {result['peak_bytes']} peak bytes")
+    return found
+
+
+def environment() -> t.Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "json_backend": serialization.get_backend().name,
+    }
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed relative slowdown")
+    parser.add_argument("--alloc-threshold", type=float, default=0.1, help="allowed relative allocation growth")
+    parser.add_argument("-k", dest="filter", default="", help="only run cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored["results"]
+        if stored.get("environment") != environment():
+            print(f"note: baseline was recorded on {stored.get('environment')}, comparing allocations only")
+            args.threshold = None
+
+    results = {}
+    print(f"{'case':<44}{'us/call':>12}{'baseline':>12}{'peak KiB':>12}")
+    for name, func in cases():
+        if args.filter not in name:
+            continue
+        result = measure(func)
+        base = baseline.get(name)
+        if base is not None and not args.save and slower(result, base, args.threshold):
+            retry = measure(func)
+            result = retry if retry["us"] < result["us"] else result
+        results[name] = result
+        shown = f"{base['us']:.1f}" if base is not None else "-"
+        print(f"{name:<44}{result['us']:>12.1f}{shown:>12}{result['peak_bytes'] / 1024:>12.1f}")
+
+    if args.save:
+        if args.filter:
+            results = {**baseline, **results}
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"saved baseline to {args.baseline}")
+        return 0
+
+    found = regressions(results, baseline, args.threshold, args.alloc_threshold)
+    if found:
+        print(f"\n{len(found)} regression(s):")
+        for line in found:
+            print(f"  {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
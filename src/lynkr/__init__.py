@@ -7,5 +7,20 @@ This package provides a convenient interface to the Lynkr Service API.
 __version__ = "0.1.11"
 
 from .client import LynkrClient
+from .batch import BatchResult
+from .cache import DiskSchemaCache, SchemaCache
+from .compression import Compression
+from .instrumentation import RequestTrace
+from .key_pool import KeyPool
+from .metrics import Metrics
 
-__all__ = ["LynkrClient"]
\ No newline at end of file
+__all__ = ["LynkrClient", "AsyncLynkrClient", "BatchResult", "SchemaCache", "DiskSchemaCache", "KeyPool", "Compression", "RequestTrace", "Metrics"]
+
+
+def __getattr__(name):
+    # Keep asyncio out of `import lynkr` for sync-only users
+    if name == "AsyncLynkrClient":
+        from .async_client import AsyncLynkrClient
+
+        return AsyncLynkrClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,425 @@
+"""
+Asyncio client module providing a non-blocking interface to the API.
+"""
+
+import asyncio
+import typing as t
+
+from .batch import BatchResult, reorder
+from .cache import DiskSchemaCache, SchemaCache
+from .coalesce import AsyncSingleFlight
+from .compression import Compression
+from .client import _BaseClient
+from .exceptions import ValidationError
+from .instrumentation import DECRYPT, Hook, RequestTrace, timed, traced
+from .metrics import Metrics
+from .schema import Schema
+from .utils import serialization
+from .utils.async_http import AsyncHttpClient
+from .utils.retry import RetryPolicy
+from .utils.streaming import ResponseStreamDecoder
+
+
+class AsyncLynkrClient(_BaseClient):
+    """
+    Asyncio Lynkr client for interacting with the API service.
+
+    Mirrors :class:`~lynkr.client.LynkrClient` but every network call is a
+    coroutine running over a pooled, non-blocking connection set, so many
+    requests can be in flight from a single event loop.
+
+    Requires the ``async`` extra (``pip install lynkr[async]``).
+
+    Args:
+        api_key: API key for authentication
+        base_url: Base URL for the API (defaults to https://api.lynkr.ca)
+        timeout: Request timeout in seconds (default is 30)
+        max_connections: Maximum number of concurrent connections (default is 100)
+        max_keepalive_connections: Maximum number of idle keep-alive connections (default is 20)
+        pool_idle_timeout: Close connections idle for longer than this many seconds (default is 5)
+        retry: Retry policy for get_schema and idempotency-keyed executes
+            (defaults to RetryPolicy(); pass RetryPolicy(max_attempts=1) to disable)
+        public_key: RSA public key (loaded key or PEM bytes/str) used to encrypt
+            execute payloads; defaults to the key bundled with the SDK
+        key_id: Keyring id the public key is stored and looked up under;
+            defaults to the public key's fingerprint when public_key is
+            given, else to the bundled key
+        schema_cache: Optional SchemaCache used to serve repeated get_schema calls
+        key_pool_size: Keep this many AES keys pre-wrapped with the public key
+            by a background thread, taking RSA-OAEP off the execute path
+            (default is 0, disabled)
+        binary_transport: Send execute requests as binary envelopes
+            (application/octet-stream) instead of base64 fields in JSON
+        compression: Compression used for execute payloads sent with
+            ``compress=True``, either "gzip", "zstd" or a Compression with a
+            custom threshold/level
+        hooks: Callables receiving a RequestTrace with per-phase timings after
+            every API call (see add_hook)
+        metrics: Metrics collector recording latency and error counts per
+            endpoint and service; may be shared between clients
+        share_ref_id: Let a task that has not called get_schema execute
+            against the latest ref_id from any task (default is True); set
+            to False when one client serves many concurrent tasks
+        coalesce_schema: Let concurrent get_schema calls for the same request
+            share one API request (default is False); counters are
+            available from ``schema_flight.stats()``
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "https://api.lynkr.ca",
+        timeout: int = 30,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        pool_idle_timeout: t.Optional[float] = 5.0,
+        public_key: t.Any = None,
+        key_id: t.Optional[str] = None,
+        schema_cache: t.Optional[SchemaCache] = None,
+        retry: t.Optional[RetryPolicy] = None,
+        key_pool_size: int = 0,
+        binary_transport: bool = False,
+        compression: t.Union[str, Compression, None] = None,
+        hooks: t.Optional[t.Sequence[Hook]] = None,
+        metrics: t.Optional[Metrics] = None,
+        share_ref_id: bool = True,
+        coalesce_schema: bool = False,
+    ):
+        super().__init__(
+            api_key=api_key,
+            base_url=base_url,
+            public_key=public_key,
+            key_id=key_id,
+            schema_cache=schema_cache,
+            key_pool_size=key_pool_size,
+            binary_transport=binary_transport,
+            compression=compression,
+            hooks=hooks,
+            metrics=metrics,
+            share_ref_id=share_ref_id,
+        )
+        self.schema_flight = AsyncSingleFlight() if coalesce_schema else None
+        self.http_client = AsyncHttpClient(
+            timeout=timeout,
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            pool_idle_timeout=pool_idle_timeout,
+            retry=retry,
+            hooks=self.hooks,
+        )
+
+    async def __aenter__(self) -> "AsyncLynkrClient":
+        return self
+
+    async def __aexit__(self, *exc_info: t.Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool and stop the key pool worker, if any."""
+        await self.http_client.aclose()
+        if self.key_pool is not None:
+            self.key_pool.close()
+
+    async def get_schema(self, request_string: str) -> t.Tuple[str, Schema, str]:
+        """
+        Get a schema for a given request string.
+
+        Args:
+            request_string: Natural language description of the request
+
+        Returns:
+            Tuple containing (ref_id, schema, service)
+
+        Raises:
+            ApiError: If the API returns an error
+            ValidationError: If the input is invalid
+        """
+        endpoint, body = self._build_schema_request(request_string)
+
+        if self.schema_cache is not None:
+            key = self._schema_cache_key(request_string)
+            cached = await self._run_cache(self.schema_cache.get, key)
+            if cached is not None:
+                self._use_cached_schema(cached)
+                return cached
+
+        if self.schema_flight is None:
+            return await self._fetch_schema(request_string, endpoint, body)
+        key = self._schema_cache_key(request_string)
+        result = await self.schema_flight.do(key, lambda: self._fetch_schema(request_string, endpoint, body))
+        # The call may have run in another thread or task, record the ref_id in this one
+        self.ref_id = result[0]
+        return result
+
+    async def _fetch_schema(
+        self, request_string: str, endpoint: str, body: t.Dict[str, t.Any]
+    ) -> t.Tuple[str, Schema, str]:
+        """Request a schema from the API and cache the result."""
+        trace = self._new_trace("get_schema", "/api/v0/schema/")
+        with traced(self.hooks, trace):
+            response = await self.http_client.post(
+                url=endpoint,
+                headers=self._headers(),
+                json=body,
+                idempotent=True,
+                trace=trace
+            )
+
+            result = self._parse_schema_response(response)
+            if trace is not None:
+                trace.ref_id, trace.service = result[0], result[2]
+        await self._run_cache(self._store_cached_schema, request_string, result)
+        return result
+
+    async def _run_cache(self, func: t.Callable[..., t.Any], *args: t.Any) -> t.Any:
+        """
+        Call a schema cache method without blocking the event loop.
+
+        DiskSchemaCache reads and commits to SQLite, so its calls run in the
+        loop's default executor; in-memory caches are called directly.
+        """
+        if isinstance(self.schema_cache, DiskSchemaCache):
+            return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+        return func(*args)
+
+    async def execute_action(self, schema_data: dict, ref_id: str = None, service: str = None):
+        """
+        Execute an action, merging in the credentials stored for ``service``.
+
+        Args:
+            schema_data: Schema data filled according to the schema from get_schema()
+            ref_id: The reference ID from the previous get_schema call (optional)
+            service: The service name to use for filling in the schema data
+
+        Returns:
+            ``{"Result": ...}`` on success, or an ``"Error: ..."`` string
+        """
+        try:
+            schema_data = self._merge_service_keys(schema_data, service)
+            result = await self.execute(schema_data=schema_data, ref_id=ref_id)
+            return {"Result": result}
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    async def execute(
+        self,
+        schema_data: t.Dict[str, t.Any],
+        ref_id: t.Optional[str] = None,
+        idempotency_key: t.Optional[str] = None,
+        stream: bool = False,
+        compress: bool = False,
+    ) -> t.Dict[str, t.Any]:
+        """
+        Execute an action using the provided schema data.
+
+        Args:
+            ref_id: Reference ID returned from get_schema default set to most recent get_schema call
+            schema_data: Filled schema data according to the schema structure
+            idempotency_key: Unique key for this action; when given, the request is
+                sent with an Idempotency-Key header and retried on transient failures
+            stream: Decrypt the response while it downloads instead of buffering
+                the whole encrypted envelope first. Only the ciphertext is
+                not held in full: the decrypted plaintext is still collected
+                into one buffer before it is parsed, so use execute_stream
+                for results too large to hold in memory
+            compress: Compress the payload before encryption with the client's
+                compression settings (default is False). The ciphertext length
+                then depends on how well the payload compresses, which can
+                reveal secrets sent alongside attacker-influenced values, so
+                only enable it for payloads without merged service credentials
+
+        Returns:
+            Dict containing the API response
+
+        Raises:
+            ApiError: If the API returns an error
+            ValidationError: If the input is invalid
+        """
+        ref_id = ref_id or self.ref_id
+        if ref_id is None:
+            return {
+                "error": "ref_id is required to execute an action"
+            }
+
+        trace = self._new_trace("execute", "/api/v0/execute/", ref_id)
+        with traced(self.hooks, trace):
+            binary = self.binary_transport and not stream
+            endpoint, encrypted_data, aes_key = self._build_execute_request(
+                schema_data, ref_id, binary=binary, trace=trace, compress=compress
+            )
+
+            if binary:
+                response = await self.http_client.post_raw(
+                    url=endpoint,
+                    headers=self._execute_headers(idempotency_key, binary=True),
+                    data=encrypted_data,
+                    trace=trace
+                )
+                return self._parse_raw_execute_response(response, aes_key, trace)
+
+            if stream:
+                decoder = ResponseStreamDecoder(aes_key)
+                chunks = self.http_client.stream(
+                    "POST",
+                    endpoint,
+                    headers=self._execute_headers(idempotency_key),
+                    json=encrypted_data,
+                    trace=trace
+                )
+                plaintext = bytearray()
+                async for piece in self._decode_stream_async(decoder, chunks, trace):
+                    plaintext += piece
+                if not decoder.encrypted:
+                    return decoder.envelope["data"]
+                return self._decode_plaintext(bytes(plaintext), trace)
+
+            response = await self.http_client.post(
+                url=endpoint,
+                headers=self._execute_headers(idempotency_key),
+                json=encrypted_data,
+                trace=trace
+            )
+
+            return self._parse_execute_response(response, aes_key, trace)
+
+    async def execute_stream(
+        self,
+        schema_data: t.Dict[str, t.Any],
+        ref_id: t.Optional[str] = None,
+        idempotency_key: t.Optional[str] = None,
+        chunk_size: int = 65536,
+        compress: bool = False,
+    ) -> t.AsyncIterator[bytes]:
+        """
+        Execute an action and yield the decrypted result as it downloads.
+
+        See LynkrClient.execute_stream; plaintext is only authenticated once
+        the last chunk has been yielded.
+
+        Args:
+            schema_data: Filled schema data according to the schema structure
+            ref_id: Reference ID returned from get_schema default set to most recent get_schema call
+            idempotency_key: Unique key for this action (see execute)
+            chunk_size: Maximum number of response bytes read at a time
+            compress: Compress the payload (see execute)
+
+        Yields:
+            Decrypted result bytes
+
+        Raises:
+            ApiError: If the API returns an error
+            ValidationError: If the input is invalid
+        """
+        ref_id = ref_id or self.ref_id
+        if ref_id is None:
+            raise ValidationError("ref_id is required to execute an action")
+
+        trace = self._new_trace("execute", "/api/v0/execute/", ref_id)
+        with traced(self.hooks, trace):
+            endpoint, encrypted_data, aes_key = self._build_execute_request(
+                schema_data, ref_id, trace=trace, compress=compress
+            )
+
+            decoder = ResponseStreamDecoder(aes_key)
+            chunks = self.http_client.stream(
+                "POST",
+                endpoint,
+                headers=self._execute_headers(idempotency_key),
+                json=encrypted_data,
+                chunk_size=chunk_size,
+                trace=trace
+            )
+            async for piece in self._decode_stream_async(decoder, chunks, trace):
+                yield piece
+            if not decoder.encrypted:
+                yield serialization.dumps(decoder.envelope["data"])
+
+    async def _decode_stream_async(
+        self,
+        decoder: ResponseStreamDecoder,
+        chunks: t.AsyncIterator[bytes],
+        trace: t.Optional[RequestTrace] = None,
+    ) -> t.AsyncIterator[bytes]:
+        """Feed response chunks through ``decoder``, yielding plaintext as it is decrypted."""
+        async for chunk in chunks:
+            with timed(trace, DECRYPT):
+                plaintext = decoder.feed(chunk)
+            if plaintext:
+                yield plaintext
+        with timed(trace, DECRYPT):
+            plaintext = decoder.close()
+        if plaintext:
+            yield plaintext
+
+    async def execute_many(
+        self,
+        items: t.Iterable[t.Dict[str, t.Any]],
+        ref_id: t.Optional[str] = None,
+        service: t.Optional[str] = None,
+        max_concurrency: int = 32,
+        ordered: bool = False,
+        compress: bool = False,
+    ) -> t.AsyncIterator[BatchResult]:
+        """
+        Execute the same action for many records concurrently.
+
+        At most ``max_concurrency`` requests are in flight over the shared
+        connection pool and ``items`` is consumed lazily. A failing item is
+        reported through its BatchResult instead of aborting the batch.
+
+        Args:
+            items: Iterable of filled schema data dictionaries
+            ref_id: Reference ID shared by all items, defaults to most recent get_schema call
+            service: Service whose stored credentials are merged into every item (optional)
+            max_concurrency: Maximum number of concurrent requests (default is 32)
+            ordered: Yield results in input order instead of completion order
+            compress: Compress each payload (see execute); leave off when
+                ``service`` merges credentials into the items
+
+        Yields:
+            BatchResult for each item
+
+        Raises:
+            ValidationError: If max_concurrency is not positive
+        """
+        if max_concurrency < 1:
+            raise ValidationError("max_concurrency must be a positive integer")
+
+        ref_id = ref_id or self.ref_id
+
+        async def run(index: int, item: t.Dict[str, t.Any]) -> BatchResult:
+            try:
+                data = item if service is None else self._merge_service_keys(item, service)
+                return BatchResult(index, item, result=await self.execute(schema_data=data, ref_id=ref_id, compress=compress))
+            except Exception as e:
+                return BatchResult(index, item, error=e)
+
+        iterator = enumerate(items)
+        pending = set()
+        completed = {}
+        next_index = 0
+        try:
+            for index, item in iterator:
+                pending.add(asyncio.ensure_future(run(index, item)))
+                if len(pending) >= max_concurrency:
+                    break
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if ordered:
+                        completed[result.index] = result
+                    else:
+                        yield result
+                    # Refill the window from the remaining items
+                    for index, item in iterator:
+                        pending.add(asyncio.ensure_future(run(index, item)))
+                        break
+                if ordered:
+                    ready, next_index = reorder(completed, next_index)
+                    for result in ready:
+                        yield result
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,61 @@
+"""
+Bulk execution helpers for Lynkr SDK.
+"""
+
+import typing as t
+
+
+class BatchResult:
+    """
+    Outcome of a single item in an ``execute_many`` batch.
+
+    Attributes:
+        index: Position of the item in the input sequence
+        item: The schema data that was executed
+        result: The execute() result, or None if the item failed
+        error: The exception raised for this item, or None on success
+    """
+
+    __slots__ = ("index", "item", "result", "error")
+
+    def __init__(
+        self,
+        index: int,
+        item: t.Dict[str, t.Any],
+        result: t.Any = None,
+        error: t.Optional[BaseException] = None,
+    ):
+        self.index = index
+        self.item = item
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the item executed without raising."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return f"BatchResult(index={self.index}, error={self.error!r})"
+        return f"BatchResult(index={self.index}, result={self.result!r})"
+
+
+def reorder(
+    completed: t.Dict[int, BatchResult], next_index: int
+) -> t.Tuple[t.List[BatchResult], int]:
+    """
+    Pop the run of consecutive results starting at ``next_index``.
+
+    Args:
+        completed: Finished results not yet yielded, keyed by index
+        next_index: Index of the next result to yield in input order
+
+    Returns:
+        Tuple containing (results ready to yield, new next_index)
+    """
+    ready = []
+    while next_index in completed:
+        ready.append(completed.pop(next_index))
+        next_index += 1
+    return ready, next_index
@@ -0,0 +1,330 @@
+"""
+Schema caching for Lynkr SDK.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import typing as t
+import weakref
+from collections import OrderedDict
+
+from .schema import Schema
+
+
+def normalize_request(request_string: str) -> str:
+    """
+    Normalize a schema request string for use as a cache key.
+
+    Collapses whitespace and lowercases, so ``"Show my  orders"`` and
+    ``"show my orders "`` share an entry.
+    """
+    return " ".join(request_string.split()).lower()
+
+
+class SchemaCache:
+    """
+    In-memory TTL + LRU cache for ``get_schema`` results.
+
+    Entries are keyed by ``(base_url, api_key, normalized request string)`` and hold
+    the ``(ref_id, Schema, service)`` tuple returned by ``get_schema``. The
+    cache is safe to share between clients and threads.
+
+    Args:
+        maxsize: Maximum number of entries before the least recently used is evicted
+        ttl: Default time-to-live of an entry in seconds (None for no expiry)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: t.Optional[float] = 300.0):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(base_url: str, api_key: str, request_string: str) -> t.Tuple[str, str, str]:
+        """
+        Build the cache key for a request.
+
+        The base URL is part of the key, so clients for different
+        environments (e.g. staging and production) can share a cache.
+
+        Args:
+            base_url: Base URL of the API the request is sent to
+            api_key: API key the request is made with
+            request_string: Natural language description of the request
+
+        Returns:
+            Cache key tuple
+        """
+        return (base_url.rstrip("/"), api_key, normalize_request(request_string))
+
+    def get(self, key: t.Hashable) -> t.Optional[t.Any]:
+        """
+        Look up an entry, refreshing its LRU position.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: t.Hashable, value: t.Any, ttl: t.Optional[float] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key from make_key()
+            value: Value to cache
+            ttl: Time-to-live for this entry in seconds (defaults to the cache ttl)
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: t.Hashable) -> bool:
+        """
+        Remove a single entry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            True if the entry was removed, False if not found
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, evictions and current size
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _close_connection(connection: t.Any, pid: int) -> None:
+    # A forked child must not close the connection it inherited from its parent
+    if os.getpid() == pid:
+        connection.close()
+
+
+class _ThreadConnection:
+    """One thread's database connection, closed once the thread ends and drops it."""
+
+    __slots__ = ("connection", "pid", "close", "__weakref__")
+
+    def __init__(self, connection: t.Any):
+        self.connection = connection
+        self.pid = os.getpid()
+        self.close = weakref.finalize(self, _close_connection, connection, self.pid)
+
+
+class DiskSchemaCache(SchemaCache):
+    """
+    SQLite-backed ``get_schema`` cache shared by every process on a host.
+
+    Entries hold the ``(ref_id, Schema, service)`` tuple returned by
+    ``get_schema`` and are stored in a SQLite database in WAL mode, so any
+    number of processes and threads can read while one writes. Keys are
+    hashed, the API key is never written to disk. Expired entries are
+    ignored on read and removed, together with the oldest entries beyond
+    ``maxsize``, whenever an entry is written.
+
+    Reads are one indexed lookup on a per-thread connection, which is
+    closed when its thread exits. The schema is
+    returned unparsed (see Schema.from_json) and kept in memory, so it is
+    parsed at most once until another process rewrites the entry. Hit, miss
+    and eviction counters cover this process only.
+
+    Args:
+        path: Database file, created if missing
+        maxsize: Maximum number of entries kept on disk
+        ttl: Default time-to-live of an entry in seconds (None for no expiry)
+        timeout: Seconds to wait for another process's write lock
+    """
+
+    def __init__(self, path: str, maxsize: int = 4096, ttl: t.Optional[float] = 300.0, timeout: float = 5.0):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        self._connections = weakref.WeakSet()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS schemas (key TEXT PRIMARY KEY, ref_id TEXT NOT NULL, service TEXT, "
+                "schema BLOB NOT NULL, stored_at INTEGER NOT NULL, expires_at REAL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS schemas_stored_at ON schemas (stored_at)")
+
+    def _connect(self) -> t.Any:
+        """Return this thread's connection, opening one after a fork or on first use."""
+        current = getattr(self._local, "connection", None)
+        if current is None or current.pid != os.getpid():
+            import sqlite3  # only needed by users of the disk cache
+
+            connection = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # Only the thread-local holds it strongly, so it is closed when the thread exits
+            current = self._local.connection = _ThreadConnection(connection)
+            with self._lock:
+                self._connections.add(current)
+        return current.connection
+
+    @staticmethod
+    def _disk_key(key: t.Tuple[str, str, str]) -> str:
+        return hashlib.sha256("\0".join(key).encode()).hexdigest()
+
+    def get(self, key: t.Tuple[str, str, str]) -> t.Optional[t.Tuple[str, Schema, str]]:
+        """
+        Look up an entry.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            The cached (ref_id, Schema, service) tuple, or None if missing or expired
+        """
+        disk_key = self._disk_key(key)
+        row = self._connect().execute(
+            "SELECT stored_at, expires_at, ref_id, schema, service FROM schemas WHERE key = ?", (disk_key,)
+        ).fetchone()
+        with self._lock:
+            if row is None or (row[1] is not None and row[1] <= time.time()):
+                self._entries.pop(disk_key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            entry = self._entries.get(disk_key)
+            if entry is not None and entry[0] == row[0]:
+                self._entries.move_to_end(disk_key)
+                return entry[1]
+
+        value = (row[2], Schema.from_json(row[3]), row[4])
+        self._remember(disk_key, row[0], value)
+        return value
+
+    def set(self, key: t.Tuple[str, str, str], value: t.Tuple[str, Schema, str], ttl: t.Optional[float] = None) -> None:
+        """
+        Store an entry, evicting expired and the oldest entries beyond maxsize.
+
+        Args:
+            key: Cache key from make_key()
+            value: The (ref_id, Schema, service) tuple returned by get_schema
+            ttl: Time-to-live for this entry in seconds (defaults to the cache ttl)
+        """
+        ref_id, schema, service = value
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        stored_at = time.time_ns()
+        disk_key = self._disk_key(key)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO schemas (key, ref_id, service, schema, stored_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (disk_key, ref_id, service, schema._json_bytes(), stored_at, None if ttl is None else now + ttl),
+            )
+            evicted = connection.execute("DELETE FROM schemas WHERE expires_at <= ?", (now,)).rowcount
+            evicted += connection.execute(
+                "DELETE FROM schemas WHERE key IN "
+                "(SELECT key FROM schemas ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            ).rowcount
+        with self._lock:
+            self.evictions += evicted
+        self._remember(disk_key, stored_at, value)
+
+    def _remember(self, disk_key: str, stored_at: int, value: t.Tuple[str, Schema, str]) -> None:
+        """Keep a decoded entry in memory, bounded like the disk store."""
+        with self._lock:
+            self._entries[disk_key] = (stored_at, value)
+            self._entries.move_to_end(disk_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: t.Tuple[str, str, str]) -> bool:
+        """
+        Remove a single entry, for every process sharing the database.
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            True if the entry was removed, False if not found
+        """
+        disk_key = self._disk_key(key)
+        with self._connect() as connection:
+            removed = connection.execute("DELETE FROM schemas WHERE key = ?", (disk_key,)).rowcount
+        with self._lock:
+            self._entries.pop(disk_key, None)
+        return removed > 0
+
+    def clear(self) -> None:
+        """Remove all entries, for every process sharing the database."""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM schemas")
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with this process's hits, misses and evictions and the
+            number of entries on disk
+        """
+        size = len(self)
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": size}
+
+    def close(self) -> None:
+        """Close the database connections opened by this process; call once no thread uses the cache."""
+        with self._lock:
+            connections, self._connections = list(self._connections), weakref.WeakSet()
+        self._local = threading.local()
+        for connection in connections:
+            connection.close()
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM schemas").fetchone()[0]
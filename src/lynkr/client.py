@@ -2,39 +2,68 @@
 Client module provides the main interface to the API.
 """
 
-import json
+import contextvars
 import os
+import threading
 import typing as t
+import weakref
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from urllib.parse import urljoin
 import base64
 
+from .utils import serialization
 from .utils.http import HttpClient
-from .exceptions import ApiError, ValidationError
+from .utils.retry import IDEMPOTENCY_HEADER, RetryPolicy
+from .utils.streaming import ResponseStreamDecoder
+from .cache import SchemaCache
+from .coalesce import SingleFlight
+from .instrumentation import DECRYPT, PARSE, Hook, RequestTrace, timed, traced
+from .metrics import Metrics
+from .compression import ACCEPT_ENCODING_HEADER, Compression, accepted_encodings, decompress
+from .envelope import CONTENT_TYPE as ENVELOPE_CONTENT_TYPE, decrypt_envelope, hybrid_encrypt_binary, parse_envelope
+from .key_pool import KeyPool
+from .batch import BatchResult, reorder
+from .exceptions import ApiError, ConfigurationError, ValidationError
 from .schema import Schema
 from .keys.key_manager import KeyManager
-from langchain.agents import tool
-from langchain_core.tools.structured import StructuredTool
-from .crypto import hybrid_encrypt, load_public_key, decrypt_with_aes
+from .crypto import (
+    DEFAULT_KEY_ID, hybrid_encrypt, get_public_key, register_public_key, load_public_key_from_pem,
+    public_key_fingerprint, decrypt_with_aes,
+)
 
+# Number of ref_id -> service mappings remembered to label execute traces
+_SERVICE_MEMORY = 1024
 
-class LynkrClient:
+_UNSET = object()
+
+# client -> ref_id of the latest get_schema call in this thread / asyncio task.
+# One module-level variable, since contexts keep every variable set in them
+# alive; the mapping is weak and replaced on write, never mutated.
+_ref_ids = contextvars.ContextVar("lynkr_ref_ids", default=None)
+
+
+class _BaseClient:
     """
-    Lynkr client for interacting with the API service.
-    
-    This client provides methods to get schema information and execute actions
-    against the API service.
-    
-    Args:
-        api_key: API key for authentication
-        base_url: Base URL for the API (defaults to https://api.lynkr.ca)
-        timeout: Request timeout in seconds (default is 30)
+    Shared state and request/response handling for the sync and async clients.
+
+    Subclasses provide the transport-specific ``get_schema`` and ``execute``
+    methods on top of the helpers defined here.
     """
-    
+
     def __init__(
-        self, 
-        api_key: str = None, 
+        self,
+        api_key: str = None,
         base_url: str = "https://api.lynkr.ca",
-        timeout: int = 30,
+        public_key: t.Any = None,
+        key_id: t.Optional[str] = None,
+        schema_cache: t.Optional[SchemaCache] = None,
+        key_pool_size: int = 0,
+        binary_transport: bool = False,
+        compression: t.Union[str, Compression, None] = None,
+        hooks: t.Optional[t.Sequence[Hook]] = None,
+        metrics: t.Optional[Metrics] = None,
+        share_ref_id: bool = True,
     ):
         self.api_key = api_key or os.environ.get("LYNKR_API_KEY")
         if not self.api_key:
@@ -43,9 +72,33 @@ class LynkrClient:
             )
         
         self.base_url = base_url
-        self.ref_id = None
-        self.http_client = HttpClient(timeout=timeout)
+        # The most recent ref_id is kept per thread / asyncio task, so threads
+        # sharing the client do not execute against each other's schema
+        self._last_ref_id = None
+        self.share_ref_id = share_ref_id
+        # Replaced, never mutated in place, so readers need no lock
         self.keys = {}
+        self._keys_lock = threading.Lock()
+        self.schema_cache = schema_cache
+        if public_key is not None:
+            if isinstance(public_key, (bytes, str)):
+                public_key = load_public_key_from_pem(public_key)
+            # Without an explicit id the key is registered under its own
+            # fingerprint, so it cannot replace a key other clients use
+            key_id = key_id or public_key_fingerprint(public_key)
+            register_public_key(key_id, public_key)
+        self.key_id = key_id or DEFAULT_KEY_ID
+        self.key_pool = KeyPool(key_id=self.key_id, size=key_pool_size) if key_pool_size > 0 else None
+        self.binary_transport = binary_transport
+        self.compression = Compression(compression) if isinstance(compression, str) else compression
+        self._accept_encoding = ", ".join(accepted_encodings())
+        # Shared with the HTTP client, so hooks added later apply to it too
+        self.hooks = list(hooks or [])
+        self.metrics = metrics
+        if metrics is not None:
+            self.hooks.append(metrics)
+        self._services = OrderedDict()
+        self._services_lock = threading.Lock()
 
     def add_key(self, name: str, field_name: str, value: str):
         """
@@ -53,24 +106,99 @@ class LynkrClient:
         If the service doesn't exist yet, create it.
         If the field already exists, this will overwrite it with the new value.
         """
-        # 1) create the service dict if needed
-        svc = self.keys.setdefault(name, {})
+        with self._keys_lock:
+            keys = dict(self.keys)
+            keys[name] = {**keys.get(name, {}), field_name: value}
+            self.keys = keys
+
+    @property
+    def ref_id(self) -> t.Optional[str]:
+        """
+        The ref_id of the most recent get_schema call, used when execute is not given one.
+
+        Each thread and asyncio task sees the ref_id of its own latest
+        get_schema call. One that has not called get_schema falls back to the
+        latest from any thread, unless the client was created with
+        ``share_ref_id=False``.
+        """
+        ref_ids = _ref_ids.get()
+        ref_id = _UNSET if ref_ids is None else ref_ids.get(self, _UNSET)
+        if ref_id is _UNSET:
+            return self._last_ref_id if self.share_ref_id else None
+        return ref_id
 
-        # 2) assign (or overwrite) the field
-        svc[field_name] = value
+    @ref_id.setter
+    def ref_id(self, ref_id: t.Optional[str]) -> None:
+        ref_ids = weakref.WeakKeyDictionary(_ref_ids.get() or {})
+        ref_ids[self] = ref_id
+        _ref_ids.set(ref_ids)
+        self._last_ref_id = ref_id
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Register a callable receiving a RequestTrace after every API call.
         
-    def get_schema(self, request_string: str) -> t.Tuple[str, Schema, str]:
+        Hooks run synchronously on the calling thread once the call has
+        finished, successfully or not; keep them fast and do not raise from them.
         """
-        Get a schema for a given request string.
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """Unregister a hook added with add_hook or the ``hooks`` argument."""
+        self.hooks.remove(hook)
+
+    def _new_trace(self, name: str, path: str, ref_id: t.Optional[str] = None) -> t.Optional[RequestTrace]:
+        """Start a trace for an API call, or return None when no hooks are registered."""
+        if not self.hooks:
+            return None
+        return RequestTrace(name, "POST", urljoin(self.base_url, path), ref_id, self._services.get(ref_id))
+
+    def _remember_service(self, ref_id: str, service: t.Optional[str]) -> None:
+        """Remember which service a ref_id belongs to, so execute traces can report it."""
+        with self._services_lock:
+            self._services[ref_id] = service
+            self._services.move_to_end(ref_id)
+            if len(self._services) > _SERVICE_MEMORY:
+                self._services.popitem(last=False)
+
+    def to_execute_format(self, schema: Schema) -> t.Dict[str, t.Any]:
+        """
+        Convert schema to a format suitable for execution.
         
         Args:
-            request_string: Natural language description of the request
-            
+            schema: Schema object
+        
         Returns:
-            Tuple containing (ref_id, schema)
-            
+            Dict representation of the schema for execution
+        """
+        return {
+            "schema": schema.to_dict()
+        }
+
+    def _headers(self, idempotency_key: t.Optional[str] = None, binary: bool = False) -> t.Dict[str, str]:
+        """Build the headers sent with every API request."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        if binary:
+            headers["Content-Type"] = ENVELOPE_CONTENT_TYPE
+            headers["Accept"] = f"{ENVELOPE_CONTENT_TYPE}, application/json"
+        if idempotency_key:
+            headers[IDEMPOTENCY_HEADER] = idempotency_key
+        return headers
+
+    def _execute_headers(self, idempotency_key: t.Optional[str] = None, binary: bool = False) -> t.Dict[str, str]:
+        """Build execute request headers, advertising the payload encodings the client can decompress."""
+        headers = self._headers(idempotency_key, binary=binary)
+        headers[ACCEPT_ENCODING_HEADER] = self._accept_encoding
+        return headers
+
+    def _build_schema_request(self, request_string: str) -> t.Tuple[str, t.Dict[str, t.Any]]:
+        """
+        Validate a schema request and build its endpoint and body.
+
         Raises:
-            ApiError: If the API returns an error
             ValidationError: If the input is invalid
         """
         if not request_string or not isinstance(request_string, str):
@@ -78,21 +206,57 @@ class LynkrClient:
         
         endpoint = urljoin(self.base_url, "/api/v0/schema/")
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         body={
                 "query": request_string
             }
         
-        response = self.http_client.post(
-            url=endpoint,
-            headers=headers,
-            json=body
-        )
+        return endpoint, body
+
+    def invalidate_schema(self, request_string: t.Optional[str] = None) -> None:
+        """
+        Drop cached schemas.
         
+        Args:
+            request_string: Request whose cached schema should be dropped;
+                clears the whole cache when omitted
+        """
+        if self.schema_cache is None:
+            return
+        if request_string is None:
+            self.schema_cache.clear()
+        else:
+            self.schema_cache.invalidate(self._schema_cache_key(request_string))
+
+    def _schema_cache_key(self, request_string: str) -> t.Tuple[str, str, str]:
+        """Return the schema cache and coalescing key for a request made by this client."""
+        return SchemaCache.make_key(self.base_url, self.api_key, request_string)
+
+    def _get_cached_schema(self, request_string: str) -> t.Optional[t.Tuple[str, Schema, str]]:
+        """Return the cached get_schema result for a request, if any."""
+        if self.schema_cache is None:
+            return None
+        cached = self.schema_cache.get(self._schema_cache_key(request_string))
+        if cached is not None:
+            self._use_cached_schema(cached)
+        return cached
+
+    def _use_cached_schema(self, cached: t.Tuple[str, Schema, str]) -> None:
+        """Record a cached get_schema result as the current one."""
+        self.ref_id = cached[0]
+        self._remember_service(cached[0], cached[2])
+
+    def _store_cached_schema(self, request_string: str, result: t.Tuple[str, Schema, str]) -> None:
+        """Remember a get_schema result when caching is enabled."""
+        if self.schema_cache is not None:
+            self.schema_cache.set(self._schema_cache_key(request_string), result)
+
+    def _parse_schema_response(self, response: t.Dict[str, t.Any]) -> t.Tuple[str, Schema, str]:
+        """
+        Extract (ref_id, schema, service) from a schema response.
+
+        Raises:
+            ApiError: If the response is malformed
+        """
         # Extract ref_id and schema from response
         ref_id = response.get("ref_id")
         self.ref_id = ref_id
@@ -104,21 +268,286 @@ class LynkrClient:
         if not ref_id or not schema_data:
             raise ApiError("Invalid response format from API")
         
-        return ref_id,  Schema(schema_data), service
+        self._remember_service(ref_id, service)
+        # Built on first use, callers that only forward ref_id/service never pay for it
+        return ref_id, Schema._deferred(schema_data), service
+
+    def _merge_service_keys(self, schema_data: dict, service: str = None) -> dict:
+        """Merge the credentials stored for ``service`` into ``schema_data``."""
+        currentService = self.keys.get(service)
+
+        return {**schema_data, **currentService}
+
+    def _build_execute_request(
+        self,
+        schema_data: t.Dict[str, t.Any],
+        ref_id: str,
+        binary: bool = False,
+        trace: t.Optional[RequestTrace] = None,
+        compress: bool = False,
+    ) -> t.Tuple[str, t.Any, bytes]:
+        """
+        Validate and encrypt an execute request.
+
+        Args:
+            schema_data: Filled schema data
+            ref_id: Reference ID of the schema
+            binary: Build a binary envelope instead of the JSON one
+            trace: Trace receiving the serialize and encrypt timings
+            compress: Apply the client's compression settings to the payload
+
+        Returns:
+            Tuple containing (endpoint, encrypted body, AES key used for the response)
+
+        Raises:
+            ValidationError: If the input is invalid
+        """
+        if not schema_data or not isinstance(schema_data, dict):
+            raise ValidationError("schema_data must be a non-empty dictionary")
         
-    def to_execute_format(self, schema: Schema) -> t.Dict[str, t.Any]:
+        schema_payload = {
+            "fields": { k: { "value": v } for k, v in schema_data.items() }
+        }
+        
+        endpoint = urljoin(self.base_url, "/api/v0/execute/")
+        
+        payload = {
+            "ref_id": ref_id,
+            "schema": schema_payload
+        }
+        
+        public_key = get_public_key(self.key_id)
+        
+        options = {}
+        if self.key_pool is not None:
+            options["prewrapped"] = self.key_pool.acquire()
+        if compress and self.compression is not None:
+            options["compression"] = self.compression
+        if trace is not None:
+            options["trace"] = trace
+        
+        if binary:
+            encrypted_data, aes_key = hybrid_encrypt_binary(payload, public_key, **options)
+        else:
+            encrypted_data, aes_key = hybrid_encrypt(payload, public_key, **options)
+
+        return endpoint, encrypted_data, aes_key
+
+    def _parse_execute_response(
+        self, response: t.Dict[str, t.Any], aes_key: bytes, trace: t.Optional[RequestTrace] = None
+    ) -> t.Any:
+        """Decrypt (if needed) and decode an execute response."""
+        resp_json = response["data"]
+
+        if all(k in resp_json for k in ("payload", "iv", "tag")):
+            with timed(trace, DECRYPT):
+                ciphertext = base64.b64decode(resp_json["payload"])
+                iv = base64.b64decode(resp_json["iv"])
+                tag = base64.b64decode(resp_json["tag"])
+                plaintext = decrypt_with_aes(ciphertext, aes_key, iv, tag)
+                if resp_json.get("encoding"):
+                    plaintext = decompress(plaintext, resp_json["encoding"])
+            return self._decode_plaintext(plaintext, trace)
+        else:
+            # Not encrypted, just return the response as usual
+            return resp_json
+
+    def _parse_raw_execute_response(
+        self, response: t.Any, aes_key: bytes, trace: t.Optional[RequestTrace] = None
+    ) -> t.Any:
+        """Decode a binary-transport execute response, which may also come back as JSON."""
+        content_type = response.headers.get("Content-Type", "")
+        if content_type.split(";")[0].strip() == ENVELOPE_CONTENT_TYPE:
+            with timed(trace, DECRYPT):
+                envelope = parse_envelope(response.content)
+                plaintext = decrypt_envelope(envelope, aes_key)
+                if envelope.encoding is not None:
+                    plaintext = decompress(plaintext, envelope.encoding)
+            return self._decode_plaintext(plaintext, trace)
+        with timed(trace, PARSE):
+            try:
+                body = serialization.loads(response.content)
+            except ValueError:
+                raise ApiError(f"Invalid JSON response: {response.text}")
+        return self._parse_execute_response(body, aes_key, trace)
+
+    def _decode_plaintext(self, plaintext: bytes, trace: t.Optional[RequestTrace] = None) -> t.Any:
+        """Decode a decrypted execute result."""
+        with timed(trace, PARSE):
+            try:
+                # Usually the server returns JSON as plaintext
+                return serialization.loads(plaintext)
+            except Exception as e:
+                # Could not decode JSON, return raw plaintext
+                return plaintext
+
+    def _decode_stream(
+        self,
+        decoder: ResponseStreamDecoder,
+        chunks: t.Iterable[bytes],
+        trace: t.Optional[RequestTrace] = None,
+    ) -> t.Iterator[bytes]:
+        """Feed response chunks through ``decoder``, yielding plaintext as it is decrypted."""
+        for chunk in chunks:
+            with timed(trace, DECRYPT):
+                plaintext = decoder.feed(chunk)
+            if plaintext:
+                yield plaintext
+        with timed(trace, DECRYPT):
+            plaintext = decoder.close()
+        if plaintext:
+            yield plaintext
+
+
+class LynkrClient(_BaseClient):
+    """
+    Lynkr client for interacting with the API service.
+    
+    This client provides methods to get schema information and execute actions
+    against the API service.
+    
+    Args:
+        api_key: API key for authentication
+        base_url: Base URL for the API (defaults to https://api.lynkr.ca)
+        timeout: Request timeout in seconds (default is 30)
+        public_key: RSA public key (loaded key or PEM bytes/str) used to encrypt
+            execute payloads; defaults to the key bundled with the SDK
+        key_id: Keyring id the public key is stored and looked up under;
+            defaults to the public key's fingerprint when public_key is
+            given, else to the bundled key
+        schema_cache: Optional SchemaCache used to serve repeated get_schema calls
+        pool_connections: Number of per-host connection pools to cache (default is 10)
+        pool_maxsize: Maximum number of keep-alive connections per host (default is 10);
+            size it to the number of threads sharing the client
+        pool_block: Block when the pool is exhausted instead of opening extra connections
+        pool_idle_timeout: Close connections idle for longer than this many seconds
+        retry: Retry policy for get_schema and idempotency-keyed executes
+            (defaults to RetryPolicy(); pass RetryPolicy(max_attempts=1) to disable)
+        key_pool_size: Keep this many AES keys pre-wrapped with the public key
+            by a background thread, taking RSA-OAEP off the execute path
+            (default is 0, disabled)
+        binary_transport: Send execute requests as binary envelopes
+            (application/octet-stream) instead of base64 fields in JSON
+        compression: Compression used for execute payloads sent with
+            ``compress=True``, either "gzip", "zstd" or a Compression with a
+            custom threshold/level
+        hooks: Callables receiving a RequestTrace with per-phase timings after
+            every API call (see add_hook)
+        metrics: Metrics collector recording latency and error counts per
+            endpoint and service; may be shared between clients
+        share_ref_id: Let a thread that has not called get_schema execute
+            against the latest ref_id from any thread (default is True); set
+            to False when one client serves many threads
+        coalesce_schema: Let concurrent get_schema calls for the same request
+            share one API request (default is False); counters are
+            available from ``schema_flight.stats()``
+    """
+    
+    def __init__(
+        self, 
+        api_key: str = None, 
+        base_url: str = "https://api.lynkr.ca",
+        timeout: int = 30,
+        public_key: t.Any = None,
+        key_id: t.Optional[str] = None,
+        schema_cache: t.Optional[SchemaCache] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        pool_idle_timeout: t.Optional[float] = None,
+        retry: t.Optional[RetryPolicy] = None,
+        key_pool_size: int = 0,
+        binary_transport: bool = False,
+        compression: t.Union[str, Compression, None] = None,
+        hooks: t.Optional[t.Sequence[Hook]] = None,
+        metrics: t.Optional[Metrics] = None,
+        share_ref_id: bool = True,
+        coalesce_schema: bool = False,
+    ):
+        super().__init__(
+            api_key=api_key,
+            base_url=base_url,
+            public_key=public_key,
+            key_id=key_id,
+            schema_cache=schema_cache,
+            key_pool_size=key_pool_size,
+            binary_transport=binary_transport,
+            compression=compression,
+            hooks=hooks,
+            metrics=metrics,
+            share_ref_id=share_ref_id,
+        )
+        self.schema_flight = SingleFlight() if coalesce_schema else None
+        self.http_client = HttpClient(
+            timeout=timeout,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            pool_idle_timeout=pool_idle_timeout,
+            retry=retry,
+            hooks=self.hooks,
+        )
+    
+    def __enter__(self) -> "LynkrClient":
+        return self
+    
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Close the connection pool and stop the key pool worker, if any."""
+        self.http_client.session.close()
+        if self.key_pool is not None:
+            self.key_pool.close()
+        
+    def get_schema(self, request_string: str) -> t.Tuple[str, Schema, str]:
         """
-        Convert schema to a format suitable for execution.
+        Get a schema for a given request string.
         
         Args:
-            schema: Schema object
-        
+            request_string: Natural language description of the request
+            
         Returns:
-            Dict representation of the schema for execution
+            Tuple containing (ref_id, schema, service)
+            
+        Raises:
+            ApiError: If the API returns an error
+            ValidationError: If the input is invalid
         """
-        return {
-            "schema": schema.to_dict()
-        }
+        endpoint, body = self._build_schema_request(request_string)
+
+        cached = self._get_cached_schema(request_string)
+        if cached is not None:
+            return cached
+
+        if self.schema_flight is None:
+            return self._fetch_schema(request_string, endpoint, body)
+        key = self._schema_cache_key(request_string)
+        result = self.schema_flight.do(key, lambda: self._fetch_schema(request_string, endpoint, body))
+        # The call may have run in another thread or task, record the ref_id in this one
+        self.ref_id = result[0]
+        return result
+
+    def _fetch_schema(
+        self, request_string: str, endpoint: str, body: t.Dict[str, t.Any]
+    ) -> t.Tuple[str, Schema, str]:
+        """Request a schema from the API and cache the result."""
+        
+        trace = self._new_trace("get_schema", "/api/v0/schema/")
+        with traced(self.hooks, trace):
+            response = self.http_client.post(
+                url=endpoint,
+                headers=self._headers(),
+                json=body,
+                idempotent=True,
+                trace=trace
+            )
+            
+            result = self._parse_schema_response(response)
+            if trace is not None:
+                trace.ref_id, trace.service = result[0], result[2]
+        self._store_cached_schema(request_string, result)
+        return result
     
     def execute_action(self, schema_data: dict, ref_id: str = None, service: str = None):
         """
@@ -138,22 +567,39 @@ class LynkrClient:
         automatically engage with the user to request the missing details before execution.
         """
         try:
-            
-            currentService = self.keys.get(service)
-
-            schema_data = {**schema_data, **currentService}
+            schema_data = self._merge_service_keys(schema_data, service)
             result = self.execute(schema_data=schema_data, ref_id=ref_id)
             return {"Result": result}
         except Exception as e:
             return f"Error: {str(e)}"
             
-    def execute(self, schema_data: t.Dict[str, t.Any], ref_id: t.Optional[str] = None) -> t.Dict[str, t.Any]:
+    def execute(
+        self,
+        schema_data: t.Dict[str, t.Any],
+        ref_id: t.Optional[str] = None,
+        idempotency_key: t.Optional[str] = None,
+        stream: bool = False,
+        compress: bool = False,
+    ) -> t.Dict[str, t.Any]:
         """
         Execute an action using the provided schema data.
         
         Args:
             ref_id: Reference ID returned from get_schema default set to most recent get_schema call
             schema_data: Filled schema data according to the schema structure
+            idempotency_key: Unique key for this action; when given, the request is
+                sent with an Idempotency-Key header and retried on transient failures
+            stream: Decrypt the response while it downloads instead of buffering
+                the whole encrypted envelope first; always uses the JSON
+                envelope, even with binary_transport. Only the ciphertext is
+                not held in full: the decrypted plaintext is still collected
+                into one buffer before it is parsed, so use execute_stream
+                for results too large to hold in memory
+            compress: Compress the payload before encryption with the client's
+                compression settings (default is False). The ciphertext length
+                then depends on how well the payload compresses, which can
+                reveal secrets sent alongside attacker-influenced values, so
+                only enable it for payloads without merged service credentials
             
         Returns:
             Dict containing the API response
@@ -163,61 +609,180 @@ class LynkrClient:
             ValidationError: If the input is invalid
         """
  
-        if ref_id is None and self.ref_id is None:
+        ref_id = ref_id or self.ref_id
+        if ref_id is None:
             return {
                 "error": "ref_id is required to execute an action"
             }
-        else:
-            ref_id = ref_id or self.ref_id
 
+        trace = self._new_trace("execute", "/api/v0/execute/", ref_id)
+        with traced(self.hooks, trace):
+            binary = self.binary_transport and not stream
+            endpoint, encrypted_data, aes_key = self._build_execute_request(
+                schema_data, ref_id, binary=binary, trace=trace, compress=compress
+            )
+            
+            if binary:
+                response = self.http_client.post_raw(
+                    url=endpoint,
+                    headers=self._execute_headers(idempotency_key, binary=True),
+                    data=encrypted_data,
+                    trace=trace
+                )
+                return self._parse_raw_execute_response(response, aes_key, trace)
+            
+            if stream:
+                decoder = ResponseStreamDecoder(aes_key)
+                chunks = self.http_client.stream(
+                    "POST",
+                    endpoint,
+                    headers=self._execute_headers(idempotency_key),
+                    json=encrypted_data,
+                    trace=trace
+                )
+                plaintext = bytearray()
+                for piece in self._decode_stream(decoder, chunks, trace):
+                    plaintext += piece
+                if not decoder.encrypted:
+                    return decoder.envelope["data"]
+                return self._decode_plaintext(bytes(plaintext), trace)
+            
+            response = self.http_client.post(
+                url=endpoint,
+                headers=self._execute_headers(idempotency_key),
+                json=encrypted_data,
+                trace=trace
+            )
+
+            return self._parse_execute_response(response, aes_key, trace)
 
-        if not schema_data or not isinstance(schema_data, dict):
-            raise ValidationError("schema_data must be a non-empty dictionary")
+    def execute_stream(
+        self,
+        schema_data: t.Dict[str, t.Any],
+        ref_id: t.Optional[str] = None,
+        idempotency_key: t.Optional[str] = None,
+        chunk_size: int = 65536,
+        compress: bool = False,
+    ) -> t.Iterator[bytes]:
+        """
+        Execute an action and yield the decrypted result as it downloads.
         
-        schema_payload = {
-            "fields": { k: { "value": v } for k, v in schema_data.items() }
-        }
+        The response is decrypted chunk by chunk, so memory stays bounded by
+        ``chunk_size`` rather than the size of the result. Chunks are raw
+        plaintext (usually JSON) that can be written to a file or fed to an
+        incremental parser. The request is sent when iteration starts.
         
-        endpoint = urljoin(self.base_url, "/api/v0/execute/")
+        Note: Plaintext is only authenticated once the last chunk has been
+        yielded; if the tag check fails, iteration raises ``InvalidTag`` and
+        everything received so far must be discarded.
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
+        Args:
+            schema_data: Filled schema data according to the schema structure
+            ref_id: Reference ID returned from get_schema default set to most recent get_schema call
+            idempotency_key: Unique key for this action (see execute)
+            chunk_size: Maximum number of response bytes read at a time
+            compress: Compress the payload (see execute)
+            
+        Yields:
+            Decrypted result bytes
+            
+        Raises:
+            ApiError: If the API returns an error
+            ValidationError: If the input is invalid
+        """
+        ref_id = ref_id or self.ref_id
+        if ref_id is None:
+            raise ValidationError("ref_id is required to execute an action")
         
-        payload = {
-            "ref_id": ref_id,
-            "schema": schema_payload
-        }
+        trace = self._new_trace("execute", "/api/v0/execute/", ref_id)
+        with traced(self.hooks, trace):
+            endpoint, encrypted_data, aes_key = self._build_execute_request(
+                schema_data, ref_id, trace=trace, compress=compress
+            )
+            
+            decoder = ResponseStreamDecoder(aes_key)
+            chunks = self.http_client.stream(
+                "POST",
+                endpoint,
+                headers=self._execute_headers(idempotency_key),
+                json=encrypted_data,
+                chunk_size=chunk_size,
+                trace=trace
+            )
+            yield from self._decode_stream(decoder, chunks, trace)
+            if not decoder.encrypted:
+                yield serialization.dumps(decoder.envelope["data"])
+
+    def execute_many(
+        self,
+        items: t.Iterable[t.Dict[str, t.Any]],
+        ref_id: t.Optional[str] = None,
+        service: t.Optional[str] = None,
+        max_concurrency: int = 8,
+        ordered: bool = False,
+        compress: bool = False,
+    ) -> t.Iterator[BatchResult]:
+        """
+        Execute the same action for many records concurrently.
         
-        BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-        PUBLIC_KEY_PATH = os.path.join(BASE_DIR, "public_key.pem")
-        public_key = load_public_key(PUBLIC_KEY_PATH)  # Adjust as needed
+        Items are executed on a bounded thread pool sharing this client's
+        connection pool; at most ``max_concurrency`` requests are in flight and
+        ``items`` is consumed lazily. A failing item is reported through its
+        BatchResult instead of aborting the batch.
         
-        encrypted_data, aes_key = hybrid_encrypt(payload, public_key)
+        Args:
+            items: Iterable of filled schema data dictionaries
+            ref_id: Reference ID shared by all items, defaults to most recent get_schema call
+            service: Service whose stored credentials are merged into every item (optional)
+            max_concurrency: Maximum number of concurrent requests (default is 8)
+            ordered: Yield results in input order instead of completion order
+            compress: Compress each payload (see execute); leave off when
+                ``service`` merges credentials into the items
+            
+        Yields:
+            BatchResult for each item
+            
+        Raises:
+            ValidationError: If max_concurrency is not positive
+        """
+        if max_concurrency < 1:
+            raise ValidationError("max_concurrency must be a positive integer")
         
-        response = self.http_client.post(
-            url=endpoint,
-            headers=headers,
-            json=encrypted_data
-        )
-
-        resp_json = response["data"]
-
-        if all(k in resp_json for k in ("payload", "iv", "tag")):
-            ciphertext = base64.b64decode(resp_json["payload"])
-            iv = base64.b64decode(resp_json["iv"])
-            tag = base64.b64decode(resp_json["tag"])
-            plaintext = decrypt_with_aes(ciphertext, aes_key, iv, tag)
+        # Resolve the ref_id here, worker threads must not depend on client state
+        ref_id = ref_id or self.ref_id
+        
+        def run(index: int, item: t.Dict[str, t.Any]) -> BatchResult:
             try:
-                # Usually the server returns JSON as plaintext
-                return json.loads(plaintext.decode())
+                data = item if service is None else self._merge_service_keys(item, service)
+                return BatchResult(index, item, result=self.execute(schema_data=data, ref_id=ref_id, compress=compress))
             except Exception as e:
-                # Could not decode JSON, return raw plaintext
-                return plaintext
-        else:
-            # Not encrypted, just return the response as usual
-            return resp_json
+                return BatchResult(index, item, error=e)
+        
+        iterator = enumerate(items)
+        pending = set()
+        completed = {}
+        next_index = 0
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            for index, item in iterator:
+                pending.add(executor.submit(run, index, item))
+                if len(pending) >= max_concurrency:
+                    break
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if ordered:
+                        completed[result.index] = result
+                    else:
+                        yield result
+                    # Refill the window from the remaining items
+                    for index, item in iterator:
+                        pending.add(executor.submit(run, index, item))
+                        break
+                if ordered:
+                    ready, next_index = reorder(completed, next_index)
+                    yield from ready
     
     def langchain_tools(self) -> list:
         """
@@ -232,7 +797,15 @@ class LynkrClient:
         Raises:
             ApiError: If the API returns an error
             ValidationError: If the input is invalid
+            ConfigurationError: If LangChain is not installed
         """
+        # LangChain is an optional extra and slow to import, only load it here
+        try:
+            from langchain_core.tools.structured import StructuredTool
+        except ImportError:
+            raise ConfigurationError(
+                "langchain_tools requires LangChain. Install it with: pip install 'lynkr[langchain]'"
+            ) from None
         
         def get_minimum_schema(data: str, include_sensitive: bool = False):
             """
@@ -258,34 +831,7 @@ class LynkrClient:
             Returns:
                 str: Pretty-printed JSON string of the minimal required payload.
             """
-            schema_d = data.__dict__["_schema"]
-            fields    = schema_d.get("fields", {})
-            required  = schema_d.get("required_fields", []) or schema_d.get("required", [])
-            sensitive = set(schema_d.get("sensitive_fields", []))
-            
-            payload = {
-            }
-            
-            for field in required:
-                # Skip sensitive unless explicitly requested
-                if field in sensitive and not include_sensitive:
-                    continue
-                
-                info = fields[field]
-                t = info["type"]
-                
-                if t == "string":
-                    payload[field] = ""
-                elif t == "list":
-                    payload[field] = []
-                elif t == "integer":
-                    payload[field] = 0
-                elif t == "boolean":
-                    payload[field] = False
-                else:
-                    payload[field] = None
-
-            return json.dumps(payload, indent=2)
+            return data.template_json(include_sensitive)
         # ——— Example usage ———
 
         def get_schema_langchain(request_string: str):
@@ -350,10 +896,7 @@ class LynkrClient:
             automatically engage with the user to request the missing details before execution.
             """
             try:
-                
-                currentService = self.keys.get(service)
-
-                schema_data = {**schema_data, **currentService}
+                schema_data = self._merge_service_keys(schema_data, service)
                 result = self.execute(schema_data=schema_data, ref_id=ref_id)
                 return {"Result": result}
             except Exception as e:
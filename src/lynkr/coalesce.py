@@ -0,0 +1,143 @@
+"""
+Coalescing of identical in-flight calls for Lynkr SDK.
+"""
+
+import threading
+import typing as t
+
+T = t.TypeVar("T")
+
+
+class _Call:
+    """One in-flight call and the outcome its waiters receive."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Share one execution between threads making the same call at the same time.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive the same result, or have the same
+    exception raised. Once the call finishes the key is forgotten, so later
+    callers start a new one.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: t.Hashable, func: t.Callable[[], T]) -> T:
+        """
+        Run ``func``, or wait for the in-flight call with the same key.
+
+        Args:
+            key: Identifies calls that can share a result
+            func: Zero-argument callable performing the call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with the number of calls made, the number of callers
+            that joined one already in flight, and the calls in flight now
+        """
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """
+    Share one execution between asyncio tasks making the same call at the same time.
+
+    The call runs as its own task, so cancelling one of the waiting callers
+    does not cancel it for the others. Like the client it belongs to, an
+    instance must only be used from one event loop.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key: t.Hashable, func: t.Callable[[], t.Awaitable[T]]) -> T:
+        """
+        Await ``func()``, or the in-flight call with the same key.
+
+        Args:
+            key: Identifies calls that can share a result
+            func: Zero-argument coroutine function performing the call
+
+        Returns:
+            The result of the shared call
+
+        Raises:
+            Exception: Whatever the shared call raised
+        """
+        import asyncio  # kept out of `import lynkr`, see lynkr/__init__.py
+
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda task: self._forget(key, task))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: t.Hashable, task: t.Any) -> None:
+        del self._calls[key]
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller was cancelled
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dictionary with the number of calls made, the number of callers
+            that joined one already in flight, and the calls in flight now
+        """
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
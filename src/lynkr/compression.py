@@ -0,0 +1,158 @@
+"""
+Payload compression applied before encryption.
+
+Encrypted bytes do not compress, so large payloads are compressed after
+serialization and before AES-GCM. The encoding is signalled in the
+envelope (an ``encoding`` field in the JSON envelope, a flag bit in the
+binary one) and responses carrying it are decompressed transparently.
+"""
+
+import importlib.util
+import threading
+import typing as t
+import zlib
+
+from .exceptions import ConfigurationError
+
+GZIP = "gzip"
+ZSTD = "zstd"
+ENCODINGS = (GZIP, ZSTD)
+
+# Request header listing the payload encodings the client can decompress
+ACCEPT_ENCODING_HEADER = "Lynkr-Accept-Encoding"
+
+# zlib window bits selecting the gzip container
+_GZIP_WBITS = 31
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ConfigurationError(
+            "zstd compression requires the zstandard package. Install it with: pip install 'lynkr[zstd]'"
+        ) from None
+    return zstandard
+
+
+class Compression:
+    """
+    Compression settings for execute payloads.
+
+    Compressing before encrypting makes the ciphertext length depend on the
+    content: when a payload mixes secrets (such as service credentials merged
+    in by the client) with values an attacker can influence, observing the
+    request sizes can reveal the secrets (as in CRIME and BREACH). Clients
+    therefore only compress payloads sent with ``compress=True``.
+
+    Args:
+        algorithm: "gzip" or "zstd" (requires the ``zstd`` extra)
+        threshold: Only compress serialized payloads of at least this many bytes
+        level: Compression level (defaults to 6 for gzip and 3 for zstd)
+
+    Raises:
+        ConfigurationError: If the algorithm is unknown or not installed
+    """
+
+    __slots__ = ("algorithm", "threshold", "level", "_compress")
+
+    def __init__(self, algorithm: str = GZIP, threshold: int = 1024, level: t.Optional[int] = None):
+        if algorithm == GZIP:
+            level = 6 if level is None else level
+
+            def compress(data: bytes) -> bytes:
+                compressor = zlib.compressobj(level, zlib.DEFLATED, _GZIP_WBITS)
+                return compressor.compress(data) + compressor.flush()
+        elif algorithm == ZSTD:
+            level = 3 if level is None else level
+            zstandard = _zstandard()
+            # ZstdCompressor is not thread-safe, so each thread gets its own
+            local = threading.local()
+            local.compressor = zstandard.ZstdCompressor(level=level)
+
+            def compress(data: bytes) -> bytes:
+                compressor = getattr(local, "compressor", None)
+                if compressor is None:
+                    compressor = local.compressor = zstandard.ZstdCompressor(level=level)
+                return compressor.compress(data)
+        else:
+            raise ConfigurationError(f"Unknown compression algorithm '{algorithm}', expected one of: {', '.join(ENCODINGS)}")
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = level
+        self._compress = compress
+
+    def compress(self, data: bytes) -> t.Tuple[bytes, t.Optional[str]]:
+        """
+        Compress ``data`` if it is large enough and compression pays off.
+
+        Args:
+            data: Serialized payload
+
+        Returns:
+            Tuple containing (possibly compressed data, encoding or None if left as is)
+        """
+        if len(data) < self.threshold:
+            return data, None
+        compressed = self._compress(data)
+        if len(compressed) >= len(data):
+            return data, None
+        return compressed, self.algorithm
+
+    def __repr__(self) -> str:
+        return f"Compression({self.algorithm!r}, threshold={self.threshold}, level={self.level})"
+
+
+def decompress(data: bytes, encoding: str) -> bytes:
+    """
+    Decompress a payload.
+
+    Args:
+        data: Compressed bytes
+        encoding: "gzip" or "zstd"
+
+    Returns:
+        The decompressed bytes
+
+    Raises:
+        ConfigurationError: If the encoding is unknown or not installed
+    """
+    decompressor = make_decompressor(encoding)
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def make_decompressor(encoding: str) -> t.Any:
+    """
+    Create an incremental decompressor with ``decompress(chunk)`` and ``flush()``.
+
+    Raises:
+        ConfigurationError: If the encoding is unknown or not installed
+    """
+    if encoding == GZIP:
+        return zlib.decompressobj(_GZIP_WBITS)
+    if encoding == ZSTD:
+        return _ZstdStreamDecompressor(_zstandard().ZstdDecompressor().decompressobj())
+    raise ConfigurationError(f"Unsupported payload encoding '{encoding}'")
+
+
+def accepted_encodings() -> t.List[str]:
+    """List the encodings this installation can decompress, preferred first."""
+    # find_spec avoids importing zstandard just to advertise it
+    if importlib.util.find_spec("zstandard") is None:
+        return [GZIP]
+    return [ZSTD, GZIP]
+
+
+class _ZstdStreamDecompressor:
+    """Give zstandard's decompressobj the zlib-style ``flush()`` the SDK relies on."""
+
+    __slots__ = ("_decompressor",)
+
+    def __init__(self, decompressor: t.Any):
+        self._decompressor = decompressor
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+    def flush(self) -> bytes:
+        return b""
@@ -4,14 +4,102 @@ from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.backends import default_backend
 import os
 import base64
-import json
+import hashlib
+import threading
+import time
+import typing as t
+
+from .compression import Compression
+from .exceptions import ConfigurationError
+from .instrumentation import ENCRYPT, SERIALIZE
+from .utils import serialization as json_serialization
+
+DEFAULT_KEY_ID = "default"
+DEFAULT_PUBLIC_KEY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "public_key.pem")
+
+# Process-wide keyring of parsed RSA public keys, keyed by key id
+_keyring = {}
+_keyring_lock = threading.Lock()
 
 def load_public_key(pem_path: str):
     with open(pem_path, "rb") as key_file:
-        return serialization.load_pem_public_key(
-            key_file.read(),
-            backend=default_backend()
-        )
+        return load_public_key_from_pem(key_file.read())
+
+def load_public_key_from_pem(pem: t.Union[bytes, str]):
+    if isinstance(pem, str):
+        pem = pem.encode()
+    return serialization.load_pem_public_key(pem, backend=default_backend())
+
+def public_key_fingerprint(public_key) -> str:
+    """
+    Return a stable id for a public key, derived from its DER encoding.
+
+    Args:
+        public_key: A loaded RSA public key
+
+    Returns:
+        ``"sha256:"`` followed by the first 32 hex digits of the digest
+    """
+    der = public_key.public_bytes(
+        serialization.Encoding.DER, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return "sha256:" + hashlib.sha256(der).hexdigest()[:32]
+
+def register_public_key(key_id: str, public_key):
+    """
+    Add or replace a public key in the process-wide keyring.
+
+    ``DEFAULT_KEY_ID`` is reserved for the bundled key, since every client
+    created without a key encrypts to it.
+
+    Args:
+        key_id: Identifier for the key, so rotated keys can coexist
+        public_key: A loaded RSA public key, or its PEM encoding as bytes/str
+
+    Returns:
+        The parsed public key
+
+    Raises:
+        ConfigurationError: If ``key_id`` is ``DEFAULT_KEY_ID`` and the key
+            is not the bundled one
+    """
+    if isinstance(public_key, (bytes, str)):
+        public_key = load_public_key_from_pem(public_key)
+    if key_id == DEFAULT_KEY_ID:
+        if public_key.public_numbers() != get_public_key(DEFAULT_KEY_ID).public_numbers():
+            raise ConfigurationError(
+                f"Key id '{DEFAULT_KEY_ID}' is reserved for the bundled public key; register other keys under their own id"
+            )
+        return get_public_key(DEFAULT_KEY_ID)
+    with _keyring_lock:
+        _keyring[key_id] = public_key
+    return public_key
+
+def unregister_public_key(key_id: str) -> bool:
+    """Remove a key from the keyring, returning True if it was present."""
+    with _keyring_lock:
+        return _keyring.pop(key_id, None) is not None
+
+def get_public_key(key_id: str = DEFAULT_KEY_ID):
+    """
+    Return a public key from the keyring.
+
+    The bundled ``public_key.pem`` is loaded and parsed on first use of
+    ``DEFAULT_KEY_ID``; every later call is a dictionary lookup.
+
+    Raises:
+        ConfigurationError: If no key is registered under ``key_id``
+    """
+    public_key = _keyring.get(key_id)
+    if public_key is not None:
+        return public_key
+    with _keyring_lock:
+        public_key = _keyring.get(key_id)
+        if public_key is None:
+            if key_id != DEFAULT_KEY_ID:
+                raise ConfigurationError(f"No public key registered for key id '{key_id}'")
+            public_key = _keyring[key_id] = load_public_key(DEFAULT_PUBLIC_KEY_PATH)
+        return public_key
 
 def encrypt_with_aes(data: bytes, key: bytes):
     iv = os.urandom(12)
@@ -32,30 +120,85 @@ def encrypt_key_with_rsa(key: bytes, public_key):
     )
     return encrypted
 
-def hybrid_encrypt(payload: dict, public_key):
-    # 1. Serialize payload to bytes
-    data = json.dumps(payload).encode()
+def hybrid_encrypt(
+    payload: dict,
+    public_key,
+    prewrapped: t.Optional[t.Tuple[bytes, bytes]] = None,
+    compression: t.Optional[Compression] = None,
+    trace=None,
+):
+    # 1. Serialize payload to bytes, compressing it if configured
+    started = time.perf_counter()
+    data = json_serialization.dumps(payload)
+    encoding = None
+    if compression is not None:
+        data, encoding = compression.compress(data)
+    if trace is not None:
+        encrypt_started = time.perf_counter()
+        trace.add(SERIALIZE, encrypt_started - started)
 
-    # 2. Generate AES key
-    aes_key = os.urandom(32)  # AES-256
+    # 2. Generate AES key, unless a pre-wrapped (aes_key, encrypted_key) pair is supplied
+    if prewrapped is None:
+        aes_key = os.urandom(32)  # AES-256
+    else:
+        aes_key, encrypted_key = prewrapped
 
     # 3. Encrypt data with AES
     ciphertext, iv, tag = encrypt_with_aes(data, aes_key)
 
     # 4. Encrypt AES key with RSA public key
-    encrypted_key = encrypt_key_with_rsa(aes_key, public_key)
+    if prewrapped is None:
+        encrypted_key = encrypt_key_with_rsa(aes_key, public_key)
 
     # 5. Return base64-encoded fields
-    return {
+    envelope = {
         "encrypted_key": base64.b64encode(encrypted_key).decode(),
         "iv": base64.b64encode(iv).decode(),
         "tag": base64.b64encode(tag).decode(),
         "payload": base64.b64encode(ciphertext).decode(),
-    }, aes_key
+    }
+    if encoding is not None:
+        envelope["encoding"] = encoding
+    if trace is not None:
+        trace.add(ENCRYPT, time.perf_counter() - encrypt_started)
+    return envelope, aes_key
 
 def decrypt_with_aes(ciphertext, key, iv, tag):
     decryptor = Cipher(
         algorithms.AES(key),
         modes.GCM(iv, tag)
     ).decryptor()
-    return decryptor.update(ciphertext) + decryptor.finalize()
\ No newline at end of file
+    return decryptor.update(ciphertext) + decryptor.finalize()
+
+
+class StreamingDecryptor:
+    """
+    Incremental AES-GCM decryption for payloads received in chunks.
+
+    Feed ciphertext through update() as it arrives and call finalize()
+    with the tag once the last chunk is in. Plaintext returned by update()
+    is unauthenticated until finalize() succeeds.
+
+    Args:
+        key: AES key
+        iv: GCM nonce
+    """
+
+    def __init__(self, key: bytes, iv: bytes):
+        self._decryptor = Cipher(
+            algorithms.AES(key),
+            modes.GCM(iv)
+        ).decryptor()
+
+    def update(self, ciphertext: bytes) -> bytes:
+        """Decrypt the next chunk of ciphertext."""
+        return self._decryptor.update(ciphertext)
+
+    def finalize(self, tag: bytes) -> bytes:
+        """
+        Verify the authentication tag and return any remaining plaintext.
+
+        Raises:
+            cryptography.exceptions.InvalidTag: If authentication fails
+        """
+        return self._decryptor.finalize_with_tag(tag)
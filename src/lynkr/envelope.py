@@ -0,0 +1,223 @@
+"""
+Binary envelope framing for encrypted execute requests and responses.
+
+The JSON envelope carries the wrapped key, IV, tag and ciphertext as
+base64 strings inside a JSON document. The binary envelope sends them raw
+after a fixed header, as ``application/octet-stream``::
+
+    magic     4 bytes  b"LYNK"
+    version   u8       1
+    flags     u8       FLAG_GZIP / FLAG_ZSTD if the plaintext is compressed
+    key_len   u16      length of the RSA-wrapped AES key (0 in responses)
+    iv_len    u8
+    tag_len   u8
+    payload   u32      length of the ciphertext
+    key | iv | tag | ciphertext
+
+All integers are big-endian.
+"""
+
+import os
+import struct
+import time
+import typing as t
+
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+from .compression import GZIP, ZSTD, Compression
+from .crypto import encrypt_key_with_rsa
+from .exceptions import ApiError
+from .instrumentation import ENCRYPT, SERIALIZE
+from .utils import serialization
+
+MAGIC = b"LYNK"
+VERSION = 1
+CONTENT_TYPE = "application/octet-stream"
+
+FLAG_GZIP = 0x01
+FLAG_ZSTD = 0x02
+# Payload encoding -> header flag bit
+ENCODING_FLAGS = {GZIP: FLAG_GZIP, ZSTD: FLAG_ZSTD}
+
+_HEADER = struct.Struct(">4sBBHBBI")
+_IV_SIZE = 12
+_TAG_SIZE = 16
+# AES-GCM update_into() needs room for one block beyond the input
+_BLOCK_SLACK = 15
+
+
+class BinaryEnvelope:
+    """
+    A parsed binary envelope.
+
+    The fields are memoryviews into the received buffer, so parsing does not
+    copy the ciphertext.
+
+    Attributes:
+        version: Frame format version
+        flags: Frame flags
+        encrypted_key: RSA-wrapped AES key (empty in responses)
+        iv: AES-GCM nonce
+        tag: AES-GCM authentication tag
+        payload: Ciphertext
+    """
+
+    __slots__ = ("version", "flags", "encrypted_key", "iv", "tag", "payload")
+
+    def __init__(
+        self,
+        version: int,
+        flags: int,
+        encrypted_key: memoryview,
+        iv: memoryview,
+        tag: memoryview,
+        payload: memoryview,
+    ):
+        self.version = version
+        self.flags = flags
+        self.encrypted_key = encrypted_key
+        self.iv = iv
+        self.tag = tag
+        self.payload = payload
+
+    @property
+    def encoding(self) -> t.Optional[str]:
+        """Compression applied to the plaintext, from the flags, or None."""
+        for encoding, flag in ENCODING_FLAGS.items():
+            if self.flags & flag:
+                return encoding
+        return None
+
+    def __repr__(self) -> str:
+        return (
+            f"BinaryEnvelope(version={self.version}, flags={self.flags}, "
+            f"key={len(self.encrypted_key)}B, payload={len(self.payload)}B)"
+        )
+
+
+def encrypt_envelope(data: bytes, aes_key: bytes, encrypted_key: bytes = b"", flags: int = 0) -> bytearray:
+    """
+    Encrypt ``data`` with AES-GCM straight into a binary envelope.
+
+    The frame is allocated once and the cipher writes into it directly.
+
+    Args:
+        data: Plaintext
+        aes_key: AES key
+        encrypted_key: RSA-wrapped AES key (requests only)
+        flags: Frame flags
+
+    Returns:
+        The complete frame
+    """
+    iv = os.urandom(_IV_SIZE)
+    key_len = len(encrypted_key)
+    iv_offset = _HEADER.size + key_len
+    tag_offset = iv_offset + _IV_SIZE
+    payload_offset = tag_offset + _TAG_SIZE
+
+    frame = bytearray(payload_offset + len(data) + _BLOCK_SLACK)
+    _HEADER.pack_into(frame, 0, MAGIC, VERSION, flags, key_len, _IV_SIZE, _TAG_SIZE, len(data))
+    view = memoryview(frame)
+    view[_HEADER.size:iv_offset] = encrypted_key
+    view[iv_offset:tag_offset] = iv
+
+    encryptor = Cipher(algorithms.AES(aes_key), modes.GCM(iv)).encryptor()
+    written = encryptor.update_into(data, view[payload_offset:])
+    encryptor.finalize()
+    view[tag_offset:payload_offset] = encryptor.tag
+    view.release()
+
+    # GCM is a stream mode, so only the slack is left over
+    del frame[payload_offset + written:]
+    return frame
+
+
+def parse_envelope(data: t.Union[bytes, bytearray, memoryview]) -> BinaryEnvelope:
+    """
+    Parse a binary envelope without copying its fields.
+
+    Args:
+        data: The received frame
+
+    Returns:
+        The parsed envelope
+
+    Raises:
+        ApiError: If the frame is malformed
+    """
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ApiError("Invalid binary response: truncated header")
+    magic, version, flags, key_len, iv_len, tag_len, payload_len = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ApiError("Invalid binary response: bad magic")
+    if version != VERSION:
+        raise ApiError(f"Unsupported binary envelope version {version}")
+
+    iv_offset = _HEADER.size + key_len
+    tag_offset = iv_offset + iv_len
+    payload_offset = tag_offset + tag_len
+    if len(view) != payload_offset + payload_len:
+        raise ApiError("Invalid binary response: length mismatch")
+    return BinaryEnvelope(
+        version,
+        flags,
+        view[_HEADER.size:iv_offset],
+        view[iv_offset:tag_offset],
+        view[tag_offset:payload_offset],
+        view[payload_offset:],
+    )
+
+
+def decrypt_envelope(envelope: BinaryEnvelope, aes_key: bytes) -> bytes:
+    """
+    Decrypt and authenticate the payload of a binary envelope.
+
+    Raises:
+        cryptography.exceptions.InvalidTag: If authentication fails
+    """
+    decryptor = Cipher(
+        algorithms.AES(aes_key),
+        modes.GCM(bytes(envelope.iv), bytes(envelope.tag))
+    ).decryptor()
+    return decryptor.update(envelope.payload) + decryptor.finalize()
+
+
+def hybrid_encrypt_binary(
+    payload: dict,
+    public_key,
+    prewrapped: t.Optional[t.Tuple[bytes, bytes]] = None,
+    compression: t.Optional[Compression] = None,
+    trace=None,
+) -> t.Tuple[bytearray, bytes]:
+    """
+    Binary-framed counterpart of ``crypto.hybrid_encrypt``.
+
+    Args:
+        payload: Request payload to serialize and encrypt
+        public_key: RSA public key used to wrap the AES key
+        prewrapped: Optional ``(aes_key, encrypted_key)`` pair, e.g. from a KeyPool
+        compression: Optional compression applied before encryption
+        trace: Optional RequestTrace receiving the serialize and encrypt timings
+
+    Returns:
+        Tuple containing (frame, AES key used for the response)
+    """
+    started = time.perf_counter()
+    data = serialization.dumps(payload)
+    flags = 0
+    if compression is not None:
+        data, encoding = compression.compress(data)
+        flags = ENCODING_FLAGS.get(encoding, 0)
+    encrypt_started = time.perf_counter()
+    if prewrapped is None:
+        aes_key = os.urandom(32)
+        encrypted_key = encrypt_key_with_rsa(aes_key, public_key)
+    else:
+        aes_key, encrypted_key = prewrapped
+    frame = encrypt_envelope(data, aes_key, encrypted_key, flags)
+    if trace is not None:
+        trace.add(SERIALIZE, encrypt_started - started)
+        trace.add(ENCRYPT, time.perf_counter() - encrypt_started)
+    return frame, aes_key
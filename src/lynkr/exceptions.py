@@ -7,11 +7,14 @@ class ApiError(Exception):
     Raised when the API returns an error response.
     """
     
-    def __init__(self, message, status_code=None, response=None):
+    def __init__(self, message, status_code=None, response=None, retry_after=None):
         super().__init__(message)
         self.status_code = status_code
         self.response = response
         self.message = message
+        self.retry_after = retry_after
+        # Per-attempt timings (lynkr.utils.retry.Attempt) when the request was retried
+        self.attempts = []
     
     def __str__(self):
         if self.status_code:
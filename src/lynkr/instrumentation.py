@@ -0,0 +1,188 @@
+"""
+Per-phase request instrumentation for Lynkr SDK.
+
+Clients created with ``hooks`` build a RequestTrace for every API call and
+pass it to each hook once the call finishes, successfully or not. Without
+hooks no timing is taken. A hook that raises is logged and skipped, it never
+changes the outcome of the call.
+"""
+
+import contextlib
+import contextvars
+import logging
+import time
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+SERIALIZE = "serialize"
+ENCRYPT = "encrypt"
+CONNECT = "connect"
+TTFB = "ttfb"
+READ = "read"
+DECRYPT = "decrypt"
+PARSE = "parse"
+PHASES = (SERIALIZE, ENCRYPT, CONNECT, TTFB, READ, DECRYPT, PARSE)
+
+# Trace of the request currently being sent on this thread/task, read by the
+# connection pool to attribute connect time
+current_trace = contextvars.ContextVar("lynkr_current_trace", default=None)
+
+
+class RequestTrace:
+    """
+    Timings and metadata of a single API call.
+
+    Phases that did not happen (e.g. ``connect`` on a reused connection, or
+    ``decrypt`` for get_schema) are absent from ``phases``. Retried requests
+    accumulate network phases across attempts.
+
+    Attributes:
+        name: Operation, "get_schema", "execute" or "http" for bare HttpClient calls
+        method: HTTP method
+        url: Request URL
+        ref_id: Reference ID of the schema, if known
+        service: Service the schema belongs to, if known
+        phases: Seconds spent per phase: serialize, encrypt, connect, ttfb
+            (request sent to response headers, excluding connect), read
+            (response body), decrypt and parse
+        request_bytes: Size of the request body
+        response_bytes: Size of the response body
+        status_code: HTTP status of the final attempt, or None
+        attempts: Number of HTTP attempts made
+        error: Exception that failed the call, or None
+        aborted: True if the call was cancelled or its stream closed before
+            it finished, rather than succeeding or failing
+        duration: Total wall-clock seconds of the call
+    """
+
+    __slots__ = (
+        "name",
+        "method",
+        "url",
+        "ref_id",
+        "service",
+        "phases",
+        "request_bytes",
+        "response_bytes",
+        "status_code",
+        "attempts",
+        "error",
+        "aborted",
+        "duration",
+        "_started",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        url: str,
+        ref_id: t.Optional[str] = None,
+        service: t.Optional[str] = None,
+    ):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.ref_id = ref_id
+        self.service = service
+        self.phases = {}
+        self.request_bytes = None
+        self.response_bytes = None
+        self.status_code = None
+        self.attempts = 0
+        self.error = None
+        self.aborted = False
+        self.duration = None
+        self._started = time.perf_counter()
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add ``seconds`` to a phase."""
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def finish(self, error: t.Optional[BaseException] = None, aborted: bool = False) -> "RequestTrace":
+        """Record the total duration and outcome of the call."""
+        self.duration = time.perf_counter() - self._started
+        self.aborted = aborted
+        if error is not None:
+            self.error = error
+            self.status_code = getattr(error, "status_code", self.status_code)
+        return self
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """
+        Convert the trace to a dictionary, e.g. for span attributes or logs.
+
+        Returns:
+            Dictionary of the public attributes; ``error`` is its message
+        """
+        return {
+            "name": self.name,
+            "method": self.method,
+            "url": self.url,
+            "ref_id": self.ref_id,
+            "service": self.service,
+            "phases": dict(self.phases),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "status_code": self.status_code,
+            "attempts": self.attempts,
+            "error": str(self.error) if self.error is not None else None,
+            "aborted": self.aborted,
+            "duration": self.duration,
+        }
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{name}={seconds * 1e3:.2f}ms" for name, seconds in self.phases.items())
+        return f"RequestTrace({self.name}, status={self.status_code}, {phases})"
+
+
+Hook = t.Callable[[RequestTrace], None]
+
+
+def emit(hooks: t.Sequence[Hook], trace: RequestTrace) -> None:
+    """Pass a finished trace to every hook, in registration order, logging hooks that raise."""
+    for hook in hooks:
+        try:
+            hook(trace)
+        except Exception:
+            logger.exception("Lynkr hook %r failed", hook)
+
+
+@contextlib.contextmanager
+def timed(trace: t.Optional[RequestTrace], phase: str) -> t.Iterator[None]:
+    """Add the time spent in the block to ``phase`` of ``trace``; a no-op without a trace."""
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(phase, time.perf_counter() - started)
+
+
+@contextlib.contextmanager
+def traced(hooks: t.Sequence[Hook], trace: t.Optional[RequestTrace]) -> t.Iterator[None]:
+    """
+    Finish ``trace`` when the block exits, recording any error, and emit it to ``hooks``.
+
+    Leaving the block through a BaseException that is not an Exception
+    (GeneratorExit from a stream closed early, task cancellation,
+    KeyboardInterrupt) marks the trace as aborted.
+    """
+    if trace is None:
+        yield
+        return
+    error = None
+    aborted = False
+    try:
+        yield
+    except Exception as e:
+        error = e
+        raise
+    except BaseException:
+        aborted = True
+        raise
+    finally:
+        emit(hooks, trace.finish(error, aborted))
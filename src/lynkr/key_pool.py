@@ -0,0 +1,140 @@
+"""
+Pre-wrapped AES key pool for Lynkr SDK.
+"""
+
+import os
+import queue
+import threading
+import typing as t
+
+from .crypto import DEFAULT_KEY_ID, encrypt_key_with_rsa, get_public_key
+
+
+class KeyPool:
+    """
+    Bounded pool of AES-256 keys already wrapped with the RSA public key.
+
+    A daemon worker thread keeps the pool topped up so ``execute`` only has
+    to pop a ready ``(aes_key, encrypted_key)`` pair instead of doing an
+    RSA-OAEP operation on the request path. Every key is handed out exactly
+    once. When the pool is empty the key is generated inline and counted as
+    a stall; keys wrapped with a public key that has since been replaced in
+    the keyring are discarded.
+
+    The worker refills in bursts once the depth drops to ``low_watermark``
+    rather than after every acquire, so its RSA work (which holds the GIL)
+    tends to overlap the request's network wait instead of its CPU time.
+
+    Args:
+        key_id: Keyring id of the RSA public key used to wrap keys
+        size: Maximum number of ready keys held in the pool
+        low_watermark: Depth at which the worker starts refilling
+            (defaults to half of size)
+    """
+
+    def __init__(self, key_id: str = DEFAULT_KEY_ID, size: int = 32, low_watermark: t.Optional[int] = None):
+        if size <= 0:
+            raise ValueError("size must be a positive integer")
+        self.key_id = key_id
+        self.size = size
+        self.low_watermark = size // 2 if low_watermark is None else min(low_watermark, size - 1)
+        self.served = 0
+        self.stalls = 0
+        self.generated = 0
+        self.discarded = 0
+        self._lock = threading.Lock()
+        self._keys = queue.Queue(maxsize=size)
+        self._stop = threading.Event()
+        self._wanted = threading.Event()
+        self._wanted.set()
+        self._worker = threading.Thread(target=self._fill, name="lynkr-key-pool", daemon=True)
+        self._worker.start()
+
+    def acquire(self) -> t.Tuple[bytes, bytes]:
+        """
+        Take a key out of the pool.
+
+        Returns:
+            Tuple containing (AES key, RSA-wrapped AES key)
+        """
+        public_key = get_public_key(self.key_id)
+        while True:
+            try:
+                wrapped_with, aes_key, encrypted_key = self._keys.get_nowait()
+            except queue.Empty:
+                self._wanted.set()
+                break
+            if self._keys.qsize() <= self.low_watermark:
+                self._wanted.set()
+            if wrapped_with is public_key:
+                with self._lock:
+                    self.served += 1
+                return aes_key, encrypted_key
+            with self._lock:
+                self.discarded += 1
+
+        # Pool drained faster than the worker refills it, wrap inline
+        aes_key = os.urandom(32)
+        encrypted_key = encrypt_key_with_rsa(aes_key, public_key)
+        with self._lock:
+            self.served += 1
+            self.stalls += 1
+        return aes_key, encrypted_key
+
+    def close(self) -> None:
+        """Stop the refill worker and drop all pooled keys."""
+        self._stop.set()
+        self._wanted.set()
+        self._worker.join()
+        while True:
+            try:
+                self._keys.get_nowait()
+            except queue.Empty:
+                break
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dictionary with depth (ready keys), size, served, stalls
+            (acquires that found the pool empty), generated and discarded
+        """
+        with self._lock:
+            return {
+                "depth": self._keys.qsize(),
+                "size": self.size,
+                "served": self.served,
+                "stalls": self.stalls,
+                "generated": self.generated,
+                "discarded": self.discarded,
+            }
+
+    def __len__(self) -> int:
+        return self._keys.qsize()
+
+    def _fill(self) -> None:
+        entry = None
+        while not self._stop.is_set():
+            if entry is None and self._keys.qsize() >= self.size:
+                # Full, sleep until acquire() drains the pool to the low watermark
+                self._wanted.clear()
+                if self._keys.qsize() > self.low_watermark:
+                    self._wanted.wait()
+                continue
+            if entry is None:
+                try:
+                    public_key = get_public_key(self.key_id)
+                except Exception:
+                    # Key not registered (yet); acquire() reports the error to the caller
+                    self._stop.wait(0.5)
+                    continue
+                aes_key = os.urandom(32)
+                entry = (public_key, aes_key, encrypt_key_with_rsa(aes_key, public_key))
+                with self._lock:
+                    self.generated += 1
+            try:
+                self._keys.put(entry, timeout=0.1)
+            except queue.Full:
+                continue
+            entry = None
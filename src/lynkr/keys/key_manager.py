@@ -2,7 +2,12 @@
 API key management for Lynkr SDK.
 """
 
+import threading
 import typing as t
+from collections import OrderedDict
+
+# Number of missing-field signatures whose key assignment is remembered
+_PLAN_MEMORY = 256
 
 
 class KeyManager:
@@ -10,7 +15,8 @@ class KeyManager:
     Manages API keys for different services.
     
     This class provides methods to store, retrieve, and manage API keys
-    that can be automatically used when executing actions.
+    that can be automatically used when executing actions. It is safe to
+    share between threads.
     """
     
     def __init__(self):
@@ -25,6 +31,14 @@ class KeyManager:
             "sendgrid": ["sendgrid_api_key", "api_key"],
             # Add more mappings as needed
         }
+        # Indexes over the stored keys, maintained by add() and remove()
+        self._order = {}  # key name -> insertion sequence, mirrors self._keys order
+        self._sequence = 0
+        self._by_field = {}  # mapped field name -> names of keys mapping to it
+        self._by_length = {}  # name length -> key names, for substring matching
+        # Missing-field signature -> [(field, key name), ...] fill plan
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
     
     def add(self, name: str, value: str, field_names: t.Optional[t.List[str]] = None) -> None:
         """
@@ -38,11 +52,18 @@ class KeyManager:
         """
         # Store keys in lowercase for case-insensitive matching
         name = name.lower()
-        self._keys[name] = value
-        
-        # If field_names are provided, update the mapping
-        if field_names:
-            self._key_to_field_mapping[name] = field_names
+        with self._lock:
+            if name in self._keys:
+                self._unindex(name)
+            else:
+                self._order[name] = self._sequence
+                self._sequence += 1
+            self._keys[name] = value
+            
+            # If field_names are provided, update the mapping
+            if field_names:
+                self._key_to_field_mapping[name] = list(field_names)
+            self._index(name)
     
     def get(self, name: str) -> t.Optional[str]:
         """
@@ -67,10 +88,13 @@ class KeyManager:
             True if the key was removed, False if not found
         """
         name = name.lower()
-        if name in self._keys:
-            del self._keys[name]
-            return True
-        return False
+        with self._lock:
+            if name in self._keys:
+                self._unindex(name)
+                del self._keys[name]
+                del self._order[name]
+                return True
+            return False
     
     def list(self) -> t.Dict[str, str]:
         """
@@ -80,7 +104,8 @@ class KeyManager:
             Dictionary of key names and values (with values partially masked)
         """
         # Return a copy with masked values for security
-        return {k: self._mask_key(v) for k, v in self._keys.items()}
+        with self._lock:
+            return {k: self._mask_key(v) for k, v in self._keys.items()}
     
     def _mask_key(self, key_value: str) -> str:
         """Mask API key for secure display."""
@@ -108,7 +133,16 @@ class KeyManager:
         Match stored API keys to schema fields.
         
         This method attempts to fill in any missing required fields in the schema data
-        with appropriate API keys from the store.
+        with appropriate API keys from the store. Keys are tried in the order they
+        were added; each key fills:
+        
+        1. the first of its mapped field names that is still missing,
+        2. a missing field named exactly after the key, and
+        3. every missing field containing the key name and "key", "token" or "auth".
+        
+        Candidate keys come from indexes kept up to date by add() and remove(), and
+        the resulting assignment is memoized per set of missing fields, so the cost
+        does not grow with the number of stored keys.
         
         Args:
             schema_data: Current schema data (may be partially filled)
@@ -120,33 +154,86 @@ class KeyManager:
         # Create a copy to avoid modifying the original
         updated_data = schema_data.copy()
         
-        # Track which fields still need to be filled
-        missing_fields = [field for field in required_fields if field not in updated_data]
+        missing_fields = tuple(field for field in required_fields if field not in updated_data)
+        if not missing_fields or not self._keys:
+            return updated_data
         
-        # Try to match each key to missing fields
-        for key_name, key_value in self._keys.items():
-            field_mappings = self.get_field_mappings(key_name)
+        with self._lock:
+            plan = self._plans.get(missing_fields)
+            if plan is None:
+                plan = self._plan(missing_fields)
+                self._plans[missing_fields] = plan
+                if len(self._plans) > _PLAN_MEMORY:
+                    self._plans.popitem(last=False)
             
-            for field_name in field_mappings:
-                # If this field is required and missing, fill it with the key
-                if field_name in missing_fields:
-                    updated_data[field_name] = key_value
-                    missing_fields.remove(field_name)
-                    break  # One key should only fill one field
+            for field, key_name in plan:
+                updated_data[field] = self._keys[key_name]
+        return updated_data
+    
+    def _plan(self, missing_fields: t.Tuple[str, ...]) -> t.List[t.Tuple[str, str]]:
+        """Work out which key fills which missing field, in fill order."""
+        # Remaining occurrences of each missing field; required_fields may repeat names
+        remaining = {}
+        candidates = set()
+        contained = {}  # key name -> fields that contain it, in missing order
+        for field in missing_fields:
+            remaining[field] = remaining.get(field, 0) + 1
+            candidates.update(self._by_field.get(field, ()))
+            if field in self._keys:
+                candidates.add(field)
+            lowered = field.lower()
+            if "key" in lowered or "token" in lowered or "auth" in lowered:
+                for key_name in self._names_within(lowered):
+                    contained.setdefault(key_name, []).append(field)
+        candidates.update(contained)
+        
+        plan = []
+        for key_name in sorted(candidates, key=self._order.__getitem__):
+            for field_name in self.get_field_mappings(key_name):
+                if remaining.get(field_name):
+                    plan.append((field_name, key_name))
+                    remaining[field_name] -= 1
+                    break  # One key should only fill one mapped field
             
-            # Also check if any missing fields match the key name directly
-            # This helps with fields that might be named exactly after the service
-            if key_name in missing_fields:
-                updated_data[key_name] = key_value
-                missing_fields.remove(key_name)
+            # Fields named exactly after the service
+            if remaining.get(key_name):
+                plan.append((key_name, key_name))
+                remaining[key_name] -= 1
             
-            # Check for fields that contain the key name (e.g., "resend_api_key")
-            for field in missing_fields[:]:  # Use a copy for safe iteration while removing
-                if key_name in field.lower() and ("key" in field.lower() or "token" in field.lower() or "auth" in field.lower()):
-                    updated_data[field] = key_value
-                    missing_fields.remove(field)
-        
-        return updated_data
+            # Fields that contain the key name (e.g., "resend_api_key")
+            for field in contained.get(key_name, ()):
+                if remaining[field]:
+                    plan.append((field, key_name))
+                    remaining[field] -= 1
+        return plan
+    
+    def _names_within(self, text: str) -> t.Set[str]:
+        """Stored key names that occur as a substring of ``text``."""
+        found = set()
+        for length, names in self._by_length.items():
+            for start in range(len(text) - length + 1):
+                if text[start:start + length] in names:
+                    found.add(text[start:start + length])
+        return found
+    
+    def _index(self, name: str) -> None:
+        for field_name in self.get_field_mappings(name):
+            self._by_field.setdefault(field_name, set()).add(name)
+        self._by_length.setdefault(len(name), set()).add(name)
+        self._plans.clear()
+    
+    def _unindex(self, name: str) -> None:
+        for field_name in self.get_field_mappings(name):
+            names = self._by_field.get(field_name)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._by_field[field_name]
+        names = self._by_length[len(name)]
+        names.discard(name)
+        if not names:
+            del self._by_length[len(name)]
+        self._plans.clear()
 
     def __contains__(self, name: str) -> bool:
         """
@@ -0,0 +1,249 @@
+"""
+Built-in latency histograms and counters for Lynkr SDK.
+
+A Metrics instance is a hook (see ``lynkr.instrumentation``): pass it to a
+client with ``metrics=`` and it aggregates every finished call per endpoint
+and service. Read it back with ``snapshot()`` or publish it with
+``render_prometheus()``.
+"""
+
+import bisect
+import math
+import threading
+import typing as t
+from urllib.parse import urlsplit
+
+from .instrumentation import RequestTrace
+
+# Latency bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Label used for failures that never got an HTTP status (timeouts, connection errors)
+NO_STATUS = "none"
+# Label used for calls cancelled or closed before they finished
+ABORTED = "aborted"
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Args:
+        buckets: Sorted bucket upper bounds in seconds; an overflow bucket is
+            always added
+    """
+
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, buckets: t.Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record one value; callers serialize access."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> t.Optional[float]:
+        """
+        Estimate a quantile by interpolating within its bucket.
+
+        Like Prometheus' ``histogram_quantile``, values in the overflow bucket
+        are reported as the largest bound.
+
+        Returns:
+            The estimated value, or None if nothing was observed
+        """
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.bounds[-1]
+
+
+class _Series:
+    """Aggregates for one (endpoint, service) pair."""
+
+    __slots__ = ("latency", "errors", "phases", "lock")
+
+    def __init__(self, buckets: t.Sequence[float]):
+        self.latency = Histogram(buckets)
+        self.errors = {}
+        self.phases = {}
+        self.lock = threading.Lock()
+
+
+class Metrics:
+    """
+    Per-endpoint and per-service request metrics.
+
+    Tracks a latency histogram, error counts by status code and the total
+    time spent in each request phase. Updates take a per-series lock only,
+    so concurrent calls to different endpoints or services do not contend.
+
+    Args:
+        buckets: Latency bucket upper bounds in seconds
+    """
+
+    def __init__(self, buckets: t.Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, trace: RequestTrace) -> None:
+        """Record a finished trace."""
+        self.record(trace)
+
+    def record(self, trace: RequestTrace) -> None:
+        """
+        Record a finished trace.
+
+        Args:
+            trace: Trace passed to the hook
+        """
+        series = self._get_series(urlsplit(trace.url).path, trace.service or "")
+        with series.lock:
+            series.latency.observe(trace.duration or 0.0)
+            if trace.aborted:
+                series.errors[ABORTED] = series.errors.get(ABORTED, 0) + 1
+            elif trace.error is not None:
+                status = str(trace.status_code) if trace.status_code is not None else NO_STATUS
+                series.errors[status] = series.errors.get(status, 0) + 1
+            for phase, seconds in trace.phases.items():
+                series.phases[phase] = series.phases.get(phase, 0.0) + seconds
+
+    def _get_series(self, endpoint: str, service: str) -> _Series:
+        key = (endpoint, service)
+        series = self._series.get(key)
+        if series is None:
+            with self._lock:
+                series = self._series.setdefault(key, _Series(self.buckets))
+        return series
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._series = {}
+
+    def snapshot(self) -> t.List[t.Dict[str, t.Any]]:
+        """
+        Get a consistent copy of the metrics.
+
+        Returns:
+            One dictionary per (endpoint, service) with endpoint, service,
+            count, sum, errors (status code, "none" or "aborted" -> count), phases (phase ->
+            seconds), buckets (upper bound -> cumulative count, the last
+            bound being ``inf``) and p50, p95 and p99 latency estimates
+        """
+        with self._lock:
+            items = sorted(self._series.items())
+        result = []
+        for (endpoint, service), series in items:
+            with series.lock:
+                latency = series.latency
+                entry = {
+                    "endpoint": endpoint,
+                    "service": service,
+                    "count": latency.count,
+                    "sum": latency.sum,
+                    "errors": dict(series.errors),
+                    "phases": dict(series.phases),
+                }
+                cumulative = 0
+                buckets = {}
+                for bound, count in zip(latency.bounds + (math.inf,), latency.counts):
+                    cumulative += count
+                    buckets[bound] = cumulative
+                entry["buckets"] = buckets
+                for q in QUANTILES:
+                    entry[f"p{round(q * 100)}"] = latency.quantile(q)
+            result.append(entry)
+        return result
+
+    def render_prometheus(self, prefix: str = "lynkr") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Exposes ``<prefix>_request_duration_seconds`` (histogram),
+        ``<prefix>_request_duration_quantile_seconds`` (estimated p50/p95/p99),
+        ``<prefix>_request_errors_total`` and
+        ``<prefix>_request_phase_seconds_total``, labelled by endpoint and service.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            The exposition text
+        """
+        snapshot = self.snapshot()
+        duration = f"{prefix}_request_duration_seconds"
+        quantile = f"{prefix}_request_duration_quantile_seconds"
+        errors = f"{prefix}_request_errors_total"
+        phases = f"{prefix}_request_phase_seconds_total"
+
+        lines = [
+            f"# HELP {duration} Latency of Lynkr API calls.",
+            f"# TYPE {duration} histogram",
+        ]
+        for entry in snapshot:
+            labels = _labels(entry)
+            for bound, count in entry["buckets"].items():
+                le = "+Inf" if bound == math.inf else _number(bound)
+                lines.append(f'{duration}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{duration}_sum{{{labels}}} {_number(entry['sum'])}")
+            lines.append(f"{duration}_count{{{labels}}} {entry['count']}")
+
+        lines += [
+            f"# HELP {quantile} Latency quantiles of Lynkr API calls, estimated from the histogram.",
+            f"# TYPE {quantile} gauge",
+        ]
+        for entry in snapshot:
+            labels = _labels(entry)
+            for q in QUANTILES:
+                value = entry[f"p{round(q * 100)}"]
+                if value is not None:
+                    lines.append(f'{quantile}{{{labels},quantile="{q}"}} {_number(value)}')
+
+        lines += [
+            f"# HELP {errors} Failed or aborted Lynkr API calls by HTTP status code.",
+            f"# TYPE {errors} counter",
+        ]
+        for entry in snapshot:
+            labels = _labels(entry)
+            for status, count in sorted(entry["errors"].items()):
+                lines.append(f'{errors}{{{labels},status_code="{status}"}} {count}')
+
+        lines += [
+            f"# HELP {phases} Time spent in each phase of Lynkr API calls.",
+            f"# TYPE {phases} counter",
+        ]
+        for entry in snapshot:
+            labels = _labels(entry)
+            for phase, seconds in sorted(entry["phases"].items()):
+                lines.append(f'{phases}{{{labels},phase="{phase}"}} {_number(seconds)}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _labels(entry: t.Dict[str, t.Any]) -> str:
+    return f'endpoint="{_escape(entry["endpoint"])}",service="{_escape(entry["service"])}"'
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    return repr(float(value))
@@ -2,8 +2,384 @@
 Schema handling for Lynkr SDK.
 """
 
+import sys
 import typing as t
 import json
+import weakref
+from operator import itemgetter
+
+from .exceptions import ValidationError
+from .utils import serialization
+
+
+# Python types accepted for each schema type, and how errors describe them
+_TYPE_CHECKS = {
+    "string": (str, "a string"),
+    "number": ((int, float), "a number"),
+    "integer": (int, "an integer"),
+    "boolean": (bool, "a boolean"),
+    "array": (list, "an array"),
+    "object": (dict, "an object"),
+}
+
+
+# Placeholder values used by Schema.template(); any other type gets None
+_TEMPLATE_VALUES = {
+    "string": "",
+    "number": 0,
+    "integer": 0,
+    "boolean": False,
+    "array": [],
+    "list": [],  # not a schema type, kept for schemas that used it
+    "object": {},
+}
+
+
+class CompiledValidator:
+    """
+    Validator precomputed from a schema definition.
+    
+    The required field set and a per-field type-check table are built once,
+    so validating a payload is a dictionary lookup and an ``isinstance`` call
+    per field. Nested ``object`` fields (``properties``) and ``array`` item
+    types (``items``) are compiled recursively. Obtain one with
+    :meth:`Schema.compile`.
+    
+    Args:
+        schema_data: Schema definition with ``fields`` and ``required_fields``
+        fail_fast: Stop at the first error instead of collecting all of them
+        path: Prefix for field names in error messages (used for nested objects)
+    """
+    
+    __slots__ = ("fail_fast", "required", "types", "messages", "deep")
+    
+    def __init__(self, schema_data: t.Dict[str, t.Any], fail_fast: bool = False, path: str = ""):
+        self.fail_fast = fail_fast
+        fields = schema_data.get("fields", {})
+        required = schema_data.get("required_fields", [])
+        if path:
+            # Nested objects may use JSON-Schema style keys
+            fields = fields or schema_data.get("properties", {})
+            # Draft 3 marks a field itself with "required": true, only a list names fields
+            if not required and isinstance(schema_data.get("required"), list):
+                required = schema_data["required"]
+        self.required = tuple(
+            (field, f"Missing required field: {path}{field}") for field in required
+        )
+        # field -> accepted types / error message, plus full checks for the
+        # few fields that need recursion (nested objects, typed array items)
+        self.types = {}
+        self.messages = {}
+        self.deep = {}
+        for field_name, field_schema in fields.items():
+            check = _compile_field(field_schema, f"{path}{field_name}", fail_fast)
+            if check is not None:
+                self.types[field_name] = check[0]
+                self.messages[field_name] = check[1]
+                if check[2] is not None or check[3] is not None:
+                    self.deep[field_name] = check
+    
+    def __call__(self, data: t.Dict[str, t.Any]) -> t.List[str]:
+        """
+        Validate data.
+        
+        Args:
+            data: Data to validate
+            
+        Returns:
+            List of validation error messages (empty if valid)
+        """
+        errors = []
+        self._validate(data, errors)
+        return errors
+    
+    def _validate(self, data: t.Dict[str, t.Any], errors: t.List[str]) -> bool:
+        """Append errors for ``data``; returns False once fail-fast should stop."""
+        fail_fast = self.fail_fast
+        for field, message in self.required:
+            if field not in data:
+                errors.append(message)
+                if fail_fast:
+                    return False
+        
+        types = self.types
+        deep = self.deep
+        for field_name, field_value in data.items():
+            expected = types.get(field_name)
+            if expected is None:
+                continue
+            if not isinstance(field_value, expected):
+                errors.append(self.messages[field_name])
+                if fail_fast:
+                    return False
+            elif deep and field_name in deep:
+                if not _run_check(deep[field_name], field_value, errors, fail_fast):
+                    return False
+        return True
+
+
+def _compile_field(field_schema: t.Any, path: str, fail_fast: bool) -> t.Optional[tuple]:
+    """
+    Compile a field definition into a ``(types, message, nested, items, path)`` check.
+    
+    Returns None for fields whose type is not checked.
+    """
+    if not isinstance(field_schema, dict):
+        return None
+    field_type = field_schema.get("type")
+    entry = _TYPE_CHECKS.get(field_type)
+    if entry is None:
+        return None
+    types, description = entry
+    nested = None
+    items = None
+    if field_type == "object" and (field_schema.get("properties") or field_schema.get("fields")):
+        nested = CompiledValidator(field_schema, fail_fast=fail_fast, path=f"{path}.")
+    elif field_type == "array" and field_schema.get("items"):
+        items = _compile_field(field_schema["items"], f"{path}[]", fail_fast)
+    return (types, f"Field '{path}' must be {description}", nested, items, path)
+
+
+def _run_check(check: tuple, value: t.Any, errors: t.List[str], fail_fast: bool) -> bool:
+    """Apply a compiled field check; returns False once fail-fast should stop."""
+    types, message, nested, items, path = check
+    if not isinstance(value, types):
+        errors.append(message)
+        return not fail_fast
+    if nested is not None:
+        return nested._validate(value, errors)
+    if items is not None:
+        item_types, item_message, item_nested, item_items, _ = items
+        marker = f"{path}[]"
+        for index, item in enumerate(value):
+            if item_nested is None and item_items is None:
+                if not isinstance(item, item_types):
+                    errors.append(item_message.replace(marker, f"{path}[{index}]", 1))
+                    if fail_fast:
+                        return False
+                continue
+            item_errors = []
+            ok = _run_check(items, item, item_errors, fail_fast)
+            errors.extend(error.replace(marker, f"{path}[{index}]", 1) for error in item_errors)
+            if not ok:
+                return False
+    return True
+
+
+# NumPy dtype kinds whose elements satisfy each schema type; bools count
+# as integers and numbers, matching isinstance(True, int)
+_DTYPE_KINDS = {
+    "string": "U",
+    "number": "biuf",
+    "integer": "biu",
+    "boolean": "b",
+    "array": "",
+    "object": "",
+}
+
+_MISSING = object()
+
+
+def _is_missing(value: t.Any) -> bool:
+    """True for the values that mark an absent entry in column-oriented input."""
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _to_python(value: t.Any) -> t.Any:
+    """Convert a NumPy scalar to the equivalent Python value."""
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        return value.item()
+    return value
+
+
+class BulkValidationResult:
+    """
+    Compact result of :meth:`Schema.validate_many`.
+    
+    Errors are indexed by field rather than formatted per record: ``missing``
+    maps each required field to the rows that lack it and ``type_errors``
+    maps each field to the rows whose value has the wrong type (including
+    nested object / array item errors). Messages for a single row are built
+    on demand with :meth:`errors_for`.
+    
+    Attributes:
+        n_rows: Number of records validated
+        missing: Required field name -> sorted row indices missing it
+        type_errors: Field name -> sorted row indices with an invalid value
+    """
+    
+    __slots__ = ("n_rows", "missing", "type_errors", "_schema", "_get_row")
+    
+    def __init__(
+        self,
+        n_rows: int,
+        missing: t.Dict[str, t.List[int]],
+        type_errors: t.Dict[str, t.List[int]],
+        schema: "Schema",
+        get_row: t.Callable[[int], t.Dict[str, t.Any]],
+    ):
+        self.n_rows = n_rows
+        self.missing = missing
+        self.type_errors = type_errors
+        self._schema = schema
+        self._get_row = get_row
+    
+    def __repr__(self) -> str:
+        return f"BulkValidationResult(n_rows={self.n_rows}, invalid_rows={len(self.invalid_rows)})"
+    
+    @property
+    def ok(self) -> bool:
+        """True if every record is valid."""
+        return not self.missing and not self.type_errors
+    
+    @property
+    def invalid_rows(self) -> t.List[int]:
+        """Sorted indices of the records with at least one error."""
+        rows = set()
+        for indices in self.missing.values():
+            rows.update(indices)
+        for indices in self.type_errors.values():
+            rows.update(indices)
+        return sorted(rows)
+    
+    def errors_for(self, row: int) -> t.List[str]:
+        """
+        Get the validation messages for one record.
+        
+        Args:
+            row: Index of the record
+            
+        Returns:
+            The messages Schema.validate would return for that record
+        """
+        return self._schema.validate(self._get_row(row))
+
+
+class FieldSpec:
+    """
+    Immutable definition of one schema field, shared between schemas.
+    
+    Identical field definitions (e.g. ``{"type": "string"}``) are stored once
+    however many schemas and field names use them; see :func:`intern_field`.
+    
+    Attributes:
+        type: The field's ``type``, or None if it has none
+    """
+    
+    __slots__ = ("type", "_frozen", "__weakref__")
+    
+    def __init__(self, frozen: t.Any):
+        self._frozen = frozen
+        spec = _thaw(frozen)
+        self.type = spec.get("type") if isinstance(spec, dict) else None
+    
+    def __repr__(self) -> str:
+        return f"FieldSpec({self.to_dict()!r})"
+    
+    def to_dict(self) -> t.Any:
+        """
+        Get the field definition.
+        
+        Returns:
+            A new copy of the definition, as received from the API
+        """
+        return _thaw(self._frozen)
+
+
+# Interned field definitions: frozen definition -> weak reference to its
+# FieldSpec, removed once no schema uses it. Plain dict operations are
+# atomic, so no lock is needed; a race at worst creates a duplicate.
+_FIELD_SPECS = {}
+# Interned name lists (required/sensitive/optional fields and top-level
+# layouts) as (tuple, frozenset); bounded, later lists are simply not shared
+_NAMES = {}
+_NAMES_MEMORY = 65536
+
+# Top-level schema keys holding lists of field names
+_NAME_LISTS = ("required_fields", "sensitive_fields", "optional_fields")
+
+_intern = sys.intern
+
+
+def intern_field(spec: t.Any) -> FieldSpec:
+    """
+    Get the shared FieldSpec for a field definition.
+    
+    Args:
+        spec: Field definition, e.g. ``{"type": "string", "description": "..."}``
+        
+    Returns:
+        The FieldSpec every equal definition maps to
+    """
+    frozen = _freeze(spec)
+    ref = _FIELD_SPECS.get(frozen)
+    field = ref() if ref is not None else None
+    if field is None:
+        field = FieldSpec(frozen)
+        _FIELD_SPECS[frozen] = weakref.ref(field, lambda ref, frozen=frozen: _forget_field(frozen, ref))
+    return field
+
+
+def _forget_field(frozen: t.Any, ref: "weakref.ref[FieldSpec]") -> None:
+    if _FIELD_SPECS.get(frozen) is ref:
+        _FIELD_SPECS.pop(frozen, None)
+
+
+def _intern_names(names: t.Iterable[str]) -> t.Tuple[t.Tuple[str, ...], t.FrozenSet[str]]:
+    """Return a shared (tuple, frozenset) pair for a list of names."""
+    key = tuple([_intern(name) for name in names])
+    pair = _NAMES.get(key)
+    if pair is None:
+        pair = (key, frozenset(key))
+        if len(_NAMES) < _NAMES_MEMORY:
+            pair = _NAMES.setdefault(key, pair)
+    return pair
+
+
+def _freeze(value: t.Any) -> t.Any:
+    """Convert JSON data to a hashable form that tells apart types that compare equal (1, 1.0, True)."""
+    kind = type(value)
+    if kind is str:
+        return _intern(value)
+    if kind is dict:
+        items = []
+        for key, item in value.items():
+            # Field definitions are mostly flat: handle scalars without recursing
+            item_kind = type(item)
+            if item_kind is str:
+                item = _intern(item)
+            elif item_kind is bool or item_kind is int or item_kind is float:
+                item = (item_kind, item)
+            elif item is not None:
+                item = _freeze(item)
+            items.append((_intern(key) if type(key) is str else _freeze(key), item))
+        return (dict, tuple(items))
+    if kind is list:
+        return (list, tuple([_freeze(item) for item in value]))
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return _intern(str(value))
+    if isinstance(value, dict):
+        return _freeze(dict(value))
+    if isinstance(value, (list, tuple)):
+        return _freeze(list(value))
+    return (kind, value)
+
+
+def _thaw(frozen: t.Any) -> t.Any:
+    """Rebuild the JSON data _freeze() was given."""
+    if frozen is None or type(frozen) is str:
+        return frozen
+    kind, value = frozen
+    if kind is dict:
+        return {key: _thaw(item) for key, item in value}
+    if kind is list:
+        return [_thaw(item) for item in value]
+    return value
+
+
+_EMPTY_NAMES = _intern_names(())
 
 
 class Schema:
@@ -11,23 +387,129 @@ class Schema:
     Represents a schema returned by the API.
     
     Provides helper methods to work with schema data.
+    
+    The schema is stored compactly rather than as the API's nested
+    dictionary: field definitions are interned :class:`FieldSpec` objects
+    shared between schemas, field names are interned strings, and the
+    required/sensitive/optional lists are shared tuples and frozensets.
+    to_dict() rebuilds the original dictionary on demand.
+    
+    A schema created with :meth:`from_json` keeps the raw JSON and only
+    parses it when its fields are first used.
     """
     
+    __slots__ = (
+        "_source", "_layout", "_fields", "_required", "_sensitive", "_optional", "_extra",
+        "_validators", "_templates",
+    )
+    
     def __init__(self, schema_data: t.Dict[str, t.Any]):
-        self._schema = schema_data
+        self._source = None
+        self._validators = None
+        self._templates = None
+        self._build(schema_data)
+    
+    @classmethod
+    def from_json(cls, data: t.Union[bytes, str]) -> "Schema":
+        """
+        Create a schema from its raw JSON, parsed on first use.
+        
+        Callers that only pass the schema along, or only need to_dict() or
+        to_json(), never pay for building the compact representation.
+        
+        Args:
+            data: JSON object as bytes or str
+            
+        Returns:
+            Schema wrapping the raw JSON; invalid JSON raises ValueError on first use
+        """
+        return cls._deferred(bytes(data) if isinstance(data, (bytearray, memoryview)) else data)
+    
+    @classmethod
+    def _deferred(cls, source: t.Union[bytes, str, t.Dict[str, t.Any]]) -> "Schema":
+        """Create a schema built from ``source`` (raw JSON, or a dict it takes ownership of) on first use."""
+        schema = cls.__new__(cls)
+        schema._source = source
+        schema._validators = None
+        schema._templates = None
+        return schema
+    
+    def _load(self) -> None:
+        """Build the compact representation of a deferred schema."""
+        source = self._source
+        if source is not None:
+            self._build(source if isinstance(source, dict) else serialization.loads(source))
+            self._source = None
+    
+    def _build(self, schema_data: t.Dict[str, t.Any]) -> None:
+        fields = None
+        required = sensitive = optional = _EMPTY_NAMES
+        extra = None
+        for key, value in schema_data.items():
+            if key == "fields" and isinstance(value, dict):
+                fields = {_intern(name): intern_field(spec) for name, spec in value.items()}
+            elif key in _NAME_LISTS and isinstance(value, list) and all(isinstance(name, str) for name in value):
+                names = _intern_names(value)
+                if key == "required_fields":
+                    required = names
+                elif key == "sensitive_fields":
+                    sensitive = names
+                else:
+                    optional = names
+            else:
+                # Anything else is kept verbatim, frozen so it cannot be changed
+                if extra is None:
+                    extra = {}
+                extra[key] = _freeze(value)
+        # Assigned last, so a concurrent _load() of the same schema never
+        # exposes a half-built state
+        self._layout = _intern_names(schema_data)[0]
+        self._fields, self._extra = fields, extra
+        self._required, self._sensitive, self._optional = required, sensitive, optional
+    
+    def _json_bytes(self) -> bytes:
+        """Serialized schema, reusing the raw JSON of an unparsed from_json() schema."""
+        source = self._source
+        if source is not None and not isinstance(source, dict):
+            return source.encode() if isinstance(source, str) else source
+        return serialization.dumps(self.to_dict())
     
     def __repr__(self) -> str:
         """String representation of the schema."""
-        return f"Schema({self._schema})"
+        return f"Schema({self.to_dict()})"
+    
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        # Re-intern on unpickling instead of copying shared descriptors
+        source = self._source
+        if source is not None and not isinstance(source, dict):
+            return (Schema.from_json, (source,))
+        return (Schema, (self.to_dict(),))
     
     def to_dict(self) -> t.Dict[str, t.Any]:
         """
         Convert schema to dictionary.
         
         Returns:
-            Dict representation of the schema
+            Dict representation of the schema, a new copy on every call
         """
-        return self._schema
+        source = self._source
+        if source is not None:
+            if not isinstance(source, dict):
+                return serialization.loads(source)
+            self._load()
+        data = {}
+        for key in self._layout:
+            if self._extra is not None and key in self._extra:
+                data[key] = _thaw(self._extra[key])
+            elif key == "fields":
+                data[key] = {name: field.to_dict() for name, field in self._fields.items()}
+            elif key == "required_fields":
+                data[key] = list(self._required[0])
+            elif key == "sensitive_fields":
+                data[key] = list(self._sensitive[0])
+            else:
+                data[key] = list(self._optional[0])
+        return data
     
     def to_json(self, indent: int = 2) -> str:
         """
@@ -39,7 +521,7 @@ class Schema:
         Returns:
             JSON string representation of the schema
         """
-        return json.dumps(self._schema, indent=indent)
+        return json.dumps(self.to_dict(), indent=indent)
     
     def get_required_fields(self) -> t.List[str]:
         """
@@ -48,7 +530,9 @@ class Schema:
         Returns:
             List of required field names
         """
-        return self._schema.get("required_fields", [])
+        if self._source is not None:
+            self._load()
+        return list(self._required[0])
     
     def get_field_type(self, field_name: str) -> t.Optional[str]:
         """
@@ -60,9 +544,10 @@ class Schema:
         Returns:
             Type of the field or None if field not found
         """
-        fields = self._schema.get("fields", {})
-        field = fields.get(field_name, {})
-        return field.get("type")
+        if self._source is not None:
+            self._load()
+        field = self._fields.get(field_name) if self._fields is not None else None
+        return field.type if field is not None else None
     
     def is_sensitive_field(self, field_name: str) -> bool:
         """
@@ -74,8 +559,9 @@ class Schema:
         Returns:
             True if field is sensitive, False otherwise
         """
-        sensitive_fields = self._schema.get("sensitive_fields", [])
-        return field_name in sensitive_fields
+        if self._source is not None:
+            self._load()
+        return field_name in self._sensitive[1]
     
     def is_optional_field(self, field_name: str) -> bool:
         """
@@ -87,45 +573,265 @@ class Schema:
         Returns:
             True if field is optional, False otherwise
         """
-        optional_fields = self._schema.get("optional_fields", [])
-        return field_name in optional_fields
+        if self._source is not None:
+            self._load()
+        return field_name in self._optional[1]
+    
+    def template(self, include_sensitive: bool = False) -> t.Dict[str, t.Any]:
+        """
+        Get a minimal payload with a placeholder value for every required field.
+        
+        Placeholders are ``""`` for strings, ``0`` for numbers and integers,
+        ``False`` for booleans, ``[]`` for arrays, ``{}`` for objects and
+        ``None`` otherwise, so the template passes validate(). The skeleton
+        is derived once per schema and each call returns a fresh copy, safe
+        to fill in.
+        
+        Args:
+            include_sensitive: Also include required fields marked as sensitive
+            
+        Returns:
+            Dictionary of required field name to placeholder value
+        """
+        payload, containers, _ = self._template(include_sensitive)
+        if not containers:
+            return dict(payload)
+        return {**payload, **{field: factory() for field, factory in containers}}
+    
+    def template_json(self, include_sensitive: bool = False) -> str:
+        """
+        Get the template() payload as a pretty-printed JSON string.
+        
+        Args:
+            include_sensitive: Also include required fields marked as sensitive
+            
+        Returns:
+            JSON string, cached alongside the template
+        """
+        return self._template(include_sensitive)[2]
+    
+    def _template(
+        self, include_sensitive: bool
+    ) -> t.Tuple[t.Dict[str, t.Any], t.Tuple[t.Tuple[str, type], ...], str]:
+        """Build, or return the cached, (payload, (field, list or dict) pairs, JSON) for template()."""
+        if self._templates is None:
+            self._templates = {}
+        cached = self._templates.get(include_sensitive)
+        if cached is None:
+            schema_data = self.to_dict()
+            fields = schema_data.get("fields", {})
+            required = schema_data.get("required_fields", []) or schema_data.get("required", [])
+            sensitive = set(schema_data.get("sensitive_fields", []))
+            payload = {}
+            for field in required:
+                # Skip sensitive unless explicitly requested
+                if field in sensitive and not include_sensitive:
+                    continue
+                payload[field] = _TEMPLATE_VALUES.get(fields.get(field, {}).get("type"))
+            containers = tuple(
+                (field, type(value)) for field, value in payload.items() if isinstance(value, (list, dict))
+            )
+            cached = self._templates[include_sensitive] = (payload, containers, json.dumps(payload, indent=2))
+        return cached
+    
+    def compile(self, fail_fast: bool = False) -> CompiledValidator:
+        """
+        Get a compiled validator for this schema.
+        
+        The validator is built on first use and cached, so later calls are
+        free.
+        
+        Args:
+            fail_fast: Stop at the first error instead of collecting all of them
+            
+        Returns:
+            Callable returning a list of validation error messages
+        """
+        if self._validators is None:
+            self._validators = {}
+        validator = self._validators.get(fail_fast)
+        if validator is None:
+            validator = self._validators[fail_fast] = CompiledValidator(self.to_dict(), fail_fast=fail_fast)
+        return validator
     
-    def validate(self, data: t.Dict[str, t.Any]) -> t.List[str]:
+    def validate(self, data: t.Dict[str, t.Any], fail_fast: bool = False) -> t.List[str]:
         """
         Validate data against the schema.
         
         Args:
             data: Data to validate
+            fail_fast: Return as soon as the first error is found
             
         Returns:
             List of validation error messages (empty if valid)
         """
-        errors = []
+        return self.compile(fail_fast)(data)
+    
+    def validate_many(
+        self,
+        records: t.Union[t.Sequence[t.Dict[str, t.Any]], t.Mapping[str, t.Sequence[t.Any]]],
+    ) -> BulkValidationResult:
+        """
+        Validate many records at once, column by column.
         
-        # Check required fields
-        for field in self.get_required_fields():
-            if field not in data:
-                errors.append(f"Missing required field: {field}")
+        Accepts either a sequence of dicts (one per record) or a column-oriented
+        mapping of field name to values (lists, NumPy arrays or pandas Series).
+        NumPy/pandas columns with a numeric, boolean or unicode dtype are
+        type-checked from the dtype without visiting each element. In
+        column-oriented input a ``None`` (or NaN) entry marks a missing value.
         
-        # Validate field types
-        fields = self._schema.get("fields", {})
-        for field_name, field_value in data.items():
-            if field_name in fields:
-                field_schema = fields[field_name]
-                field_type = field_schema.get("type")
-                
-                # Basic type validation
-                if field_type == "string" and not isinstance(field_value, str):
-                    errors.append(f"Field '{field_name}' must be a string")
-                elif field_type == "number" and not isinstance(field_value, (int, float)):
-                    errors.append(f"Field '{field_name}' must be a number")
-                elif field_type == "integer" and not isinstance(field_value, int):
-                    errors.append(f"Field '{field_name}' must be an integer")
-                elif field_type == "boolean" and not isinstance(field_value, bool):
-                    errors.append(f"Field '{field_name}' must be a boolean")
-                elif field_type == "array" and not isinstance(field_value, list):
-                    errors.append(f"Field '{field_name}' must be an array")
-                elif field_type == "object" and not isinstance(field_value, dict):
-                    errors.append(f"Field '{field_name}' must be an object")
-        
-        return errors
\ No newline at end of file
+        Args:
+            records: Records to validate
+            
+        Returns:
+            BulkValidationResult indexing the invalid rows per field
+            
+        Raises:
+            ValidationError: If the columns have different lengths
+        """
+        validator = self.compile()
+        if isinstance(records, t.Mapping):
+            columns = {name: _as_column(values) for name, values in records.items()}
+            lengths = {len(values) for values in columns.values()}
+            if len(lengths) > 1:
+                raise ValidationError("All columns must have the same length")
+            n_rows = lengths.pop() if lengths else 0
+            missing, type_errors = _validate_columns(self.get_field_type, validator, columns, n_rows)
+            get_row = lambda row: {
+                name: _to_python(values[row])
+                for name, values in columns.items()
+                if not _is_missing(values[row])
+            }
+        else:
+            n_rows = len(records)
+            missing, type_errors = _validate_rows(validator, records)
+            get_row = records.__getitem__
+        return BulkValidationResult(n_rows, missing, type_errors, self, get_row)
+
+
+def _check_ok(check: tuple, value: t.Any) -> bool:
+    """True if ``value`` passes a compiled field check, including nested fields."""
+    errors = []
+    _run_check(check, value, errors, False)
+    return not errors
+
+
+def _as_column(values: t.Any) -> t.Any:
+    """Unwrap pandas Series to NumPy arrays, keeping nullable values as None."""
+    to_numpy = getattr(values, "to_numpy", None)
+    if to_numpy is None:
+        return values
+    array = to_numpy()
+    if array.dtype.kind == "O":
+        array = to_numpy(dtype=object, na_value=None)
+    return array
+
+
+def _validate_rows(
+    validator: CompiledValidator, rows: t.Sequence[t.Dict[str, t.Any]]
+) -> t.Tuple[t.Dict[str, t.List[int]], t.Dict[str, t.List[int]]]:
+    """Index missing and mistyped fields across row-oriented records."""
+    required = frozenset(field for field, _ in validator.required)
+    typed = {field: expected for field, expected in validator.types.items() if field not in validator.deep}
+    typed_keys = frozenset(typed)
+    expected_types = tuple(typed.values())
+    getter = itemgetter(*typed) if len(typed) > 1 else lambda row: tuple(row[field] for field in typed)
+    
+    # Fast path: a subset test, an itemgetter and map(isinstance) per record,
+    # all running in C; only records that fail it are examined field by field
+    suspects = []
+    for i, row in enumerate(rows):
+        keys = row.keys()
+        if required <= keys and typed_keys <= keys and all(map(isinstance, getter(row), expected_types)):
+            continue
+        suspects.append(i)
+    
+    missing = {}
+    type_errors = {}
+    for i in suspects:
+        row = rows[i]
+        for field, _ in validator.required:
+            if field not in row:
+                missing.setdefault(field, []).append(i)
+        for field, expected in typed.items():
+            value = row.get(field, _MISSING)
+            if value is not _MISSING and not isinstance(value, expected):
+                type_errors.setdefault(field, []).append(i)
+    
+    for field, check in validator.deep.items():
+        indices = [
+            i for i, row in enumerate(rows)
+            if (value := row.get(field, _MISSING)) is not _MISSING
+            and not _check_ok(check, value)
+        ]
+        if indices:
+            type_errors[field] = indices
+    return missing, type_errors
+
+
+def _validate_columns(
+    field_type: t.Callable[[str], t.Optional[str]],
+    validator: CompiledValidator,
+    columns: t.Dict[str, t.Any],
+    n_rows: int,
+) -> t.Tuple[t.Dict[str, t.List[int]], t.Dict[str, t.List[int]]]:
+    """Index missing and mistyped fields across column-oriented records."""
+    missing = {}
+    type_errors = {}
+    absent = {}
+    for field, column in columns.items():
+        if field not in validator.types and field not in validator.required:
+            continue
+        absent[field], bad = _check_column(
+            column,
+            validator.types.get(field),
+            field_type(field),
+            validator.deep.get(field),
+        )
+        if bad:
+            type_errors[field] = bad
+    
+    for field, _ in validator.required:
+        if field not in columns:
+            missing[field] = list(range(n_rows))
+        elif absent[field]:
+            missing[field] = absent[field]
+    return missing, type_errors
+
+
+def _check_column(
+    column: t.Any,
+    expected: t.Any,
+    schema_type: t.Optional[str],
+    deep: t.Optional[tuple],
+) -> t.Tuple[t.List[int], t.List[int]]:
+    """Return (missing rows, mistyped rows) for one column."""
+    dtype = getattr(column, "dtype", None)
+    if dtype is not None and dtype.kind != "O":
+        # Typed NumPy column: only float columns can hold missing values (NaN)
+        absent = (column != column).nonzero()[0].tolist() if dtype.kind == "f" else []
+        if expected is None or dtype.kind in _DTYPE_KINDS.get(schema_type, ""):
+            return absent, []
+        skip = set(absent)
+        return absent, [i for i in range(len(column)) if i not in skip]
+    
+    if dtype is not None:
+        column = [_to_python(value) for value in column]
+    if expected is None:
+        return [i for i, value in enumerate(column) if _is_missing(value)], []
+    
+    # None and NaN never pass a type check except NaN for numbers, so only
+    # the values failing isinstance need a closer look
+    candidates = [i for i, value in enumerate(column) if not isinstance(value, expected)]
+    absent = [i for i in candidates if _is_missing(column[i])]
+    bad = [i for i in candidates if not _is_missing(column[i])] if absent else candidates
+    if schema_type == "number":
+        nan = [i for i, value in enumerate(column) if value != value]
+        if nan:
+            absent = sorted(set(absent).union(nan))
+    if deep is not None:
+        skip = set(candidates)
+        bad = sorted(set(bad).union(
+            i for i, value in enumerate(column) if i not in skip and not _check_ok(deep, value)
+        ))
+    return absent, bad
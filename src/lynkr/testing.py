@@ -0,0 +1,350 @@
+"""
+Local stand-in for the Lynkr API, for integration and load testing.
+
+StandInServer implements ``/api/v0/schema/`` and ``/api/v0/execute/`` over
+real HTTP with real cryptography: execute requests are unwrapped with a
+test RSA keypair and answered with AES-GCM encrypted results, in either
+the JSON or the binary envelope. Latency, error rate and response size are
+configurable, so client throughput can be measured end-to-end on one
+machine::
+
+    with StandInServer(latency=0.02, error_rate=0.01) as server:
+        client = server.client()
+        ref_id, schema, service = client.get_schema("send an email")
+        client.execute({"to": "a@example.com"})
+
+It can also run on its own, e.g. for a load generator in another process:
+``python -m lynkr.testing --port 8080 --latency 0.02``.
+"""
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+import typing as t
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+from .compression import ACCEPT_ENCODING_HEADER, Compression, decompress
+from .crypto import decrypt_with_aes, encrypt_with_aes
+from .envelope import (
+    CONTENT_TYPE as ENVELOPE_CONTENT_TYPE,
+    ENCODING_FLAGS,
+    decrypt_envelope,
+    encrypt_envelope,
+    parse_envelope,
+)
+
+SCHEMA_PATH = "/api/v0/schema/"
+EXECUTE_PATH = "/api/v0/execute/"
+
+DEFAULT_SCHEMA = {
+    "fields": {
+        "to": {"type": "string", "description": "Recipient email address", "optional": False, "sensitive": False},
+        "subject": {"type": "string", "description": "Email subject", "optional": False, "sensitive": False},
+        "api_key": {"type": "string", "description": "Service API key", "optional": False, "sensitive": True},
+    },
+    "required_fields": ["to", "subject", "api_key"],
+    "optional_fields": [],
+    "sensitive_fields": ["api_key"],
+}
+
+_OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under load tests
+    request_queue_size = 128
+
+
+class StandInServer:
+    """
+    Threaded local HTTP server speaking the Lynkr API.
+
+    get_schema returns ``schema`` with a fresh ref_id per call. execute
+    decrypts the request and returns ``{"echo": <decrypted payload>, "via":
+    "json" | "binary"}``, padded with a ``padding`` string of
+    ``response_size`` characters, encrypted with the request's AES key.
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free one)
+        latency: Seconds to wait before answering each request
+        jitter: Extra random delay of up to this many seconds per request
+        error_rate: Fraction of requests answered with ``error_status``
+        error_status: HTTP status of injected errors
+        response_size: Number of padding characters added to execute results
+        schema: Schema returned by get_schema (defaults to DEFAULT_SCHEMA)
+        service: Service name returned in get_schema metadata
+        compression: Compress execute results with "gzip" or "zstd" when the
+            client accepts it
+        private_key: RSA private key used to unwrap execute requests; a
+            2048-bit key is generated when omitted
+        key_id: Keyring id clients created by ``client()`` register the public
+            key under; defaults to the key's fingerprint, so servers running
+            side by side never share an id
+        seed: Seed for latency jitter and error injection
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        response_size: int = 0,
+        schema: t.Optional[t.Dict[str, t.Any]] = None,
+        service: str = "stand_in",
+        compression: t.Optional[str] = None,
+        private_key: t.Any = None,
+        key_id: t.Optional[str] = None,
+        seed: t.Optional[int] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.response_size = response_size
+        self.schema = schema or DEFAULT_SCHEMA
+        self.service = service
+        self.compression = Compression(compression, threshold=0) if compression else None
+        self.private_key = private_key or rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.public_key_pem = self.private_key.public_key().public_bytes(
+            encoding=serialization.Encoding.PEM,
+            format=serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        self.key_id = key_id
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._counts = {"schema": 0, "execute": 0, "errors": 0}
+        self._httpd = _HTTPServer((host, port), _make_handler(self))
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to pass to a client."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        """Serve requests on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, name="lynkr-stand-in", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until stop() is called or it is interrupted, then release the port."""
+        if self._thread is not None:
+            raise RuntimeError("StandInServer is already serving")
+        self._thread = threading.current_thread()
+        try:
+            self._httpd.serve_forever(poll_interval=0.05)
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.stop()
+
+    def client(self, **kwargs: t.Any) -> t.Any:
+        """
+        Create a LynkrClient pointed at this server and encrypting to its key.
+
+        Args:
+            **kwargs: Extra LynkrClient arguments
+
+        Returns:
+            The client
+        """
+        from .client import LynkrClient
+
+        return LynkrClient(**self._client_kwargs(kwargs))
+
+    def async_client(self, **kwargs: t.Any) -> t.Any:
+        """Create an AsyncLynkrClient pointed at this server; see client()."""
+        from .async_client import AsyncLynkrClient
+
+        return AsyncLynkrClient(**self._client_kwargs(kwargs))
+
+    def _client_kwargs(self, kwargs: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        return {
+            "api_key": "stand-in",
+            "base_url": self.url,
+            "public_key": self.public_key_pem,
+            "key_id": self.key_id,
+            **kwargs,
+        }
+
+    def stats(self) -> t.Dict[str, int]:
+        """
+        Get request counters.
+
+        Returns:
+            Dictionary with schema and execute (requests received per
+            endpoint) and errors (injected errors)
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def _count(self, name: str) -> int:
+        with self._lock:
+            self._counts[name] += 1
+            return self._counts[name]
+
+    def _delay_and_fail(self) -> bool:
+        """Apply the configured latency; return True if this request should fail."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def _schema_response(self) -> t.Dict[str, t.Any]:
+        number = self._count("schema")
+        return {
+            "ref_id": f"ref_{number}",
+            "schema": self.schema,
+            "metadata": {"service": self.service, "resource": "stand_in", "method": "POST", "confidence": "high"},
+        }
+
+    def _execute_result(self, payload: t.Any, via: str) -> bytes:
+        self._count("execute")
+        result = {"echo": payload, "via": via}
+        if self.response_size:
+            result["padding"] = "x" * self.response_size
+        return json.dumps(result).encode()
+
+    def _execute_json(self, body: bytes, accept_encoding: str) -> bytes:
+        envelope = json.loads(body)
+        aes_key = self.private_key.decrypt(base64.b64decode(envelope["encrypted_key"]), _OAEP)
+        plaintext = decrypt_with_aes(
+            base64.b64decode(envelope["payload"]), aes_key,
+            base64.b64decode(envelope["iv"]), base64.b64decode(envelope["tag"]),
+        )
+        if envelope.get("encoding"):
+            plaintext = decompress(plaintext, envelope["encoding"])
+        result, encoding = self._compress(self._execute_result(json.loads(plaintext), "json"), accept_encoding)
+        ciphertext, iv, tag = encrypt_with_aes(result, aes_key)
+        data = {
+            "payload": base64.b64encode(ciphertext).decode(),
+            "iv": base64.b64encode(iv).decode(),
+            "tag": base64.b64encode(tag).decode(),
+        }
+        if encoding:
+            data["encoding"] = encoding
+        return json.dumps({"data": data}).encode()
+
+    def _execute_binary(self, body: bytes, accept_encoding: str) -> bytes:
+        request = parse_envelope(body)
+        aes_key = self.private_key.decrypt(bytes(request.encrypted_key), _OAEP)
+        plaintext = decrypt_envelope(request, aes_key)
+        if request.encoding:
+            plaintext = decompress(plaintext, request.encoding)
+        result, encoding = self._compress(self._execute_result(json.loads(plaintext), "binary"), accept_encoding)
+        return bytes(encrypt_envelope(result, aes_key, flags=ENCODING_FLAGS.get(encoding, 0)))
+
+    def _compress(self, result: bytes, accept_encoding: str) -> t.Tuple[bytes, t.Optional[str]]:
+        accepted = {encoding.strip() for encoding in accept_encoding.split(",")}
+        if self.compression is None or self.compression.algorithm not in accepted:
+            return result, None
+        return self.compression.compress(result)
+
+
+def _make_handler(server: StandInServer) -> t.Type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; don't let Nagle hold the body back
+        disable_nagle_algorithm = True
+
+        def do_POST(self) -> None:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not self.headers.get("Authorization", "").startswith("Bearer "):
+                return self._send_json(401, {"message": "Missing API key"})
+            if server._delay_and_fail():
+                server._count("errors")
+                return self._send_json(server.error_status, {"message": "Injected error"})
+
+            try:
+                if self.path == SCHEMA_PATH:
+                    return self._send_json(200, server._schema_response())
+                if self.path == EXECUTE_PATH:
+                    accept_encoding = self.headers.get(ACCEPT_ENCODING_HEADER, "")
+                    if self.headers.get("Content-Type") == ENVELOPE_CONTENT_TYPE:
+                        return self._send(200, server._execute_binary(body, accept_encoding), ENVELOPE_CONTENT_TYPE)
+                    return self._send(200, server._execute_json(body, accept_encoding), "application/json")
+            except Exception as e:
+                return self._send_json(400, {"message": f"Malformed request: {e}"})
+            self._send_json(404, {"message": f"Unknown endpoint {self.path}"})
+
+        def _send_json(self, status: int, body: t.Dict[str, t.Any]) -> None:
+            self._send(status, json.dumps(body).encode(), "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: t.Any) -> None:
+            pass
+
+    return Handler
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the Lynkr API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay of up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests to fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--response-size", type=int, default=0, help="padding characters per execute result")
+    parser.add_argument("--compression", choices=["gzip", "zstd"])
+    parser.add_argument("--public-key-out", help="write the server's public key (PEM) to this file")
+    args = parser.parse_args(argv)
+
+    server = StandInServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        response_size=args.response_size,
+        compression=args.compression,
+    )
+    if args.public_key_out:
+        with open(args.public_key_out, "wb") as f:
+            f.write(server.public_key_pem)
+    print(f"Serving the Lynkr API stand-in on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
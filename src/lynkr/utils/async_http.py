@@ -0,0 +1,388 @@
+"""
+Asyncio HTTP client for making API requests.
+"""
+
+import asyncio
+import time
+import typing as t
+
+from ..exceptions import ApiError, ConfigurationError
+from ..instrumentation import CONNECT, PARSE, READ, TTFB, Hook, RequestTrace, timed, traced
+from . import serialization
+from .http import _body_size, _encode_body, _status_error
+from .retry import Attempt, RetryPolicy, is_idempotent, parse_retry_after
+
+
+class AsyncHttpClient:
+    """
+    Non-blocking HTTP client for making API requests from asyncio code.
+    
+    Backed by a pooled ``httpx.AsyncClient``; requires the ``async`` extra
+    (``pip install lynkr[async]``).
+    
+    Args:
+        timeout: Request timeout in seconds
+        max_connections: Maximum number of concurrent connections in the pool
+        max_keepalive_connections: Maximum number of idle connections kept alive
+        pool_idle_timeout: Close keep-alive connections idle for longer than this many seconds
+        retry: Retry policy for idempotent requests (defaults to RetryPolicy())
+        transport: Optional ``httpx`` async transport (e.g. for testing)
+        hooks: Callables receiving a RequestTrace after each request; see
+            ``lynkr.instrumentation``
+    """
+    
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        pool_idle_timeout: t.Optional[float] = 5.0,
+        retry: t.Optional[RetryPolicy] = None,
+        transport: t.Any = None,
+        hooks: t.Optional[t.List[Hook]] = None,
+    ):
+        try:
+            import httpx
+        except ImportError:
+            raise ConfigurationError(
+                "AsyncHttpClient requires httpx. Install it with: pip install 'lynkr[async]'"
+            ) from None
+        
+        self._httpx = httpx
+        self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        # Kept as the given list so owners can share and mutate it
+        self.hooks = hooks if hooks is not None else []
+        self.session = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=pool_idle_timeout,
+            ),
+            transport=transport,
+        )
+    
+    async def get(
+        self, 
+        url: str, 
+        headers: t.Dict[str, str] = None, 
+        params: t.Dict[str, t.Any] = None,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.Dict[str, t.Any]:
+        """
+        Make a GET request.
+        
+        Args:
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
+            
+        Returns:
+            Response as dictionary
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        return await self._request("GET", url, headers=headers, params=params, trace=trace)
+    
+    async def post(
+        self, 
+        url: str, 
+        headers: t.Dict[str, str] = None, 
+        json: t.Dict[str, t.Any] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.Dict[str, t.Any]:
+        """
+        Make a POST request.
+        
+        Args:
+            url: Request URL
+            headers: Request headers
+            json: JSON body
+            data: Form data
+            idempotent: Whether the request may be retried on transient failures
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
+            
+        Returns:
+            Response as dictionary
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        return await self._request(
+            "POST", url, headers=headers, json=json, data=data, idempotent=idempotent, trace=trace
+        )
+    
+    async def aclose(self) -> None:
+        """Close the underlying connection pool."""
+        await self.session.aclose()
+    
+    async def post_raw(
+        self,
+        url: str,
+        headers: t.Dict[str, str] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.Any:
+        """
+        Make a POST request and return the response without decoding it.
+        
+        Used for non-JSON bodies such as the binary execute envelope.
+        
+        Args:
+            url: Request URL
+            headers: Request headers
+            data: Request body
+            idempotent: Whether the request may be retried on transient failures
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
+            
+        Returns:
+            The response object; read ``headers`` and ``content`` from it
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        trace, owned = self._trace(trace, "POST", url)
+        with traced(self.hooks, trace if owned else None):
+            return await self._send("POST", url, headers=headers, data=data, idempotent=idempotent, trace=trace)
+    
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: t.Dict[str, str] = None,
+        json: t.Dict[str, t.Any] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        chunk_size: int = 65536,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.AsyncIterator[bytes]:
+        """
+        Make a HTTP request and yield the response body in chunks.
+        
+        Retries apply until the response headers arrive; once the body is
+        being read, failures are raised as-is.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            json: JSON body
+            data: Form data
+            idempotent: Whether the request may be retried on transient failures
+            chunk_size: Maximum size of each yielded chunk in bytes
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here.
+                Time spent waiting for each chunk is recorded as ``read``
+            
+        Yields:
+            Raw response body chunks
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        trace, owned = self._trace(trace, method, url)
+        with traced(self.hooks, trace if owned else None):
+            response = await self._send(
+                method, url, headers=headers, json=json, data=data, idempotent=idempotent, stream=True, trace=trace
+            )
+            try:
+                started = time.perf_counter()
+                async for chunk in response.aiter_bytes(chunk_size=chunk_size):
+                    if trace is not None:
+                        trace.add(READ, time.perf_counter() - started)
+                        trace.response_bytes += len(chunk)
+                    if chunk:
+                        yield chunk
+                    started = time.perf_counter()
+            except self._httpx.HTTPError as e:
+                raise ApiError(f"Request failed while reading response: {str(e)}")
+            finally:
+                await response.aclose()
+    
+    async def _request(
+        self, 
+        method: str, 
+        url: str,
+        headers: t.Dict[str, str] = None,
+        params: t.Dict[str, t.Any] = None,
+        json: t.Dict[str, t.Any] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.Dict[str, t.Any]:
+        """
+        Make a HTTP request and parse the JSON response.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            json: JSON body
+            data: Form data
+            idempotent: Whether the request may be retried on transient failures
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
+            
+        Returns:
+            Response as dictionary
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        trace, owned = self._trace(trace, method, url)
+        with traced(self.hooks, trace if owned else None):
+            response = await self._send(
+                method, url, headers=headers, params=params, json=json, data=data, idempotent=idempotent, trace=trace
+            )
+            with timed(trace, PARSE):
+                try:
+                    return serialization.loads(response.content)
+                except ValueError:
+                    raise ApiError(f"Invalid JSON response: {response.text}")
+    
+    def _trace(self, trace: t.Optional[RequestTrace], method: str, url: str) -> t.Tuple[t.Optional[RequestTrace], bool]:
+        """
+        Pick the trace for a request.
+        
+        Returns:
+            Tuple containing (trace or None, whether this client must emit it)
+        """
+        if trace is not None or not self.hooks:
+            return trace, False
+        return RequestTrace("http", method, url), True
+    
+    async def _send(
+        self, 
+        method: str, 
+        url: str,
+        headers: t.Dict[str, str] = None,
+        params: t.Dict[str, t.Any] = None,
+        json: t.Dict[str, t.Any] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        stream: bool = False,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.Any:
+        """
+        Send a HTTP request, retrying transient failures per the retry policy.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            json: JSON body
+            data: Form data
+            idempotent: Whether the request may be retried on transient failures;
+                requests with an Idempotency-Key header are always retryable
+            stream: Return before the response body is read
+            trace: Trace receiving connect, ttfb and read timings, sizes and
+                the status code
+            
+        Returns:
+            The successful ``httpx.Response``
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        httpx = self._httpx
+        retryable = idempotent or is_idempotent(method, headers)
+        headers, data = _encode_body(headers, json, data)
+        if trace is not None:
+            trace.request_bytes = _body_size(data)
+        attempts = []
+        number = 0
+        while True:
+            number += 1
+            started = time.monotonic()
+            retry_after = None
+            try:
+                request = self.session.build_request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    content=data if isinstance(data, bytes) else None,
+                    data=None if isinstance(data, bytes) else data,
+                )
+                if trace is None:
+                    response = await self.session.send(request, stream=stream)
+                else:
+                    response = await self._traced_send(request, stream, trace)
+                if response.is_error and (stream or trace is not None):
+                    await response.aread()
+                    await response.aclose()
+            except httpx.TimeoutException:
+                error = ApiError(f"Request timed out after {self.timeout} seconds")
+                transient = True
+            except httpx.HTTPError as e:
+                error = ApiError(f"Request failed: {str(e)}")
+                transient = isinstance(e, httpx.TransportError)
+            else:
+                if not response.is_error:
+                    self.retry.record(attempts, Attempt(number, time.monotonic() - started, response.status_code))
+                    return response
+                
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                error = _status_error(response, f"{response.status_code} Error for url: {url}", retry_after)
+                transient = error.status_code in self.retry.retry_statuses
+            
+            delay = self.retry.next_delay(number, retry_after) if retryable and transient else None
+            self.retry.record(
+                attempts,
+                Attempt(number, time.monotonic() - started, error.status_code, error.message, delay),
+            )
+            if delay is None:
+                error.attempts = attempts
+                raise error
+            await asyncio.sleep(delay)
+    
+    async def _traced_send(self, request: t.Any, stream: bool, trace: RequestTrace) -> t.Any:
+        """
+        Send one attempt while recording connect and time-to-first-byte.
+        
+        Connect time comes from httpx's ``trace`` request extension. The body
+        is always deferred so that reading it is timed separately from
+        waiting for the headers.
+        """
+        trace.attempts += 1
+        connecting = {}
+        
+        async def on_event(name: str, info: t.Dict[str, t.Any]) -> None:
+            step, _, state = name.rpartition(".")
+            if step not in ("connection.connect_tcp", "connection.start_tls"):
+                return
+            if state == "started":
+                connecting[step] = time.perf_counter()
+            elif step in connecting:
+                trace.add(CONNECT, time.perf_counter() - connecting.pop(step))
+        
+        request.extensions["trace"] = on_event
+        connect_before = trace.phases.get(CONNECT, 0.0)
+        started = time.perf_counter()
+        try:
+            response = await self.session.send(request, stream=True)
+        finally:
+            elapsed = time.perf_counter() - started
+            trace.add(TTFB, elapsed - (trace.phases.get(CONNECT, 0.0) - connect_before))
+        trace.status_code = response.status_code
+        if stream:
+            trace.response_bytes = 0
+        elif not response.is_error:
+            started = time.perf_counter()
+            try:
+                trace.response_bytes = len(await response.aread())
+            finally:
+                await response.aclose()
+            trace.add(READ, time.perf_counter() - started)
+        return response
@@ -2,29 +2,79 @@
 HTTP client for making API requests.
 """
 
+import time
 import typing as t
 import requests
-from requests.exceptions import RequestException, Timeout
+from requests.exceptions import ConnectionError, RequestException, Timeout
 
 from ..exceptions import ApiError
+from ..instrumentation import CONNECT, PARSE, READ, TTFB, Hook, RequestTrace, current_trace, timed, traced
+from . import serialization
+from .pool import PoolAdapter
+from .retry import Attempt, RetryPolicy, is_idempotent, parse_retry_after
 
 
 class HttpClient:
     """
     HTTP client for making API requests.
     
-    Handles request/response cycle, error handling, and timeout.
+    Handles request/response cycle, error handling, and timeout. Connections
+    are kept alive and pooled per host; the pool is safe to share between threads.
+    
+    Args:
+        timeout: Request timeout in seconds
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum number of connections kept per host; size it to
+            the number of threads sharing the client
+        pool_block: Block when a host's pool is exhausted instead of opening
+            extra, non-reusable connections
+        pool_idle_timeout: Close keep-alive connections idle for longer than
+            this many seconds (None keeps them until the server drops them)
+        retry: Retry policy for idempotent requests (defaults to RetryPolicy())
+        hooks: Callables receiving a RequestTrace after each request; see
+            ``lynkr.instrumentation``
     """
     
-    def __init__(self, timeout: int = 30):
+    def __init__(
+        self,
+        timeout: int = 30,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        pool_idle_timeout: t.Optional[float] = None,
+        retry: t.Optional[RetryPolicy] = None,
+        hooks: t.Optional[t.List[Hook]] = None,
+    ):
         self.timeout = timeout
+        self.retry = retry or RetryPolicy()
+        # Kept as the given list so owners can share and mutate it
+        self.hooks = hooks if hooks is not None else []
         self.session = requests.Session()
+        self.adapter = PoolAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            pool_idle_timeout=pool_idle_timeout,
+        )
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+    
+    def pool_stats(self) -> t.Dict[str, int]:
+        """
+        Get connection pool counters.
+        
+        Returns:
+            Dictionary with connections_created, connections_reused,
+            connections_expired and requests
+        """
+        return self.adapter.stats.snapshot()
     
     def get(
         self, 
         url: str, 
         headers: t.Dict[str, str] = None, 
-        params: t.Dict[str, t.Any] = None
+        params: t.Dict[str, t.Any] = None,
+        trace: t.Optional[RequestTrace] = None
     ) -> t.Dict[str, t.Any]:
         """
         Make a GET request.
@@ -33,6 +83,8 @@ class HttpClient:
             url: Request URL
             headers: Request headers
             params: Query parameters
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
             
         Returns:
             Response as dictionary
@@ -40,14 +92,16 @@ class HttpClient:
         Raises:
             ApiError: If the request fails
         """
-        return self._request("GET", url, headers=headers, params=params)
+        return self._request("GET", url, headers=headers, params=params, trace=trace)
     
     def post(
         self, 
         url: str, 
         headers: t.Dict[str, str] = None, 
         json: t.Dict[str, t.Any] = None,
-        data: t.Any = None
+        data: t.Any = None,
+        idempotent: bool = False,
+        trace: t.Optional[RequestTrace] = None
     ) -> t.Dict[str, t.Any]:
         """
         Make a POST request.
@@ -57,6 +111,9 @@ class HttpClient:
             headers: Request headers
             json: JSON body
             data: Form data
+            idempotent: Whether the request may be retried on transient failures
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
             
         Returns:
             Response as dictionary
@@ -64,7 +121,95 @@ class HttpClient:
         Raises:
             ApiError: If the request fails
         """
-        return self._request("POST", url, headers=headers, json=json, data=data)
+        return self._request(
+            "POST", url, headers=headers, json=json, data=data, idempotent=idempotent, trace=trace
+        )
+    
+    def post_raw(
+        self,
+        url: str,
+        headers: t.Dict[str, str] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        trace: t.Optional[RequestTrace] = None
+    ) -> requests.Response:
+        """
+        Make a POST request and return the response without decoding it.
+        
+        Used for non-JSON bodies such as the binary execute envelope.
+        
+        Args:
+            url: Request URL
+            headers: Request headers
+            data: Request body
+            idempotent: Whether the request may be retried on transient failures
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
+            
+        Returns:
+            The response object; read ``headers`` and ``content`` from it
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        trace, owned = self._trace(trace, "POST", url)
+        with traced(self.hooks, trace if owned else None):
+            return self._send("POST", url, headers=headers, data=data, idempotent=idempotent, trace=trace)
+    
+    def stream(
+        self,
+        method: str,
+        url: str,
+        headers: t.Dict[str, str] = None,
+        json: t.Dict[str, t.Any] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        chunk_size: int = 65536,
+        trace: t.Optional[RequestTrace] = None
+    ) -> t.Iterator[bytes]:
+        """
+        Make a HTTP request and yield the response body in chunks.
+        
+        Retries apply until the response headers arrive; once the body is
+        being read, failures are raised as-is. The connection is returned to
+        the pool when the generator is exhausted or closed.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            json: JSON body
+            data: Form data
+            idempotent: Whether the request may be retried on transient failures
+            chunk_size: Maximum size of each yielded chunk in bytes
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here.
+                Time spent waiting for each chunk is recorded as ``read``
+            
+        Yields:
+            Raw response body chunks
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        trace, owned = self._trace(trace, method, url)
+        with traced(self.hooks, trace if owned else None):
+            response = self._send(
+                method, url, headers=headers, json=json, data=data, idempotent=idempotent, stream=True, trace=trace
+            )
+            try:
+                started = time.perf_counter()
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    if trace is not None:
+                        trace.add(READ, time.perf_counter() - started)
+                        trace.response_bytes += len(chunk)
+                    if chunk:
+                        yield chunk
+                    started = time.perf_counter()
+            except RequestException as e:
+                raise ApiError(f"Request failed while reading response: {str(e)}")
+            finally:
+                response.close()
     
     def _request(
         self, 
@@ -73,10 +218,12 @@ class HttpClient:
         headers: t.Dict[str, str] = None,
         params: t.Dict[str, t.Any] = None,
         json: t.Dict[str, t.Any] = None,
-        data: t.Any = None
+        data: t.Any = None,
+        idempotent: bool = False,
+        trace: t.Optional[RequestTrace] = None
     ) -> t.Dict[str, t.Any]:
         """
-        Make a HTTP request.
+        Make a HTTP request and parse the JSON response.
         
         Args:
             method: HTTP method
@@ -85,6 +232,9 @@ class HttpClient:
             params: Query parameters
             json: JSON body
             data: Form data
+            idempotent: Whether the request may be retried on transient failures
+            trace: Trace to record into, emitted by the caller; if omitted
+                and ``hooks`` are set, a trace is created and emitted here
             
         Returns:
             Response as dictionary
@@ -92,38 +242,202 @@ class HttpClient:
         Raises:
             ApiError: If the request fails
         """
+        trace, owned = self._trace(trace, method, url)
+        with traced(self.hooks, trace if owned else None):
+            response = self._send(
+                method, url, headers=headers, params=params, json=json, data=data, idempotent=idempotent, trace=trace
+            )
+            with timed(trace, PARSE):
+                try:
+                    return serialization.loads(response.content)
+                except ValueError:
+                    raise ApiError(f"Invalid JSON response: {response.text}")
+    
+    def _trace(self, trace: t.Optional[RequestTrace], method: str, url: str) -> t.Tuple[t.Optional[RequestTrace], bool]:
+        """
+        Pick the trace for a request.
+        
+        Returns:
+            Tuple containing (trace or None, whether this client must emit it)
+        """
+        if trace is not None or not self.hooks:
+            return trace, False
+        return RequestTrace("http", method, url), True
+
+    
+    def _send(
+        self, 
+        method: str, 
+        url: str,
+        headers: t.Dict[str, str] = None,
+        params: t.Dict[str, t.Any] = None,
+        json: t.Dict[str, t.Any] = None,
+        data: t.Any = None,
+        idempotent: bool = False,
+        stream: bool = False,
+        trace: t.Optional[RequestTrace] = None
+    ) -> requests.Response:
+        """
+        Send a HTTP request, retrying transient failures per the retry policy.
+        
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Request headers
+            params: Query parameters
+            json: JSON body
+            data: Form data
+            idempotent: Whether the request may be retried on transient failures;
+                requests with an Idempotency-Key header are always retryable
+            stream: Return before the response body is read
+            trace: Trace receiving connect, ttfb and read timings, sizes and
+                the status code
+            
+        Returns:
+            The successful response
+            
+        Raises:
+            ApiError: If the request fails
+        """
+        retryable = idempotent or is_idempotent(method, headers)
+        headers, data = _encode_body(headers, json, data)
+        if trace is not None:
+            trace.request_bytes = _body_size(data)
+        attempts = []
+        number = 0
+        while True:
+            number += 1
+            started = time.monotonic()
+            retry_after = None
+            try:
+                if trace is None:
+                    response = self.session.request(
+                        method=method,
+                        url=url,
+                        headers=headers,
+                        params=params,
+                        data=data,
+                        timeout=self.timeout,
+                        stream=stream
+                    )
+                else:
+                    response = self._traced_request(method, url, headers, params, data, stream, trace)
+                
+                # Raise error for non-2xx status codes
+                response.raise_for_status()
+                
+            except Timeout:
+                error = ApiError(f"Request timed out after {self.timeout} seconds")
+                transient = True
+                
+            except RequestException as e:
+                if hasattr(e, "response") and e.response is not None:
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    error = _status_error(e.response, e, retry_after)
+                    transient = error.status_code in self.retry.retry_statuses
+                    e.response.close()
+                else:
+                    error = ApiError(f"Request failed: {str(e)}")
+                    transient = isinstance(e, ConnectionError)
+            
+            else:
+                self.retry.record(attempts, Attempt(number, time.monotonic() - started, response.status_code))
+                return response
+            
+            delay = self.retry.next_delay(number, retry_after) if retryable and transient else None
+            self.retry.record(
+                attempts,
+                Attempt(number, time.monotonic() - started, error.status_code, error.message, delay),
+            )
+            if delay is None:
+                error.attempts = attempts
+                raise error
+            time.sleep(delay)
+    
+    def _traced_request(
+        self,
+        method: str,
+        url: str,
+        headers: t.Optional[t.Dict[str, str]],
+        params: t.Optional[t.Dict[str, t.Any]],
+        data: t.Any,
+        stream: bool,
+        trace: RequestTrace
+    ) -> requests.Response:
+        """
+        Send one attempt while recording connect and time-to-first-byte.
+        
+        The body is always deferred so that ``_send`` can time reading it
+        separately from waiting for the headers.
+        """
+        trace.attempts += 1
+        connect_before = trace.phases.get(CONNECT, 0.0)
+        token = current_trace.set(trace)
+        started = time.perf_counter()
         try:
             response = self.session.request(
                 method=method,
                 url=url,
                 headers=headers,
                 params=params,
-                json=json,
                 data=data,
-                timeout=self.timeout
+                timeout=self.timeout,
+                stream=True
             )
-            
-            # Raise error for non-2xx status codes
-            response.raise_for_status()
-            
-            # Parse JSON response
-            try:
-                return response.json()
-            except ValueError:
-                raise ApiError(f"Invalid JSON response: {response.text}")
-                
-        except Timeout:
-            raise ApiError(f"Request timed out after {self.timeout} seconds")
-            
-        except RequestException as e:
-            if hasattr(e, "response") and e.response is not None:
-                status_code = e.response.status_code
-                try:
-                    error_detail = e.response.json()
-                except ValueError:
-                    error_detail = e.response.text
-                    
-                error_message = error_detail.get("message", str(e)) if isinstance(error_detail, dict) else str(e)
-                raise ApiError(error_message, status_code=status_code, response=error_detail)
-            else:
-                raise ApiError(f"Request failed: {str(e)}")
+        finally:
+            elapsed = time.perf_counter() - started
+            current_trace.reset(token)
+            trace.add(TTFB, elapsed - (trace.phases.get(CONNECT, 0.0) - connect_before))
+        trace.status_code = response.status_code
+        if stream:
+            trace.response_bytes = 0
+        elif response.ok:
+            started = time.perf_counter()
+            trace.response_bytes = len(response.content)
+            trace.add(READ, time.perf_counter() - started)
+        return response
+
+
+def _encode_body(
+    headers: t.Optional[t.Dict[str, str]], json: t.Any, data: t.Any
+) -> t.Tuple[t.Optional[t.Dict[str, str]], t.Any]:
+    """
+    Serialize a JSON body to bytes once, up front.
+    
+    Returns:
+        Tuple containing (headers with Content-Type set, request body)
+    """
+    if json is None:
+        if isinstance(data, (bytearray, memoryview)):
+            # Neither requests nor httpx accept these as a raw body
+            data = bytes(data)
+        return headers, data
+    headers = dict(headers) if headers else {}
+    if not any(name.lower() == "content-type" for name in headers):
+        headers["Content-Type"] = "application/json"
+    return headers, serialization.dumps(json)
+
+
+def _body_size(data: t.Any) -> t.Optional[int]:
+    """Size of a request body in bytes, or None if it is not known up front."""
+    if data is None:
+        return 0
+    if isinstance(data, (bytes, str)):
+        return len(data)
+    return None
+
+
+def _status_error(response: t.Any, error: t.Any, retry_after: t.Optional[float] = None) -> ApiError:
+    """
+    Build an ApiError from a non-2xx response.
+    
+    Works with both ``requests`` and ``httpx`` response objects.
+    """
+    status_code = response.status_code
+    try:
+        error_detail = serialization.loads(response.content)
+    except ValueError:
+        error_detail = response.text
+        
+    error_message = error_detail.get("message", str(error)) if isinstance(error_detail, dict) else str(error)
+    return ApiError(error_message, status_code=status_code, response=error_detail, retry_after=retry_after)
@@ -0,0 +1,119 @@
+"""
+Connection pool instrumentation for the HTTP client.
+"""
+
+import threading
+import time
+import typing as t
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from ..instrumentation import CONNECT, current_trace
+
+
+class PoolStats:
+    """
+    Thread-safe counters describing connection pool usage.
+
+    Attributes:
+        connections_created: Number of TCP (and TLS) connections opened
+        connections_expired: Number of idle connections closed for exceeding the idle timeout
+        requests: Number of times a connection was checked out of the pool
+    """
+
+    def __init__(self):
+        self.connections_created = 0
+        self.connections_expired = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def incr(self, name: str) -> None:
+        """Increment the named counter."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> t.Dict[str, int]:
+        """
+        Get the current counters.
+
+        Returns:
+            Dictionary of counters, including connections_reused
+        """
+        with self._lock:
+            return {
+                "connections_created": self.connections_created,
+                "connections_reused": max(self.requests - self.connections_created, 0),
+                "connections_expired": self.connections_expired,
+                "requests": self.requests,
+            }
+
+
+def _instrumented_pool(base: t.Type[HTTPConnectionPool], stats: PoolStats, idle_timeout: t.Optional[float]):
+    """Build a connection pool class that reports to ``stats`` and expires idle connections."""
+
+    class ConnectionCls(base.ConnectionCls):
+        def connect(self) -> None:
+            stats.incr("connections_created")
+            trace = current_trace.get()
+            if trace is None:
+                super().connect()
+                return
+            started = time.perf_counter()
+            try:
+                super().connect()
+            finally:
+                trace.add(CONNECT, time.perf_counter() - started)
+
+    class InstrumentedPool(base):
+        def _get_conn(self, timeout: t.Optional[float] = None):
+            conn = super()._get_conn(timeout=timeout)
+            stats.incr("requests")
+            idle_since = getattr(conn, "_lynkr_idle_since", None)
+            if idle_timeout is not None and idle_since is not None and time.monotonic() - idle_since > idle_timeout:
+                # Closed connections reconnect transparently on their next request
+                conn.close()
+                stats.incr("connections_expired")
+            return conn
+
+        def _put_conn(self, conn) -> None:
+            if conn is not None:
+                conn._lynkr_idle_since = time.monotonic()
+            super()._put_conn(conn)
+
+    InstrumentedPool.ConnectionCls = ConnectionCls
+    return InstrumentedPool
+
+
+class PoolAdapter(HTTPAdapter):
+    """
+    ``requests`` transport adapter with pool statistics and idle-connection expiry.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum number of connections kept per host
+        pool_block: Block when a host's pool is exhausted instead of opening extra connections
+        pool_idle_timeout: Close keep-alive connections idle for longer than this many seconds
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        pool_idle_timeout: t.Optional[float] = None,
+    ):
+        self.stats = PoolStats()
+        self.pool_idle_timeout = pool_idle_timeout
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+
+    def init_poolmanager(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _instrumented_pool(HTTPConnectionPool, self.stats, self.pool_idle_timeout),
+            "https": _instrumented_pool(HTTPSConnectionPool, self.stats, self.pool_idle_timeout),
+        }
@@ -0,0 +1,149 @@
+"""
+Retry policy for transient API failures.
+"""
+
+import random
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+DEFAULT_RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+class Attempt:
+    """
+    Timing and outcome of a single HTTP attempt.
+
+    Attributes:
+        number: 1-based attempt number
+        duration: Wall-clock seconds spent on the attempt
+        status_code: HTTP status code, or None if no response was received
+        error: Error message if the attempt failed, else None
+        delay: Seconds slept before the next attempt, or None if no retry followed
+    """
+
+    __slots__ = ("number", "duration", "status_code", "error", "delay")
+
+    def __init__(
+        self,
+        number: int,
+        duration: float,
+        status_code: t.Optional[int] = None,
+        error: t.Optional[str] = None,
+        delay: t.Optional[float] = None,
+    ):
+        self.number = number
+        self.duration = duration
+        self.status_code = status_code
+        self.error = error
+        self.delay = delay
+
+    def __repr__(self) -> str:
+        return (
+            f"Attempt(number={self.number}, duration={self.duration:.3f}, "
+            f"status_code={self.status_code}, delay={self.delay})"
+        )
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient failures.
+
+    Only idempotent requests (such as ``get_schema``) or requests carrying an
+    ``Idempotency-Key`` header are retried, on timeouts, connection errors and
+    the configured status codes.
+
+    Args:
+        max_attempts: Total number of attempts, including the first (1 disables retries)
+        backoff_base: Base delay in seconds; attempt ``n`` waits up to ``base * 2 ** (n - 1)``
+        backoff_cap: Maximum delay in seconds between attempts
+        retry_statuses: HTTP status codes that are retried
+        respect_retry_after: Wait for the server's ``Retry-After`` (capped by backoff_cap) when present
+        on_attempt: Optional callable invoked with an Attempt after every attempt
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 30.0,
+        retry_statuses: t.Iterable[int] = DEFAULT_RETRY_STATUSES,
+        respect_retry_after: bool = True,
+        on_attempt: t.Optional[t.Callable[[Attempt], None]] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.on_attempt = on_attempt
+
+    def next_delay(self, attempt: int, retry_after: t.Optional[float] = None) -> t.Optional[float]:
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed
+            retry_after: Server supplied Retry-After in seconds, if any
+
+        Returns:
+            Delay in seconds, or None if no attempts are left
+        """
+        if attempt >= self.max_attempts:
+            return None
+        if self.respect_retry_after and retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1)))
+
+    def record(self, attempts: t.List[Attempt], attempt: Attempt) -> None:
+        """Append an attempt to ``attempts`` and report it to on_attempt."""
+        attempts.append(attempt)
+        if self.on_attempt is not None:
+            self.on_attempt(attempt)
+
+
+def is_idempotent(method: str, headers: t.Optional[t.Mapping[str, str]]) -> bool:
+    """
+    Check whether a request may safely be retried.
+
+    Args:
+        method: HTTP method
+        headers: Request headers
+
+    Returns:
+        True for GET requests and requests carrying an Idempotency-Key header
+    """
+    if method.upper() == "GET":
+        return True
+    if not headers:
+        return False
+    return any(name.lower() == IDEMPOTENCY_HEADER.lower() for name in headers)
+
+
+def parse_retry_after(value: t.Optional[str]) -> t.Optional[float]:
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Args:
+        value: Header value
+
+    Returns:
+        Delay in seconds, or None if missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
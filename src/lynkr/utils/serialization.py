@@ -0,0 +1,122 @@
+"""
+JSON serialization with an optional fast backend.
+
+Uses ``orjson`` or ``ujson`` when installed (``pip install 'lynkr[fast]'``)
+and falls back to the standard library. All backends produce compact UTF-8
+bytes so request bodies can be sent without another encode step. Set the
+``LYNKR_JSON_BACKEND`` environment variable or call set_backend() to force
+a particular backend.
+"""
+
+import json
+import os
+import typing as t
+
+from ..exceptions import ConfigurationError
+
+BACKENDS = ("orjson", "ujson", "json")
+
+
+class JsonBackend:
+    """
+    A JSON implementation exposing bytes-oriented dumps and loads.
+
+    Args:
+        name: Backend name
+        dumps: Callable serializing an object to UTF-8 bytes
+        loads: Callable parsing str, bytes or bytearray
+    """
+
+    __slots__ = ("name", "dumps", "loads")
+
+    def __init__(self, name: str, dumps: t.Callable[[t.Any], bytes], loads: t.Callable[[t.Any], t.Any]):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"JsonBackend({self.name!r})"
+
+
+def _stdlib_dumps(obj: t.Any) -> bytes:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def _load_backend(name: str) -> JsonBackend:
+    """Build the named backend, raising ImportError if it is not installed."""
+    if name == "orjson":
+        import orjson
+
+        option = orjson.OPT_NON_STR_KEYS
+
+        def dumps(obj: t.Any) -> bytes:
+            try:
+                return orjson.dumps(obj, option=option)
+            except TypeError:
+                # Types orjson rejects (e.g. ints beyond 64 bits) still work with the stdlib
+                return _stdlib_dumps(obj)
+
+        return JsonBackend("orjson", dumps, orjson.loads)
+
+    if name == "ujson":
+        import ujson
+
+        def dumps(obj: t.Any) -> bytes:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode()
+
+        def loads(data: t.Any) -> t.Any:
+            return ujson.loads(bytes(data) if isinstance(data, (bytearray, memoryview)) else data)
+
+        return JsonBackend("ujson", dumps, loads)
+
+    if name == "json":
+        return JsonBackend("json", _stdlib_dumps, json.loads)
+
+    raise ConfigurationError(f"Unknown JSON backend '{name}', expected one of: {', '.join(BACKENDS)}")
+
+
+def _auto_backend() -> JsonBackend:
+    for name in BACKENDS:
+        try:
+            return _load_backend(name)
+        except ImportError:
+            continue
+    raise AssertionError("the stdlib json backend is always available")
+
+
+def set_backend(name: t.Optional[str] = None) -> JsonBackend:
+    """
+    Select the JSON backend used by the SDK.
+
+    Args:
+        name: "orjson", "ujson" or "json"; None picks the fastest installed
+
+    Returns:
+        The active backend
+
+    Raises:
+        ConfigurationError: If the backend is unknown or not installed
+    """
+    global _backend, dumps, loads
+    if name is None:
+        backend = _auto_backend()
+    else:
+        try:
+            backend = _load_backend(name)
+        except ImportError:
+            raise ConfigurationError(f"JSON backend '{name}' is not installed") from None
+    _backend = backend
+    dumps = backend.dumps
+    loads = backend.loads
+    return backend
+
+
+def get_backend() -> JsonBackend:
+    """Return the active JSON backend."""
+    return _backend
+
+
+_backend = None
+dumps = None  # type: t.Callable[[t.Any], bytes]
+loads = None  # type: t.Callable[[t.Any], t.Any]
+set_backend(os.environ.get("LYNKR_JSON_BACKEND") or None)
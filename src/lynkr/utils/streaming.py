@@ -0,0 +1,292 @@
+"""
+Incremental decoding of encrypted execute responses.
+
+The execute endpoint answers with a JSON envelope whose ``data.payload`` is
+base64 AES-GCM ciphertext. The helpers here scan that envelope as it
+arrives, base64-decode and decrypt the payload chunk by chunk and verify
+the tag at the end, so a response is never held in memory in full.
+"""
+
+import base64
+import json
+import re
+import typing as t
+
+from ..compression import make_decompressor
+from ..crypto import StreamingDecryptor
+from ..exceptions import ApiError
+from . import serialization
+
+PAYLOAD_PATH = ("data", "payload")
+IV_PATH = ("data", "iv")
+TAG_PATH = ("data", "tag")
+ENCODING_PATH = ("data", "encoding")
+
+# Structural characters outside strings, and characters that end a string run
+_STRUCTURAL = re.compile(rb'[{}\[\]:,"]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class EnvelopeScanner:
+    """
+    Incremental JSON scanner that diverts one string value to the caller.
+
+    The string at ``stream_path`` is returned piece by piece from feed()
+    instead of being stored; it appears as ``""`` in ``collected``, which
+    holds the rest of the document verbatim. Strings at ``capture_paths``
+    are decoded into ``captured`` as soon as they complete.
+
+    Args:
+        stream_path: Object key path of the string to stream
+        capture_paths: Object key paths of small strings to capture
+    """
+
+    def __init__(
+        self,
+        stream_path: t.Tuple[str, ...] = PAYLOAD_PATH,
+        capture_paths: t.Tuple[t.Tuple[str, ...], ...] = (IV_PATH, TAG_PATH, ENCODING_PATH),
+    ):
+        self.stream_path = stream_path
+        self.capture_paths = capture_paths
+        self.collected = bytearray()
+        self.captured = {}
+        self.streamed = False
+        # Open containers as [is_object, current_key, expecting_key]
+        self._stack = []
+        self._string_kind = None
+        self._string_path = None
+        self._buffer = bytearray()
+        self._escape = False
+
+    def feed(self, chunk: bytes) -> t.List[bytes]:
+        """
+        Scan the next chunk of the document.
+
+        Args:
+            chunk: Raw bytes of the JSON document
+
+        Returns:
+            Pieces of the streamed string found in this chunk
+        """
+        out = []
+        pos = 0
+        size = len(chunk)
+        collected = self.collected
+        while pos < size:
+            if self._string_kind is not None:
+                if self._escape:
+                    self._escape = False
+                    self._string_data(chunk[pos:pos + 1], out)
+                    pos += 1
+                    continue
+                match = _STRING_SPECIAL.search(chunk, pos)
+                end = match.start() if match else size
+                if end > pos:
+                    self._string_data(chunk[pos:end], out)
+                if match is None:
+                    break
+                pos = end + 1
+                if chunk[end] == 0x5C:  # backslash
+                    self._escape = True
+                    if self._string_kind != "stream":
+                        self._string_data(b"\\", out)
+                else:
+                    self._end_string()
+                continue
+
+            match = _STRUCTURAL.search(chunk, pos)
+            end = match.start() if match else size
+            if end > pos:
+                collected += chunk[pos:end]
+            if match is None:
+                break
+            pos = end + 1
+            char = chunk[end]
+            if char == 0x22:  # quote
+                self._start_string()
+                continue
+            collected.append(char)
+            stack = self._stack
+            if char == 0x7B:  # {
+                stack.append([True, None, True])
+            elif char == 0x5B:  # [
+                stack.append([False, None, False])
+            elif char in (0x7D, 0x5D):  # } ]
+                if stack:
+                    stack.pop()
+            elif char == 0x3A:  # :
+                if stack:
+                    stack[-1][2] = False
+            elif char == 0x2C and stack and stack[-1][0]:  # , in an object
+                stack[-1][1] = None
+                stack[-1][2] = True
+        return out
+
+    def document(self) -> t.Any:
+        """
+        Parse everything except the streamed string.
+
+        Returns:
+            The decoded JSON document
+        """
+        return serialization.loads(self.collected)
+
+    def _start_string(self) -> None:
+        self.collected += b'"'
+        top = self._stack[-1] if self._stack else None
+        if top is not None and top[0] and top[2]:
+            self._string_kind = "key"
+        else:
+            path = tuple(frame[1] for frame in self._stack)
+            if path == self.stream_path:
+                self._string_kind = "stream"
+                self.streamed = True
+            elif path in self.capture_paths:
+                self._string_kind = "capture"
+                self._string_path = path
+            else:
+                self._string_kind = "copy"
+        self._buffer = bytearray()
+
+    def _string_data(self, data: bytes, out: t.List[bytes]) -> None:
+        kind = self._string_kind
+        if kind == "stream":
+            out.append(data)
+        elif kind == "copy":
+            self.collected += data
+        else:
+            self._buffer += data
+
+    def _end_string(self) -> None:
+        kind = self._string_kind
+        if kind in ("key", "capture"):
+            self.collected += self._buffer
+            value = json.loads(b'"' + bytes(self._buffer) + b'"')
+            if kind == "key":
+                self._stack[-1][1] = value
+            else:
+                self.captured[self._string_path] = value
+        self.collected += b'"'
+        self._string_kind = None
+
+
+class Base64StreamDecoder:
+    """Decode base64 text that arrives in arbitrarily split pieces."""
+
+    def __init__(self):
+        self._pending = b""
+
+    def decode(self, data: bytes) -> bytes:
+        """Decode as much of ``data`` (plus leftovers) as forms whole 4-character groups."""
+        if self._pending:
+            data = self._pending + data
+        cut = len(data) - len(data) % 4
+        self._pending = data[cut:]
+        return base64.b64decode(data[:cut]) if cut else b""
+
+    def finalize(self) -> bytes:
+        """
+        Decode any remaining input.
+
+        Raises:
+            ValueError: If the input was not valid base64
+        """
+        pending, self._pending = self._pending, b""
+        return base64.b64decode(pending) if pending else b""
+
+
+class ResponseStreamDecoder:
+    """
+    Sans-IO decoder for a streamed execute response.
+
+    Feed raw body chunks in order; decrypted plaintext comes back as soon as
+    it is available. close() verifies the GCM tag. If the server answered
+    without encryption, ``encrypted`` is False and ``envelope`` holds the
+    parsed response. Compressed payloads are decompressed on the fly, which
+    requires the ``encoding`` field to precede ``payload``.
+
+    Args:
+        aes_key: AES key the request was encrypted with
+    """
+
+    def __init__(self, aes_key: bytes):
+        self.aes_key = aes_key
+        self.encrypted = False
+        self.envelope = None
+        self._scanner = EnvelopeScanner()
+        self._base64 = Base64StreamDecoder()
+        self._decryptor = None
+        self._decompressor = None
+        self._encoding_checked = False
+        # Ciphertext received before the IV; only used if the IV follows the payload
+        self._pending = bytearray()
+
+    def feed(self, chunk: bytes) -> bytes:
+        """
+        Process the next chunk of the response body.
+
+        Args:
+            chunk: Raw response bytes
+
+        Returns:
+            Plaintext decrypted so far (may be empty)
+        """
+        pieces = self._scanner.feed(chunk)
+        if not pieces:
+            return b""
+        if not self._encoding_checked:
+            # The payload has started, so the encoding is known now or never
+            self._encoding_checked = True
+            encoding = self._scanner.captured.get(ENCODING_PATH)
+            if encoding:
+                self._decompressor = make_decompressor(encoding)
+        ciphertext = b"".join(self._base64.decode(piece) for piece in pieces)
+        return self._inflate(self._decrypt(ciphertext))
+
+    def close(self) -> bytes:
+        """
+        Finish decoding and verify the authentication tag.
+
+        Returns:
+            Remaining plaintext
+
+        Raises:
+            ApiError: If the response envelope is malformed
+            cryptography.exceptions.InvalidTag: If the payload fails authentication
+        """
+        try:
+            self.envelope = self._scanner.document()
+        except ValueError:
+            raise ApiError("Invalid JSON response")
+        if not self._scanner.streamed:
+            return b""
+
+        self.encrypted = True
+        captured = self._scanner.captured
+        if IV_PATH not in captured or TAG_PATH not in captured:
+            raise ApiError("Invalid encrypted response: missing iv or tag")
+        if captured.get(ENCODING_PATH) and self._decompressor is None:
+            raise ApiError("Cannot stream a compressed response whose 'encoding' follows its 'payload'")
+        plaintext = self._decrypt(self._base64.finalize(), final=True)
+        tag = base64.b64decode(captured[TAG_PATH])
+        plaintext = self._inflate(plaintext + self._decryptor.finalize(tag))
+        if self._decompressor is not None:
+            plaintext += self._decompressor.flush()
+        return plaintext
+
+    def _inflate(self, plaintext: bytes) -> bytes:
+        if self._decompressor is None or not plaintext:
+            return plaintext
+        return self._decompressor.decompress(plaintext)
+
+    def _decrypt(self, ciphertext: bytes, final: bool = False) -> bytes:
+        if self._decryptor is None:
+            iv = self._scanner.captured.get(IV_PATH)
+            if iv is None and not final:
+                self._pending += ciphertext
+                return b""
+            self._decryptor = StreamingDecryptor(self.aes_key, base64.b64decode(iv))
+            if self._pending:
+                ciphertext = bytes(self._pending) + ciphertext
+                self._pending = bytearray()
+        return self._decryptor.update(ciphertext) if ciphertext else b""
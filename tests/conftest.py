@@ -5,6 +5,8 @@ Test fixtures for Lynkr SDK tests.
 import json
 import pytest
 import responses
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
 from lynkr.client import LynkrClient
 
 
@@ -26,6 +28,21 @@ def client(api_key, base_url):
     return LynkrClient(api_key=api_key, base_url=base_url)
 
 
+@pytest.fixture(scope="session")
+def rsa_private_key():
+    """Return a throwaway RSA keypair for encryption round-trip tests."""
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+@pytest.fixture(scope="session")
+def public_key_pem(rsa_private_key):
+    """Return the PEM encoding of the test public key."""
+    return rsa_private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+
+
 @pytest.fixture
 def mock_responses():
     """Set up mocked API responses."""
@@ -0,0 +1,288 @@
+"""
+Tests for the AsyncLynkrClient class.
+"""
+
+import asyncio
+import base64
+import json
+import pytest
+from unittest.mock import patch, MagicMock
+
+httpx = pytest.importorskip("httpx")
+
+from lynkr.async_client import AsyncLynkrClient
+from lynkr.crypto import encrypt_with_aes
+from lynkr.exceptions import ApiError, ValidationError
+from lynkr.utils.async_http import AsyncHttpClient
+
+
+def make_client(api_key, base_url, handler):
+    """Return an async client whose transport is served by ``handler``."""
+    client = AsyncLynkrClient(api_key=api_key, base_url=base_url)
+    client.http_client = AsyncHttpClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+class TestAsyncLynkrClient:
+    """Tests for the AsyncLynkrClient class."""
+
+    def test_init_missing_api_key(self, monkeypatch):
+        monkeypatch.delenv("LYNKR_API_KEY", raising=False)
+        with pytest.raises(ValueError) as excinfo:
+            AsyncLynkrClient()
+        assert "API key is required" in str(excinfo.value)
+
+    def test_get_schema(self, api_key, base_url, schema_response):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json=schema_response)
+
+        async def run():
+            async with make_client(api_key, base_url, handler) as client:
+                return await client.get_schema("Create a new user"), client.ref_id
+
+        (ref_id, schema, service), stored_ref_id = asyncio.run(run())
+
+        assert ref_id == schema_response["ref_id"]
+        assert stored_ref_id == ref_id
+        assert schema.to_dict() == schema_response["schema"]
+        assert service == schema_response["metadata"]["service"]
+        assert str(requests_seen[0].url) == f"{base_url}/api/v0/schema/"
+        assert requests_seen[0].headers["Authorization"] == f"Bearer {api_key}"
+        assert json.loads(requests_seen[0].content)["query"] == "Create a new user"
+
+    def test_get_schema_validation_error(self, api_key, base_url):
+        client = make_client(api_key, base_url, lambda request: httpx.Response(200))
+        with pytest.raises(ValidationError):
+            asyncio.run(client.get_schema(""))
+
+    def test_get_schema_api_error(self, api_key, base_url):
+        def handler(request):
+            return httpx.Response(400, json={"error": "invalid_request", "message": "Invalid request format"})
+
+        client = make_client(api_key, base_url, handler)
+        with pytest.raises(ApiError) as excinfo:
+            asyncio.run(client.get_schema("Create a new user"))
+        assert excinfo.value.status_code == 400
+        assert "Invalid request format" in str(excinfo.value)
+
+    def test_execute_without_ref_id(self, api_key, base_url):
+        client = make_client(api_key, base_url, lambda request: httpx.Response(200))
+        result = asyncio.run(client.execute(schema_data={"name": "Alice"}))
+        assert result == {"error": "ref_id is required to execute an action"}
+
+    @patch("lynkr.client.hybrid_encrypt")
+    @patch("lynkr.client.get_public_key")
+    def test_execute_decrypts_response(self, mock_load_key, mock_encrypt, api_key, base_url):
+        aes_key = b"k" * 32
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.return_value = ({"payload": "test_payload"}, aes_key)
+
+        def handler(request):
+            ciphertext, iv, tag = encrypt_with_aes(json.dumps({"ok": True}).encode(), aes_key)
+            return httpx.Response(200, json={"data": {
+                "payload": base64.b64encode(ciphertext).decode(),
+                "iv": base64.b64encode(iv).decode(),
+                "tag": base64.b64encode(tag).decode(),
+            }})
+
+        client = make_client(api_key, base_url, handler)
+        client.add_key("svc", "api_key", "secret")
+        result = asyncio.run(client.execute_action({"name": "Alice"}, ref_id="ref_1", service="svc"))
+
+        assert result == {"Result": {"ok": True}}
+        payload = mock_encrypt.call_args[0][0]
+        assert payload["ref_id"] == "ref_1"
+        assert payload["schema"]["fields"]["api_key"]["value"] == "secret"
+
+    @patch("lynkr.client.hybrid_encrypt")
+    @patch("lynkr.client.get_public_key")
+    def test_execute_stream(self, mock_load_key, mock_encrypt, api_key, base_url):
+        aes_key = b"k" * 32
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.return_value = ({"payload": "test_payload"}, aes_key)
+        plaintext = json.dumps({"rows": list(range(20000))}).encode()
+
+        def handler(request):
+            ciphertext, iv, tag = encrypt_with_aes(plaintext, aes_key)
+            return httpx.Response(200, json={"data": {
+                "payload": base64.b64encode(ciphertext).decode(),
+                "iv": base64.b64encode(iv).decode(),
+                "tag": base64.b64encode(tag).decode(),
+            }})
+
+        async def run():
+            async with make_client(api_key, base_url, handler) as client:
+                chunks = [c async for c in client.execute_stream({"n": 1}, ref_id="ref_1", chunk_size=1024)]
+                result = await client.execute({"n": 1}, ref_id="ref_1", stream=True)
+                return chunks, result
+
+        chunks, result = asyncio.run(run())
+        assert b"".join(chunks) == plaintext
+        assert result == {"rows": list(range(20000))}
+
+    @patch("lynkr.client.hybrid_encrypt")
+    @patch("lynkr.client.get_public_key")
+    def test_concurrent_requests(self, mock_load_key, mock_encrypt, api_key, base_url):
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.return_value = ({"payload": "test_payload"}, b"")
+        in_flight = {"now": 0, "peak": 0}
+
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200, json={"data": {"ok": True}})
+
+        async def run():
+            async with make_client(api_key, base_url, handler) as client:
+                return await asyncio.gather(
+                    *(client.execute({"n": i}, ref_id="ref_1") for i in range(20))
+                )
+
+        results = asyncio.run(run())
+        assert results == [{"ok": True}] * 20
+        assert in_flight["peak"] > 1
+
+    @patch("lynkr.client.hybrid_encrypt")
+    @patch("lynkr.client.get_public_key")
+    def test_execute_many(self, mock_load_key, mock_encrypt, api_key, base_url):
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.side_effect = lambda payload, key: (payload, b"")
+        in_flight = {"now": 0, "peak": 0}
+
+        async def handler(request):
+            n = json.loads(request.content)["schema"]["fields"]["n"]["value"]
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.001 * (10 - n))
+            in_flight["now"] -= 1
+            if n == 2:
+                return httpx.Response(503, json={"message": "unavailable"})
+            return httpx.Response(200, json={"data": {"n": n}})
+
+        async def run(ordered):
+            async with make_client(api_key, base_url, handler) as client:
+                return [
+                    r async for r in client.execute_many(
+                        [{"n": i} for i in range(10)], ref_id="ref_1", max_concurrency=3, ordered=ordered
+                    )
+                ]
+
+        ordered = asyncio.run(run(True))
+        assert [r.index for r in ordered] == list(range(10))
+        assert ordered[2].error.status_code == 503
+        assert ordered[4].result == {"n": 4}
+        assert in_flight["peak"] == 3
+
+        unordered = asyncio.run(run(False))
+        assert sorted(r.index for r in unordered) == list(range(10))
+
+    def test_get_schema_retries(self, api_key, base_url, schema_response, monkeypatch):
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr("lynkr.utils.async_http.asyncio.sleep", fake_sleep)
+        statuses = [503, 429, 200]
+
+        def handler(request):
+            status = statuses.pop(0)
+            if status == 429:
+                return httpx.Response(429, headers={"Retry-After": "1"}, json={"message": "slow down"})
+            return httpx.Response(status, json=schema_response if status == 200 else {"message": "unavailable"})
+
+        client = make_client(api_key, base_url, handler)
+        ref_id, _, _ = asyncio.run(client.get_schema("Create a new user"))
+
+        assert ref_id == schema_response["ref_id"]
+        assert len(sleeps) == 2
+        assert sleeps[1] == 1
+
+    def test_ref_id_per_task(self, api_key, base_url, schema_response):
+        counter = iter(range(1, 100))
+
+        def handler(request):
+            return httpx.Response(200, json={**schema_response, "ref_id": f"ref_{next(counter)}"})
+
+        async def task(client, started):
+            ref_id, _, _ = await client.get_schema("Create a new user")
+            started.append(ref_id)
+            while len(started) < 4:
+                await asyncio.sleep(0)
+            return ref_id, client.ref_id
+
+        async def run():
+            started = []
+            async with make_client(api_key, base_url, handler) as client:
+                return await asyncio.gather(*(task(client, started) for _ in range(4)))
+
+        results = asyncio.run(run())
+
+        assert sorted(ref_id for ref_id, _ in results) == ["ref_1", "ref_2", "ref_3", "ref_4"]
+        assert all(ref_id == current for ref_id, current in results)
+
+    def test_coalesce_schema(self, api_key, base_url, schema_response):
+        requests_seen = []
+
+        async def handler(request):
+            requests_seen.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json=schema_response)
+
+        async def run():
+            client = AsyncLynkrClient(api_key=api_key, base_url=base_url, coalesce_schema=True)
+            client.http_client = AsyncHttpClient(transport=httpx.MockTransport(handler))
+            async with client:
+                return await asyncio.gather(*(client.get_schema("Create a new user") for _ in range(5))), client
+
+        results, client = asyncio.run(run())
+
+        assert len(requests_seen) == 1
+        assert [ref_id for ref_id, _, _ in results] == [schema_response["ref_id"]] * 5
+        assert client.schema_flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_disk_cache_runs_off_event_loop(self, api_key, base_url, schema_response, tmp_path):
+        import threading
+        from lynkr.cache import DiskSchemaCache
+
+        requests_seen = []
+        cache_threads = []
+
+        class RecordingCache(DiskSchemaCache):
+            def get(self, key):
+                cache_threads.append(threading.get_ident())
+                return super().get(key)
+
+            def set(self, key, value, ttl=None):
+                cache_threads.append(threading.get_ident())
+                return super().set(key, value, ttl)
+
+        def handler(request):
+            requests_seen.append(request)
+            return httpx.Response(200, json=schema_response)
+
+        cache = RecordingCache(str(tmp_path / "schemas.db"))
+
+        async def run():
+            client = AsyncLynkrClient(api_key=api_key, base_url=base_url, schema_cache=cache)
+            client.http_client = AsyncHttpClient(transport=httpx.MockTransport(handler))
+            async with client:
+                first = await client.get_schema("Create a new user")
+                second = await client.get_schema("Create a new user")
+                return first, second, client.ref_id, threading.get_ident()
+
+        try:
+            first, second, ref_id, loop_thread = asyncio.run(run())
+        finally:
+            cache.close()
+
+        assert len(requests_seen) == 1
+        assert second[0] == first[0] == ref_id
+        assert second[1].to_dict() == schema_response["schema"]
+        assert len(cache_threads) == 3  # miss, store, hit
+        assert loop_thread not in cache_threads
@@ -0,0 +1,241 @@
+"""
+Tests for the schema cache.
+"""
+
+import subprocess
+import sys
+import threading
+
+import pytest
+import responses
+
+from lynkr import cache as cache_module
+from lynkr.cache import DiskSchemaCache, SchemaCache, normalize_request
+from lynkr.client import LynkrClient
+from lynkr.schema import Schema
+
+URL = "https://api.lynkr.ca"
+
+
+class TestSchemaCache:
+    """Tests for the SchemaCache class."""
+
+    def test_normalize_request(self):
+        assert normalize_request("  Show my\tOrders \n") == "show my orders"
+
+    def test_make_key_includes_api_key(self):
+        assert SchemaCache.make_key(URL, "a", "Show orders") != SchemaCache.make_key(URL, "b", "Show orders")
+        assert SchemaCache.make_key(URL, "a", "Show  orders") == SchemaCache.make_key(URL, "a", "show orders")
+
+    def test_make_key_includes_base_url(self):
+        staging = SchemaCache.make_key("https://staging.lynkr.ca", "a", "Show orders")
+
+        assert staging != SchemaCache.make_key(URL, "a", "Show orders")
+        assert staging == SchemaCache.make_key("https://staging.lynkr.ca/", "a", "Show orders")
+
+    def test_hit_and_miss(self):
+        cache = SchemaCache()
+        assert cache.get("k") is None
+        cache.set("k", ("ref", None, "svc"))
+        assert cache.get("k") == ("ref", None, "svc")
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+    def test_lru_eviction(self):
+        cache = SchemaCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache = SchemaCache(ttl=10)
+        cache.set("default", 1)
+        cache.set("short", 2, ttl=1)
+
+        now[0] += 5
+        assert cache.get("short") is None
+        assert cache.get("default") == 1
+
+        now[0] += 10
+        assert cache.get("default") is None
+        assert len(cache) == 0
+
+    def test_invalidate_and_clear(self):
+        cache = SchemaCache()
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.invalidate("a") is True
+        assert cache.invalidate("a") is False
+        cache.clear()
+        assert cache.stats()["size"] == 0
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            SchemaCache(maxsize=0)
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    cache = DiskSchemaCache(str(tmp_path / "schemas.db"))
+    yield cache
+    cache.close()
+
+
+def entry(n):
+    return (f"ref_{n}", Schema({"fields": {"to": {"type": "string"}}, "required_fields": ["to"]}), "resend")
+
+
+class TestDiskSchemaCache:
+    """Tests for the DiskSchemaCache class."""
+
+    def test_hit_and_miss(self, disk_cache):
+        key = SchemaCache.make_key(URL, "api_key", "Send an email")
+        assert disk_cache.get(key) is None
+
+        disk_cache.set(key, entry(1))
+        ref_id, schema, service = disk_cache.get(key)
+
+        assert (ref_id, service) == ("ref_1", "resend")
+        assert schema.to_dict() == entry(1)[1].to_dict()
+        assert disk_cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+    def test_api_key_not_stored(self, disk_cache):
+        disk_cache.set(SchemaCache.make_key(URL, "secret-api-key", "Send an email"), entry(1))
+
+        with open(disk_cache.path, "rb") as f:
+            assert b"secret-api-key" not in f.read()
+
+    def test_shared_between_instances(self, disk_cache):
+        key = SchemaCache.make_key(URL, "api_key", "Send an email")
+        other = DiskSchemaCache(disk_cache.path)
+        try:
+            assert other.get(key) is None
+            disk_cache.set(key, entry(1))
+            assert other.get(key)[0] == "ref_1"
+
+            disk_cache.set(key, entry(2))
+            assert other.get(key)[0] == "ref_2"
+
+            other.invalidate(key)
+            assert disk_cache.get(key) is None
+        finally:
+            other.close()
+
+    def test_shared_between_processes(self, disk_cache):
+        code = (
+            "import sys\n"
+            "from lynkr.cache import DiskSchemaCache, SchemaCache\n"
+            "from lynkr.schema import Schema\n"
+            "cache = DiskSchemaCache(sys.argv[1])\n"
+            "cache.set(SchemaCache.make_key(sys.argv[2], 'api_key', 'Send an email'), ('ref_9', Schema({'fields': {}}), 'resend'))\n"
+        )
+        subprocess.run([sys.executable, "-c", code, disk_cache.path, URL], check=True)
+
+        assert disk_cache.get(SchemaCache.make_key(URL, "api_key", "send an  EMAIL"))[0] == "ref_9"
+
+    def test_ttl_expiry(self, disk_cache, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+        disk_cache.set(("k", "default"), entry(1))
+        disk_cache.set(("k", "short"), entry(2), ttl=1)
+
+        now[0] += 5
+        assert disk_cache.get(("k", "short")) is None
+        assert disk_cache.get(("k", "default"))[0] == "ref_1"
+
+        disk_cache.set(("k", "new"), entry(3))
+        assert disk_cache.stats()["evictions"] == 1
+        assert len(disk_cache) == 2
+
+    def test_evicts_oldest_beyond_maxsize(self, tmp_path):
+        cache = DiskSchemaCache(str(tmp_path / "schemas.db"), maxsize=3)
+        try:
+            for n in range(5):
+                cache.set(("k", str(n)), entry(n))
+
+            assert len(cache) == 3
+            assert cache.evictions == 2
+            assert cache.get(("k", "0")) is None
+            assert cache.get(("k", "4"))[0] == "ref_4"
+        finally:
+            cache.close()
+
+    def test_concurrent_writers(self, disk_cache):
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(50):
+                    disk_cache.set(("k", f"{n}-{i}"), entry(i))
+                    assert disk_cache.get(("k", f"{n}-{i}"))[0] == f"ref_{i}"
+            except Exception as error:  # pragma: no cover - only on failure
+                errors.append(error)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len(disk_cache) == 200
+
+    def test_thread_connection_closed_on_exit(self, disk_cache):
+        import gc
+        import sqlite3
+
+        connections = []
+
+        def worker():
+            disk_cache.get(("k", "missing"))
+            connections.append(disk_cache._connect())
+
+        for _ in range(5):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        assert len(connections) == 5
+        for connection in connections:
+            with pytest.raises(sqlite3.ProgrammingError):
+                connection.execute("SELECT 1")
+        assert len(disk_cache._connections) == 1  # only the creating thread's
+        assert disk_cache.get(("k", "missing")) is None
+
+    @responses.activate
+    def test_client(self, disk_cache, api_key, base_url, schema_response):
+        responses.add(responses.POST, f"{base_url}/api/v0/schema/", json=schema_response)
+
+        first = LynkrClient(api_key=api_key, base_url=base_url, schema_cache=disk_cache).get_schema("Create a user")
+        second = LynkrClient(api_key=api_key, base_url=base_url, schema_cache=disk_cache).get_schema("create a user")
+
+        assert len(responses.calls) == 1
+        assert second[0] == first[0] == schema_response["ref_id"]
+        assert second[1].to_dict() == schema_response["schema"]
+
+    @responses.activate
+    def test_client_keeps_environments_apart(self, disk_cache, api_key, schema_response):
+        staging_url = "https://staging.lynkr.ca"
+        responses.add(responses.POST, f"{URL}/api/v0/schema/", json=schema_response)
+        responses.add(responses.POST, f"{staging_url}/api/v0/schema/", json={**schema_response, "ref_id": "ref_staging"})
+
+        production = LynkrClient(api_key=api_key, base_url=URL, schema_cache=disk_cache)
+        staging = LynkrClient(api_key=api_key, base_url=staging_url, schema_cache=disk_cache)
+
+        assert production.get_schema("Create a user")[0] == schema_response["ref_id"]
+        assert staging.get_schema("Create a user")[0] == "ref_staging"
+        assert production.get_schema("Create a user")[0] == schema_response["ref_id"]
+        assert len(responses.calls) == 2
+
+        staging.invalidate_schema("Create a user")
+        assert production.get_schema("Create a user")[0] == schema_response["ref_id"]
+        assert len(responses.calls) == 2
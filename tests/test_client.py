@@ -4,13 +4,18 @@ Tests for the LynkrClient class.
 
 import pytest
 import json
+import sys
+import threading
 import responses
 import base64
 from unittest.mock import patch, MagicMock
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 
 from lynkr.client import LynkrClient
+from lynkr.crypto import unregister_public_key
 from lynkr.exceptions import ApiError, ValidationError
+from lynkr.testing import StandInServer
 
 
 class TestLynkrClient:
@@ -53,6 +58,15 @@ class TestLynkrClient:
         payload = json.loads(request.body)
         assert payload["query"] == request_string
 
+    def test_get_schema_defers_schema(self, client, mock_responses, schema_response, base_url):
+        mock_responses.add(responses.POST, urljoin(base_url, "/api/v0/schema/"), json=schema_response, status=200)
+
+        ref_id, schema, service = client.get_schema("Create a new user")
+
+        assert (ref_id, service) == (schema_response["ref_id"], schema_response["metadata"]["service"])
+        assert schema._source is not None
+        assert schema.get_required_fields() == schema_response["schema"]["required_fields"]
+
     def test_get_schema_validation_error(self, client):
         with pytest.raises(ValidationError) as excinfo:
             client.get_schema("")
@@ -74,6 +88,34 @@ class TestLynkrClient:
             client.get_schema(request_string)
         assert "Invalid request format" in str(excinfo.value)
 
+    def test_get_schema_cached(self, api_key, base_url, mock_responses, schema_response):
+        from lynkr.cache import SchemaCache
+
+        cache = SchemaCache(maxsize=8, ttl=60)
+        client = LynkrClient(api_key=api_key, base_url=base_url, schema_cache=cache)
+        mock_responses.add(responses.POST, urljoin(base_url, "/api/v0/schema/"), json=schema_response, status=200)
+
+        first = client.get_schema("Create a new user")
+        client.ref_id = None
+        second = client.get_schema("  create a NEW user ")
+
+        assert second == first
+        assert client.ref_id == schema_response["ref_id"]
+        assert len(mock_responses.calls) == 1
+        assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+        client.invalidate_schema("Create a new user")
+        client.get_schema("Create a new user")
+        assert len(mock_responses.calls) == 2
+
+    def test_langchain_tools_requires_extra(self, client, monkeypatch):
+        from lynkr.exceptions import ConfigurationError
+
+        monkeypatch.setitem(sys.modules, "langchain_core.tools.structured", None)
+        with pytest.raises(ConfigurationError) as excinfo:
+            client.langchain_tools()
+        assert "lynkr[langchain]" in str(excinfo.value)
+
     def test_to_execute_format(self, client, schema_response):
         from lynkr.schema import Schema
 
@@ -83,8 +125,137 @@ class TestLynkrClient:
         assert "schema" in result
         assert result["schema"] == schema_response["schema"]
 
+    @pytest.mark.parametrize("key_pool_size", [0, 2])
+    def test_execute_with_in_memory_public_key(self, api_key, base_url, mock_responses, rsa_private_key, public_key_pem, key_pool_size):
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+        from lynkr.crypto import encrypt_with_aes, decrypt_with_aes, unregister_public_key
+
+        client = LynkrClient(
+            api_key=api_key, base_url=base_url, public_key=public_key_pem, key_id="test-client", key_pool_size=key_pool_size
+        )
+
+        def callback(request):
+            envelope = json.loads(request.body)
+            aes_key = rsa_private_key.decrypt(
+                base64.b64decode(envelope["encrypted_key"]),
+                padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None),
+            )
+            plaintext = decrypt_with_aes(
+                base64.b64decode(envelope["payload"]), aes_key,
+                base64.b64decode(envelope["iv"]), base64.b64decode(envelope["tag"]),
+            )
+            echo = json.loads(plaintext)
+            ciphertext, iv, tag = encrypt_with_aes(json.dumps({"echo": echo}).encode(), aes_key)
+            body = {"data": {
+                "payload": base64.b64encode(ciphertext).decode(),
+                "iv": base64.b64encode(iv).decode(),
+                "tag": base64.b64encode(tag).decode(),
+            }}
+            return (200, {}, json.dumps(body))
+
+        mock_responses.add_callback(responses.POST, urljoin(base_url, "/api/v0/execute/"), callback=callback)
+
+        try:
+            result = client.execute({"name": "Alice"}, ref_id="ref_123")
+        finally:
+            client.close()
+            unregister_public_key("test-client")
+
+        assert result == {"echo": {"ref_id": "ref_123", "schema": {"fields": {"name": {"value": "Alice"}}}}}
+
+    def test_public_key_is_per_client(self, api_key, rsa_private_key):
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from lynkr.crypto import DEFAULT_KEY_ID, get_public_key
+
+        bundled = get_public_key(DEFAULT_KEY_ID)
+        other_key = rsa.generate_private_key(public_exponent=65537, key_size=2048).public_key()
+        first = LynkrClient(api_key=api_key, public_key=rsa_private_key.public_key())
+        second = LynkrClient(api_key=api_key, public_key=other_key)
+        default = LynkrClient(api_key=api_key)
+        try:
+            assert first.key_id != second.key_id
+            assert get_public_key(first.key_id).public_numbers() == rsa_private_key.public_key().public_numbers()
+            assert get_public_key(second.key_id) is other_key
+            assert default.key_id == DEFAULT_KEY_ID
+            assert get_public_key(default.key_id) is bundled
+        finally:
+            unregister_public_key(first.key_id)
+            unregister_public_key(second.key_id)
+
+    @patch('lynkr.client.hybrid_encrypt')
+    @patch('lynkr.client.get_public_key')
+    def test_execute_many(self, mock_load_key, mock_encrypt, client, mock_responses, base_url):
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.side_effect = lambda payload, key: (payload, b"")
+
+        def callback(request):
+            fields = json.loads(request.body)["schema"]["fields"]
+            n = fields["n"]["value"]
+            if n == 3:
+                return (500, {}, json.dumps({"message": "boom"}))
+            return (200, {}, json.dumps({"data": {"n": n, "token": fields["token"]["value"]}}))
+
+        mock_responses.add_callback(responses.POST, urljoin(base_url, "/api/v0/execute/"), callback=callback)
+        client.add_key("svc", "token", "secret")
+
+        results = list(client.execute_many(
+            ({"n": i} for i in range(10)), ref_id="ref_1", service="svc", max_concurrency=4, ordered=True
+        ))
+
+        assert [r.index for r in results] == list(range(10))
+        assert [r.ok for r in results] == [i != 3 for i in range(10)]
+        assert isinstance(results[3].error, ApiError)
+        assert results[3].error.status_code == 500
+        assert results[5].result == {"n": 5, "token": "secret"}
+        assert results[5].item == {"n": 5}
+
+    @patch('lynkr.client.hybrid_encrypt')
+    @patch('lynkr.client.get_public_key')
+    def test_execute_many_unordered(self, mock_load_key, mock_encrypt, client, mock_responses, base_url):
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.side_effect = lambda payload, key: (payload, b"")
+        mock_responses.add(responses.POST, urljoin(base_url, "/api/v0/execute/"), json={"data": {}}, status=200)
+
+        results = list(client.execute_many([{"n": i} for i in range(6)], ref_id="ref_1", max_concurrency=2))
+
+        assert sorted(r.index for r in results) == list(range(6))
+        assert all(r.ok for r in results)
+
+    @patch('lynkr.client.hybrid_encrypt')
+    @patch('lynkr.client.get_public_key')
+    def test_execute_stream(self, mock_load_key, mock_encrypt, client, mock_responses, base_url):
+        from lynkr.crypto import encrypt_with_aes
+
+        aes_key = b"k" * 32
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.return_value = ({"payload": "test_payload"}, aes_key)
+        plaintext = json.dumps({"rows": list(range(50000))}).encode()
+        ciphertext, iv, tag = encrypt_with_aes(plaintext, aes_key)
+        body = {"data": {
+            "iv": base64.b64encode(iv).decode(),
+            "tag": base64.b64encode(tag).decode(),
+            "payload": base64.b64encode(ciphertext).decode(),
+        }}
+        mock_responses.add(responses.POST, urljoin(base_url, "/api/v0/execute/"), body=json.dumps(body))
+
+        chunks = list(client.execute_stream({"name": "Alice"}, ref_id="ref_1", chunk_size=4096))
+        result = client.execute({"name": "Alice"}, ref_id="ref_1", stream=True)
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == plaintext
+        assert result == {"rows": list(range(50000))}
+
+    def test_execute_stream_without_ref_id(self, client):
+        with pytest.raises(ValidationError):
+            list(client.execute_stream({"name": "Alice"}))
+
+    def test_execute_many_invalid_concurrency(self, client):
+        with pytest.raises(ValidationError):
+            list(client.execute_many([{"n": 1}], ref_id="ref_1", max_concurrency=0))
+
     # @patch('lynkr.client.hybrid_encrypt')
-    # @patch('lynkr.client.load_public_key')
+    # @patch('lynkr.client.get_public_key')
     # def test_execute_action(self, mock_load_key, mock_encrypt, client, mock_responses, execute_response, base_url):
     #     # Arrange
     #     client.ref_id = "ref_123456789"
@@ -120,7 +291,7 @@ class TestLynkrClient:
     #     assert payload["payload"] == "test_payload"
 
     # @patch('lynkr.client.hybrid_encrypt')
-    # @patch('lynkr.client.load_public_key')
+    # @patch('lynkr.client.get_public_key')
     # def test_execute_action_with_explicit_ref_id(self, mock_load_key, mock_encrypt, client, mock_responses, execute_response, base_url):
     #     # Arrange
     #     mock_load_key.return_value = MagicMock()
@@ -178,7 +349,7 @@ class TestLynkrClient:
     #     client.add_key("svc", "api_key", "secret_svc_key")
     #     client.add_key("svc", "org_id", "org_987")
     #     # stub encrypt & public key
-    #     with patch('lynkr.client.load_public_key') as load_key, \
+    #     with patch('lynkr.client.get_public_key') as load_key, \
     #          patch('lynkr.client.hybrid_encrypt') as do_encrypt:
     #         load_key.return_value = MagicMock()
     #         # capture the payload
@@ -196,3 +367,108 @@ class TestLynkrClient:
     #         assert fields["name"]["value"] == "Alice"
     #         assert fields["api_key"]["value"] == "secret_svc_key"
     #         assert fields["org_id"]["value"] == "org_987"
+
+
+class TestSharedClient:
+    """Tests for one LynkrClient shared between threads."""
+
+    @pytest.fixture
+    def server(self, rsa_private_key):
+        with StandInServer(latency=0.01, private_key=rsa_private_key, key_id="test-shared") as server:
+            yield server
+        unregister_public_key("test-shared")
+
+    def test_ref_id_per_thread(self, server):
+        barrier = threading.Barrier(8)
+        seen = {}
+
+        def worker(n):
+            ref_id, _, _ = client.get_schema(f"request {n}")
+            barrier.wait()  # every thread has called get_schema before any executes
+            result = client.execute({"n": n})
+            seen[n] = (ref_id, result["echo"]["ref_id"])
+
+        with server.client(pool_maxsize=8) as client:
+            threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert len(seen) == 8
+        assert all(ref_id == executed for ref_id, executed in seen.values())
+        assert len({ref_id for ref_id, _ in seen.values()}) == 8
+
+    def test_share_ref_id(self, server):
+        with server.client() as shared, server.client(share_ref_id=False) as isolated:
+            shared.get_schema("send an email")
+            isolated.get_schema("send an email")
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                assert executor.submit(lambda: shared.ref_id).result() == "ref_1"
+                assert executor.submit(lambda: isolated.ref_id).result() is None
+                assert executor.submit(isolated.execute, {"n": 1}).result() == {
+                    "error": "ref_id is required to execute an action"
+                }
+            assert isolated.ref_id == "ref_2"
+
+    def test_ref_id_does_not_outlive_client(self, api_key):
+        import contextvars
+        import gc
+        import weakref
+
+        variables = len(contextvars.copy_context())
+        clients = []
+        for n in range(20):
+            client = LynkrClient(api_key=api_key)
+            client.ref_id = f"ref_{n}"
+            assert client.ref_id == f"ref_{n}"
+            clients.append(weakref.ref(client))
+        del client
+        gc.collect()
+
+        assert all(ref() is None for ref in clients)
+        assert len(contextvars.copy_context()) <= variables + 1
+
+    def test_add_key_while_reading(self, client):
+        snapshot = client.keys
+        done = threading.Event()
+        errors = []
+
+        def reader():
+            while not done.is_set():
+                try:
+                    for service in list(client.keys):
+                        client._merge_service_keys({}, service)
+                except Exception as error:  # pragma: no cover - only on a race
+                    errors.append(error)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for i in range(2000):
+            client.add_key(f"svc_{i % 10}", f"field_{i}", "secret")
+        done.set()
+        thread.join()
+
+        assert errors == []
+        assert snapshot == {}
+        assert len(client.keys) == 10
+        assert len(client.keys["svc_0"]) == 200
+
+    def test_coalesce_schema(self, server):
+        barrier = threading.Barrier(8)
+
+        def get_schema(request_string):
+            barrier.wait()
+            return client.get_schema(request_string)
+
+        with server.client(coalesce_schema=True, pool_maxsize=8) as client:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [executor.submit(get_schema, "Send an  email" if n % 2 else "send an email")
+                           for n in range(8)]
+                results = [future.result() for future in futures]
+                ref_ids = executor.submit(lambda: client.ref_id).result()
+
+        assert server.stats()["schema"] == 1
+        assert {ref_id for ref_id, _, _ in results} == {"ref_1"}
+        assert ref_ids == "ref_1"
+        assert client.schema_flight.stats() == {"calls": 1, "coalesced": 7, "in_flight": 0}
@@ -0,0 +1,114 @@
+"""
+Tests for coalescing of in-flight calls.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lynkr.coalesce import AsyncSingleFlight, SingleFlight
+from lynkr.exceptions import ApiError
+
+
+class TestSingleFlight:
+    """Tests for SingleFlight."""
+
+    def run_concurrently(self, flight, func, callers=6):
+        """Call flight.do from ``callers`` threads while the first call blocks."""
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return func()
+
+        with ThreadPoolExecutor(max_workers=callers) as executor:
+            futures = [executor.submit(flight.do, "key", slow) for _ in range(callers)]
+            while flight.stats()["coalesced"] < callers - 1:
+                threading.Event().wait(0.001)
+            release.set()
+        return calls, futures
+
+    def test_shares_result(self):
+        flight = SingleFlight()
+        result = object()
+
+        calls, futures = self.run_concurrently(flight, lambda: result)
+
+        assert len(calls) == 1
+        assert all(future.result() is result for future in futures)
+        assert flight.stats() == {"calls": 1, "coalesced": 5, "in_flight": 0}
+
+    def test_shares_error(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ApiError("Unavailable", status_code=503)
+
+        calls, futures = self.run_concurrently(flight, fail)
+
+        assert len(calls) == 1
+        for future in futures:
+            with pytest.raises(ApiError):
+                future.result()
+
+    def test_forgets_finished_calls(self):
+        flight = SingleFlight()
+
+        assert flight.do("key", lambda: 1) == 1
+        assert flight.do("key", lambda: 2) == 2
+        assert flight.do("other", lambda: 3) == 3
+        assert flight.stats() == {"calls": 3, "coalesced": 0, "in_flight": 0}
+
+
+class TestAsyncSingleFlight:
+    """Tests for AsyncSingleFlight."""
+
+    def test_shares_result(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+
+        assert asyncio.run(run()) == ["result"] * 5
+        assert len(calls) == 1
+        assert flight.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_cancelled_caller_does_not_cancel_others(self):
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        async def run():
+            first = asyncio.ensure_future(flight.do("key", fetch))
+            second = asyncio.ensure_future(flight.do("key", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        assert asyncio.run(run()) == ("result", True)
+
+    def test_shares_error(self):
+        flight = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0)
+            raise ApiError("Unavailable", status_code=503)
+
+        async def run():
+            return await asyncio.gather(*(flight.do("key", fetch) for _ in range(3)), return_exceptions=True)
+
+        errors = asyncio.run(run())
+        assert all(isinstance(error, ApiError) for error in errors)
+        assert flight.stats()["in_flight"] == 0
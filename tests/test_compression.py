@@ -0,0 +1,188 @@
+"""
+Tests for payload compression.
+"""
+
+import base64
+import gzip
+import importlib.util
+import json
+import os
+import threading
+from urllib.parse import urljoin
+
+import pytest
+import responses
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+from lynkr.client import LynkrClient
+from lynkr.compression import ACCEPT_ENCODING_HEADER, Compression, decompress, make_decompressor
+from lynkr.crypto import decrypt_with_aes, encrypt_with_aes, register_public_key, unregister_public_key
+from lynkr.envelope import FLAG_GZIP, decrypt_envelope, hybrid_encrypt_binary, parse_envelope
+from lynkr.exceptions import ApiError, ConfigurationError
+from lynkr.utils.streaming import ResponseStreamDecoder
+
+KEY_ID = "test-compression"
+OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+LARGE = {"body": "The quick brown fox jumps over the lazy dog. " * 200}
+
+
+def algorithms():
+    if importlib.util.find_spec("zstandard") is None:
+        return ["gzip"]
+    return ["gzip", "zstd"]
+
+
+def encrypted_response(plaintext, aes_key, encoding=None, encoding_first=True):
+    ciphertext, iv, tag = encrypt_with_aes(plaintext, aes_key)
+    data = {
+        "iv": base64.b64encode(iv).decode(),
+        "tag": base64.b64encode(tag).decode(),
+        "payload": base64.b64encode(ciphertext).decode(),
+    }
+    if encoding:
+        data = {"encoding": encoding, **data} if encoding_first else {**data, "encoding": encoding}
+    return json.dumps({"data": data}).encode()
+
+
+class TestCompression:
+    """Tests for the Compression class."""
+
+    @pytest.mark.parametrize("algorithm", algorithms())
+    def test_round_trip(self, algorithm):
+        data = json.dumps(LARGE).encode()
+        compressed, encoding = Compression(algorithm).compress(data)
+
+        assert encoding == algorithm
+        assert len(compressed) < len(data) / 10
+        assert decompress(compressed, encoding) == data
+
+    @pytest.mark.parametrize("algorithm", algorithms())
+    def test_concurrent_compress(self, algorithm):
+        compression = Compression(algorithm, threshold=0)
+        payload = json.dumps({"body": "The quick brown fox " * 5000}).encode()
+        start = threading.Barrier(8)
+        failures = []
+
+        def run():
+            start.wait()
+            for _ in range(100):
+                try:
+                    data, encoding = compression.compress(payload)
+                    assert decompress(data, encoding) == payload
+                except Exception as e:
+                    failures.append(e)
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert failures == []
+
+    def test_below_threshold(self):
+        assert Compression("gzip", threshold=100).compress(b"x" * 99) == (b"x" * 99, None)
+
+    def test_incompressible(self):
+        data = os.urandom(4096)
+        assert Compression("gzip", threshold=0).compress(data) == (data, None)
+
+    def test_unknown_algorithm(self):
+        with pytest.raises(ConfigurationError):
+            Compression("brotli")
+        with pytest.raises(ConfigurationError):
+            make_decompressor("brotli")
+
+    def test_binary_envelope_flag(self, public_key_pem, rsa_private_key):
+        from lynkr.crypto import load_public_key_from_pem
+
+        frame, aes_key = hybrid_encrypt_binary(
+            {"fields": LARGE}, load_public_key_from_pem(public_key_pem), compression=Compression("gzip")
+        )
+        envelope = parse_envelope(frame)
+
+        assert envelope.flags & FLAG_GZIP
+        assert envelope.encoding == "gzip"
+        assert json.loads(decompress(decrypt_envelope(envelope, aes_key), "gzip")) == {"fields": LARGE}
+
+
+class TestStreamingDecompression:
+    """Tests for decompressing streamed responses."""
+
+    def test_streamed_gzip_response(self):
+        aes_key = os.urandom(32)
+        plaintext = json.dumps({"rows": list(range(20000))}).encode()
+        body = encrypted_response(gzip.compress(plaintext), aes_key, encoding="gzip")
+
+        decoder = ResponseStreamDecoder(aes_key)
+        out = b"".join(decoder.feed(body[i:i + 512]) for i in range(0, len(body), 512)) + decoder.close()
+
+        assert out == plaintext
+
+    def test_encoding_after_payload(self):
+        aes_key = os.urandom(32)
+        body = encrypted_response(gzip.compress(b"data" * 100), aes_key, encoding="gzip", encoding_first=False)
+
+        decoder = ResponseStreamDecoder(aes_key)
+        for i in range(0, len(body), 16):
+            decoder.feed(body[i:i + 16])
+        with pytest.raises(ApiError):
+            decoder.close()
+
+
+class TestClientCompression:
+    """Tests for compression in LynkrClient."""
+
+    @responses.activate
+    def test_execute_compresses_request_and_decompresses_response(self, rsa_private_key, public_key_pem):
+        register_public_key(KEY_ID, public_key_pem)
+        base_url = "https://api.lynkr.com"
+        seen = {}
+
+        def callback(request):
+            envelope = json.loads(request.body)
+            aes_key = rsa_private_key.decrypt(base64.b64decode(envelope["encrypted_key"]), OAEP)
+            plaintext = decrypt_with_aes(
+                base64.b64decode(envelope["payload"]), aes_key,
+                base64.b64decode(envelope["iv"]), base64.b64decode(envelope["tag"]),
+            )
+            seen.setdefault("encodings", []).append(envelope.get("encoding"))
+            seen["accept"] = request.headers[ACCEPT_ENCODING_HEADER]
+            if envelope.get("encoding"):
+                plaintext = decompress(plaintext, envelope["encoding"])
+            seen["payload"] = json.loads(plaintext)
+            body = encrypted_response(gzip.compress(json.dumps({"ok": True}).encode()), aes_key, encoding="gzip")
+            return (200, {}, body)
+
+        responses.add_callback(responses.POST, urljoin(base_url, "/api/v0/execute/"), callback=callback)
+        client = LynkrClient(api_key="test", base_url=base_url, key_id=KEY_ID, compression="gzip")
+        try:
+            default = client.execute(LARGE, ref_id="ref_1")
+            result = client.execute(LARGE, ref_id="ref_1", compress=True)
+            small = client.execute({"name": "Alice"}, ref_id="ref_1", compress=True)
+        finally:
+            unregister_public_key(KEY_ID)
+
+        assert result == {"ok": True}
+        assert small == {"ok": True}
+        assert default == {"ok": True}
+        assert seen["encodings"] == [None, "gzip", None]
+        assert "gzip" in seen["accept"]
+        assert seen["payload"]["schema"]["fields"] == {"name": {"value": "Alice"}}
+
+    def test_requires_zstandard(self, monkeypatch):
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name == "zstandard":
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        with pytest.raises(ConfigurationError) as excinfo:
+            Compression("zstd")
+        assert excinfo.value.__cause__ is None
+        assert excinfo.value.__suppress_context__
@@ -0,0 +1,104 @@
+"""
+Tests for the crypto module.
+"""
+
+import base64
+import json
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+from lynkr import crypto
+from lynkr.crypto import (
+    DEFAULT_KEY_ID,
+    decrypt_with_aes,
+    get_public_key,
+    hybrid_encrypt,
+    public_key_fingerprint,
+    register_public_key,
+    unregister_public_key,
+)
+from lynkr.exceptions import ConfigurationError
+
+
+def unwrap_key(private_key, encrypted_key):
+    """Recover the AES key wrapped by hybrid_encrypt."""
+    return private_key.decrypt(
+        encrypted_key,
+        padding.OAEP(
+            mgf=padding.MGF1(algorithm=hashes.SHA256()),
+            algorithm=hashes.SHA256(),
+            label=None,
+        ),
+    )
+
+
+class TestKeyring:
+    """Tests for the process-wide public keyring."""
+
+    def test_default_key_loaded_once(self, monkeypatch):
+        monkeypatch.setattr(crypto, "_keyring", {})
+        calls = []
+        original = crypto.load_public_key
+
+        def counting_load(path):
+            calls.append(path)
+            return original(path)
+
+        monkeypatch.setattr(crypto, "load_public_key", counting_load)
+        first = get_public_key()
+        second = get_public_key(DEFAULT_KEY_ID)
+
+        assert first is second
+        assert calls == [crypto.DEFAULT_PUBLIC_KEY_PATH]
+
+    def test_register_from_pem(self, public_key_pem):
+        key = register_public_key("test-rotated", public_key_pem)
+        try:
+            assert get_public_key("test-rotated") is key
+            assert register_public_key("test-rotated-str", public_key_pem.decode()) is not key
+        finally:
+            unregister_public_key("test-rotated")
+            unregister_public_key("test-rotated-str")
+
+    def test_unknown_key_id(self):
+        with pytest.raises(ConfigurationError):
+            get_public_key("does-not-exist")
+
+    def test_default_key_id_is_reserved(self, rsa_private_key):
+        bundled = get_public_key(DEFAULT_KEY_ID)
+
+        with pytest.raises(ConfigurationError):
+            register_public_key(DEFAULT_KEY_ID, rsa_private_key.public_key())
+
+        assert get_public_key(DEFAULT_KEY_ID) is bundled
+        assert register_public_key(DEFAULT_KEY_ID, bundled.public_numbers().public_key()) is bundled
+
+    def test_fingerprint(self, rsa_private_key, public_key_pem):
+        fingerprint = public_key_fingerprint(rsa_private_key.public_key())
+
+        assert fingerprint.startswith("sha256:")
+        assert fingerprint == public_key_fingerprint(crypto.load_public_key_from_pem(public_key_pem))
+        assert fingerprint != public_key_fingerprint(get_public_key(DEFAULT_KEY_ID))
+
+    def test_unregister(self, public_key_pem):
+        register_public_key("test-temp", public_key_pem)
+        assert unregister_public_key("test-temp") is True
+        assert unregister_public_key("test-temp") is False
+
+
+class TestHybridEncrypt:
+    """Tests for the hybrid RSA/AES envelope."""
+
+    def test_round_trip(self, rsa_private_key):
+        payload = {"ref_id": "ref_1", "schema": {"fields": {"name": {"value": "Alice"}}}}
+        envelope, aes_key = hybrid_encrypt(payload, rsa_private_key.public_key())
+
+        assert unwrap_key(rsa_private_key, base64.b64decode(envelope["encrypted_key"])) == aes_key
+        plaintext = decrypt_with_aes(
+            base64.b64decode(envelope["payload"]),
+            aes_key,
+            base64.b64decode(envelope["iv"]),
+            base64.b64decode(envelope["tag"]),
+        )
+        assert json.loads(plaintext) == payload
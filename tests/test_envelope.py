@@ -0,0 +1,92 @@
+"""
+Tests for the binary envelope transport.
+"""
+
+import asyncio
+import json
+import os
+
+import pytest
+from cryptography.exceptions import InvalidTag
+
+from lynkr.crypto import hybrid_encrypt, unregister_public_key
+from lynkr.envelope import decrypt_envelope, encrypt_envelope, hybrid_encrypt_binary, parse_envelope
+from lynkr.exceptions import ApiError
+from lynkr.testing import StandInServer
+
+KEY_ID = "test-envelope"
+
+
+@pytest.fixture
+def execute_server(rsa_private_key):
+    """Run the stand-in API with the test keypair."""
+    with StandInServer(private_key=rsa_private_key, key_id=KEY_ID) as server:
+        yield server
+    unregister_public_key(KEY_ID)
+
+
+class TestEnvelope:
+    """Tests for binary envelope framing."""
+
+    def test_round_trip(self):
+        aes_key = os.urandom(32)
+        data = os.urandom(10000)
+        frame = encrypt_envelope(data, aes_key, encrypted_key=b"k" * 256)
+
+        envelope = parse_envelope(frame)
+
+        assert bytes(envelope.encrypted_key) == b"k" * 256
+        assert len(envelope.iv) == 12
+        assert len(envelope.payload) == len(data)
+        assert decrypt_envelope(envelope, aes_key) == data
+
+    def test_smaller_than_json_envelope(self, public_key_pem):
+        from lynkr.crypto import load_public_key_from_pem
+
+        public_key = load_public_key_from_pem(public_key_pem)
+        payload = {"ref_id": "ref_1", "schema": {"fields": {"body": {"value": "x" * 30000}}}}
+
+        frame, _ = hybrid_encrypt_binary(payload, public_key)
+        envelope, _ = hybrid_encrypt(payload, public_key)
+
+        assert len(frame) < len(json.dumps(envelope)) * 0.8
+
+    def test_tampered_payload(self):
+        aes_key = os.urandom(32)
+        frame = encrypt_envelope(b"secret", aes_key)
+        frame[-1] ^= 1
+
+        with pytest.raises(InvalidTag):
+            decrypt_envelope(parse_envelope(frame), aes_key)
+
+    @pytest.mark.parametrize("frame", [b"LYN", b"NOPE" + bytes(10), b"LYNK\x02" + bytes(9)])
+    def test_malformed_frame(self, frame):
+        with pytest.raises(ApiError):
+            parse_envelope(frame)
+
+    def test_length_mismatch(self):
+        frame = encrypt_envelope(b"secret", os.urandom(32))
+        with pytest.raises(ApiError):
+            parse_envelope(frame + b"x")
+
+
+class TestBinaryTransport:
+    """End-to-end tests against the stand-in server."""
+
+    @pytest.mark.parametrize("binary_transport", [False, True])
+    def test_execute(self, execute_server, binary_transport):
+        with execute_server.client(binary_transport=binary_transport) as client:
+            result = client.execute({"name": "Zoë"}, ref_id="ref_1")
+
+        assert result["via"] == ("binary" if binary_transport else "json")
+        assert result["echo"] == {"ref_id": "ref_1", "schema": {"fields": {"name": {"value": "Zoë"}}}}
+
+    def test_async_execute(self, execute_server):
+        pytest.importorskip("httpx")
+
+        async def run():
+            async with execute_server.async_client(binary_transport=True, key_pool_size=2) as client:
+                return await client.execute({"n": 1}, ref_id="ref_1")
+
+        result = asyncio.run(run())
+        assert result == {"echo": {"ref_id": "ref_1", "schema": {"fields": {"n": {"value": 1}}}}, "via": "binary"}
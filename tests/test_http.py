@@ -0,0 +1,86 @@
+"""
+Tests for the HTTP client transport.
+"""
+
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from lynkr.utils import pool as pool_module
+from lynkr.utils.http import HttpClient
+
+
+class _EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.dumps({"echo": json.loads(self.rfile.read(length) or b"null")}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Run a keep-alive HTTP server on localhost."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestHttpClientPool:
+    """Tests for connection pooling in HttpClient."""
+
+    def test_connections_reused(self, local_server):
+        http = HttpClient(timeout=5)
+        for i in range(5):
+            assert http.post(local_server, json={"n": i}) == {"echo": {"n": i}}
+
+        stats = http.pool_stats()
+        assert stats["requests"] == 5
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 4
+
+    def test_pool_maxsize_bounds_connections(self, local_server):
+        http = HttpClient(timeout=5, pool_maxsize=4, pool_block=True)
+        barrier = threading.Barrier(8)
+
+        def worker():
+            barrier.wait()
+            for i in range(5):
+                http.post(local_server, json={"n": i})
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = http.pool_stats()
+        assert stats["requests"] == 40
+        assert stats["connections_created"] <= 4
+
+    def test_idle_connections_expire(self, local_server, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(pool_module.time, "monotonic", lambda: now[0])
+        http = HttpClient(timeout=5, pool_idle_timeout=30)
+
+        http.post(local_server, json={})
+        now[0] += 10
+        http.post(local_server, json={})
+        now[0] += 60
+        http.post(local_server, json={})
+
+        stats = http.pool_stats()
+        assert stats["connections_expired"] == 1
+        assert stats["connections_created"] == 2
@@ -0,0 +1,44 @@
+"""
+Import-time regression tests for the lynkr package.
+"""
+
+import subprocess
+import sys
+
+# Generous upper bound for `import lynkr` (microseconds); it is ~0.2s with
+# requests and cryptography, while importing LangChain costs seconds
+IMPORT_BUDGET_US = 1_000_000
+
+HEAVY_MODULES = ("langchain", "langchain_core", "httpx", "asyncio")
+
+
+def import_times():
+    """Return {module: cumulative microseconds} from `python -X importtime -c "import lynkr"`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import lynkr"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            times[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return times
+
+
+class TestImportTime:
+    """Tests guarding the cost of `import lynkr`."""
+
+    def test_heavy_optional_dependencies_not_imported(self):
+        imported = import_times()
+        heavy = [name for name in imported if name.split(".")[0] in HEAVY_MODULES]
+        assert heavy == []
+
+    def test_import_time_budget(self):
+        assert import_times()["lynkr"] < IMPORT_BUDGET_US
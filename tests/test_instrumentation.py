@@ -0,0 +1,271 @@
+"""
+Tests for per-phase request instrumentation.
+"""
+
+import asyncio
+import base64
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+import pytest
+import responses
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+from lynkr import RequestTrace
+from lynkr.client import LynkrClient
+from lynkr.crypto import decrypt_with_aes, encrypt_with_aes, register_public_key, unregister_public_key
+from lynkr.exceptions import ApiError
+from lynkr.instrumentation import CONNECT, DECRYPT, ENCRYPT, PARSE, READ, SERIALIZE, TTFB
+from lynkr.utils import serialization
+from lynkr.utils.http import HttpClient
+
+KEY_ID = "test-instrumentation"
+OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"ok": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    """Run a keep-alive HTTP server on localhost."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def encrypted_api(rsa_private_key, public_key_pem, schema_response):
+    """Mock the schema endpoint and an execute endpoint that encrypts its response."""
+    register_public_key(KEY_ID, public_key_pem)
+    base_url = "https://api.lynkr.com"
+
+    def execute(request):
+        envelope = json.loads(request.body)
+        aes_key = rsa_private_key.decrypt(base64.b64decode(envelope["encrypted_key"]), OAEP)
+        decrypt_with_aes(
+            base64.b64decode(envelope["payload"]), aes_key,
+            base64.b64decode(envelope["iv"]), base64.b64decode(envelope["tag"]),
+        )
+        ciphertext, iv, tag = encrypt_with_aes(json.dumps({"id": 1}).encode(), aes_key)
+        return (200, {}, json.dumps({"data": {
+            "payload": base64.b64encode(ciphertext).decode(),
+            "iv": base64.b64encode(iv).decode(),
+            "tag": base64.b64encode(tag).decode(),
+        }}))
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add(responses.POST, urljoin(base_url, "/api/v0/schema/"), json=schema_response)
+        rsps.add_callback(responses.POST, urljoin(base_url, "/api/v0/execute/"), callback=execute)
+        yield base_url
+    unregister_public_key(KEY_ID)
+
+
+class TestRequestTrace:
+    """Tests for the RequestTrace record."""
+
+    def test_add_accumulates(self):
+        trace = RequestTrace("execute", "POST", "https://api.lynkr.com/api/v0/execute/")
+        trace.add(TTFB, 0.25)
+        trace.add(TTFB, 0.5)
+
+        assert trace.phases == {TTFB: 0.75}
+
+    def test_finish_with_error(self):
+        trace = RequestTrace("get_schema", "POST", "https://api.lynkr.com/api/v0/schema/")
+        error = ApiError("Not found", status_code=404)
+        trace.finish(error)
+
+        data = trace.to_dict()
+        assert data["status_code"] == 404
+        assert data["error"] == str(error)
+        assert data["duration"] >= 0
+
+
+class TestHttpClientHooks:
+    """Tests for traces emitted by a bare HttpClient."""
+
+    def test_connect_only_on_new_connection(self, local_server):
+        traces = []
+        client = HttpClient(hooks=[traces.append])
+
+        client.post(local_server, json={"n": 1})
+        client.post(local_server, json={"n": 2})
+
+        first, second = traces
+        assert first.request_bytes == len(serialization.dumps({"n": 1}))
+        assert first.name == "http"
+        assert CONNECT in first.phases
+        assert CONNECT not in second.phases
+        for trace in traces:
+            assert {TTFB, READ, PARSE} <= set(trace.phases)
+            assert trace.status_code == 200
+            assert trace.attempts == 1
+            assert trace.response_bytes == len(b'{"ok": true}')
+
+    def test_stream_counts_bytes(self, local_server):
+        traces = []
+        client = HttpClient(hooks=[traces.append])
+
+        body = b"".join(client.stream("POST", local_server, json={}))
+
+        assert traces[0].response_bytes == len(body)
+        assert READ in traces[0].phases
+
+    def test_no_hooks_no_trace(self, local_server, monkeypatch):
+        monkeypatch.setattr(RequestTrace, "__init__", lambda *args: pytest.fail("trace created"))
+        assert HttpClient().post(local_server, json={}) == {"ok": True}
+
+
+class TestClientHooks:
+    """Tests for traces emitted by LynkrClient."""
+
+    def test_get_schema_and_execute(self, encrypted_api):
+        traces = []
+        client = LynkrClient(api_key="test", base_url=encrypted_api, key_id=KEY_ID, hooks=[traces.append])
+
+        client.get_schema("create a user")
+        assert client.execute({"name": "Alice"}) == {"id": 1}
+
+        schema_trace, execute_trace = traces
+        assert schema_trace.name == "get_schema"
+        assert schema_trace.ref_id == "ref_123456789"
+        assert schema_trace.service == "service_name"
+        assert execute_trace.name == "execute"
+        assert execute_trace.ref_id == "ref_123456789"
+        assert execute_trace.service == "service_name"
+        assert {SERIALIZE, ENCRYPT, TTFB, READ, DECRYPT, PARSE} <= set(execute_trace.phases)
+        assert execute_trace.request_bytes > 0
+        assert execute_trace.error is None
+
+    def test_streamed_execute(self, encrypted_api):
+        traces = []
+        client = LynkrClient(api_key="test", base_url=encrypted_api, key_id=KEY_ID, hooks=[traces.append])
+
+        assert client.execute({"name": "Alice"}, ref_id="ref_1", stream=True) == {"id": 1}
+
+        assert {SERIALIZE, ENCRYPT, READ, DECRYPT, PARSE} <= set(traces[0].phases)
+        assert traces[0].response_bytes > 0
+
+    @responses.activate
+    def test_error_is_reported(self, api_key, base_url):
+        traces = []
+        responses.add(responses.POST, urljoin(base_url, "/api/v0/schema/"), json={"message": "Nope"}, status=400)
+        client = LynkrClient(api_key=api_key, base_url=base_url)
+        client.add_hook(traces.append)
+
+        with pytest.raises(ApiError):
+            client.get_schema("create a user")
+
+        assert traces[0].status_code == 400
+        assert isinstance(traces[0].error, ApiError)
+
+    def test_raising_hook_does_not_change_outcome(self, encrypted_api, schema_response, caplog):
+        traces = []
+
+        def broken(trace):
+            raise RuntimeError("hook failed")
+
+        client = LynkrClient(api_key="test", base_url=encrypted_api, key_id=KEY_ID, hooks=[broken, traces.append])
+
+        with caplog.at_level("ERROR", logger="lynkr.instrumentation"):
+            ref_id, _, _ = client.get_schema("create a user")
+
+        assert ref_id == schema_response["ref_id"]
+        assert len(traces) == 1
+        assert "hook failed" in caplog.text
+
+    @responses.activate
+    def test_raising_hook_keeps_original_error(self, api_key, base_url):
+        responses.add(responses.POST, urljoin(base_url, "/api/v0/schema/"), json={"message": "Nope"}, status=400)
+
+        def broken(trace):
+            raise RuntimeError("hook failed")
+
+        client = LynkrClient(api_key=api_key, base_url=base_url, hooks=[broken])
+
+        with pytest.raises(ApiError):
+            client.get_schema("create a user")
+
+    def test_stream_closed_early_is_aborted(self, encrypted_api):
+        traces = []
+        client = LynkrClient(api_key="test", base_url=encrypted_api, key_id=KEY_ID, hooks=[traces.append])
+
+        chunks = client.execute_stream({"name": "Alice"}, ref_id="ref_1", chunk_size=1)
+        next(chunks)
+        chunks.close()
+
+        assert traces[0].aborted
+        assert traces[0].error is None
+        assert traces[0].to_dict()["aborted"] is True
+
+    def test_cancelled_call_is_aborted(self):
+        from lynkr.instrumentation import traced
+
+        traces = []
+
+        async def call():
+            trace = RequestTrace("execute", "POST", "https://api.lynkr.com/api/v0/execute/")
+            with traced([traces.append], trace):
+                await asyncio.sleep(10)
+
+        async def run():
+            task = asyncio.ensure_future(call())
+            await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+        assert traces[0].aborted
+
+    def test_remove_hook(self, encrypted_api):
+        traces = []
+        client = LynkrClient(api_key="test", base_url=encrypted_api, key_id=KEY_ID, hooks=[traces.append])
+        client.remove_hook(traces.append)
+
+        client.get_schema("create a user")
+
+        assert traces == []
+
+    def test_async_client(self, schema_response):
+        httpx = pytest.importorskip("httpx")
+        from lynkr.async_client import AsyncLynkrClient
+        from lynkr.utils.async_http import AsyncHttpClient
+
+        traces = []
+
+        async def run():
+            client = AsyncLynkrClient(api_key="test", hooks=[traces.append])
+            client.http_client = AsyncHttpClient(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, json=schema_response)),
+                hooks=client.hooks,
+            )
+            async with client:
+                await client.get_schema("create a user")
+
+        asyncio.run(run())
+
+        assert traces[0].name == "get_schema"
+        assert traces[0].service == "service_name"
+        assert {TTFB, READ, PARSE} <= set(traces[0].phases)
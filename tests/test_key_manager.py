@@ -0,0 +1,101 @@
+"""
+Tests for the KeyManager class.
+"""
+
+import random
+
+from lynkr.keys import KeyManager
+
+
+def reference_match(manager, schema_data, required_fields):
+    """The original linear scan over every key, mapping and missing field."""
+    updated_data = schema_data.copy()
+    missing_fields = [field for field in required_fields if field not in updated_data]
+    for key_name, key_value in manager._keys.items():
+        for field_name in manager.get_field_mappings(key_name):
+            if field_name in missing_fields:
+                updated_data[field_name] = key_value
+                missing_fields.remove(field_name)
+                break
+        if key_name in missing_fields:
+            updated_data[key_name] = key_value
+            missing_fields.remove(key_name)
+        for field in missing_fields[:]:
+            if key_name in field.lower() and ("key" in field.lower() or "token" in field.lower() or "auth" in field.lower()):
+                updated_data[field] = key_value
+                missing_fields.remove(field)
+    return updated_data
+
+
+class TestKeyManager:
+    """Tests for KeyManager."""
+
+    def test_default_mapping(self):
+        manager = KeyManager()
+        manager.add("Resend", "re_123")
+
+        result = manager.match_keys_to_schema({"to": "a@example.com"}, ["to", "x-api-key"])
+
+        assert result == {"to": "a@example.com", "x-api-key": "re_123"}
+
+    def test_fills_one_mapped_field_per_key(self):
+        manager = KeyManager()
+        manager.add("stripe", "sk_1")
+
+        result = manager.match_keys_to_schema({}, ["api_key", "stripe_api_key"])
+
+        # "stripe_api_key" is the first mapping, "api_key" is not itself a match
+        assert result == {"stripe_api_key": "sk_1"}
+
+    def test_name_and_substring_matches(self):
+        manager = KeyManager()
+        manager.add("github", "ghp_1", ["gh_pat"])
+
+        result = manager.match_keys_to_schema({}, ["github", "GitHub_Token", "github_org"])
+
+        assert result == {"github": "ghp_1", "GitHub_Token": "ghp_1"}
+
+    def test_does_not_modify_input(self):
+        manager = KeyManager()
+        manager.add("openai", "sk-1")
+        data = {"prompt": "hi"}
+
+        manager.match_keys_to_schema(data, ["openai_api_key"])
+
+        assert data == {"prompt": "hi"}
+
+    def test_add_and_remove_invalidate_matches(self):
+        manager = KeyManager()
+        manager.add("acme", "one", ["acme_secret"])
+        assert manager.match_keys_to_schema({}, ["acme_secret"]) == {"acme_secret": "one"}
+
+        manager.add("acme", "two", ["acme_password"])
+        assert manager.match_keys_to_schema({}, ["acme_secret"]) == {}
+        assert manager.match_keys_to_schema({}, ["acme_password"]) == {"acme_password": "two"}
+
+        assert manager.remove("ACME")
+        assert manager.match_keys_to_schema({}, ["acme_password"]) == {}
+        assert not manager.remove("acme")
+
+    def test_matches_reference_implementation(self):
+        rng = random.Random(7)
+        words = ["resend", "openai", "stripe", "auth", "key", "token", "api", "svc", "x", ""]
+
+        for _ in range(300):
+            manager = KeyManager()
+            names = [rng.choice(words) + rng.choice(words) for _ in range(rng.randint(0, 8))]
+            for name in names:
+                fields = [rng.choice(words) + "_" + rng.choice(words) for _ in range(rng.randint(0, 3))]
+                manager.add(name, f"value-{rng.random()}", fields)
+                if rng.random() < 0.2:
+                    manager.remove(rng.choice(names))
+
+            required = [rng.choice([rng.choice(words) + "_" + rng.choice(words), rng.choice(words).upper(), "api_key"])
+                        for _ in range(rng.randint(0, 10))]
+            filled = {field: "given" for field in required if rng.random() < 0.2}
+
+            for _ in range(2):  # the second call is served from the memo
+                result = manager.match_keys_to_schema(filled, required)
+                expected = reference_match(manager, filled, required)
+                assert result == expected
+                assert list(result) == list(expected)
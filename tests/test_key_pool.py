@@ -0,0 +1,97 @@
+"""
+Tests for the pre-wrapped AES key pool.
+"""
+
+import base64
+import time
+
+import pytest
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from lynkr.crypto import decrypt_with_aes, hybrid_encrypt, register_public_key, unregister_public_key
+from lynkr.key_pool import KeyPool
+
+KEY_ID = "test-key-pool"
+
+
+def unwrap_key(private_key, encrypted_key):
+    return private_key.decrypt(
+        encrypted_key,
+        padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None),
+    )
+
+
+def wait_for_depth(pool, depth, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(pool) < depth and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return len(pool)
+
+
+@pytest.fixture
+def pool(public_key_pem):
+    register_public_key(KEY_ID, public_key_pem)
+    pool = KeyPool(key_id=KEY_ID, size=4)
+    yield pool
+    pool.close()
+    unregister_public_key(KEY_ID)
+
+
+class TestKeyPool:
+    """Tests for the KeyPool class."""
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            KeyPool(size=0)
+
+    def test_prefills_and_serves_unique_keys(self, pool, rsa_private_key):
+        assert wait_for_depth(pool, 4) == 4
+
+        keys = [pool.acquire() for _ in range(4)]
+
+        assert len({aes_key for aes_key, _ in keys}) == 4
+        for aes_key, encrypted_key in keys:
+            assert unwrap_key(rsa_private_key, encrypted_key) == aes_key
+        stats = pool.stats()
+        assert stats["served"] == 4
+        assert stats["stalls"] == 0
+        assert stats["size"] == 4
+
+    def test_refills_and_counts_stalls(self, pool, rsa_private_key):
+        wait_for_depth(pool, 4)
+        keys = [pool.acquire() for _ in range(12)]
+
+        assert len({aes_key for aes_key, _ in keys}) == 12
+        assert unwrap_key(rsa_private_key, keys[-1][1]) == keys[-1][0]
+        assert pool.stats()["stalls"] >= 1
+        assert wait_for_depth(pool, 4) == 4
+
+    def test_discards_keys_after_rotation(self, pool):
+        wait_for_depth(pool, 4)
+        new_private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        register_public_key(KEY_ID, new_private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo))
+
+        aes_key, encrypted_key = pool.acquire()
+
+        assert unwrap_key(new_private_key, encrypted_key) == aes_key
+        assert pool.stats()["discarded"] >= 4
+
+    def test_hybrid_encrypt_with_prewrapped_key(self, pool, rsa_private_key):
+        envelope, aes_key = hybrid_encrypt({"a": 1}, None, prewrapped=pool.acquire())
+
+        assert unwrap_key(rsa_private_key, base64.b64decode(envelope["encrypted_key"])) == aes_key
+        plaintext = decrypt_with_aes(
+            base64.b64decode(envelope["payload"]), aes_key,
+            base64.b64decode(envelope["iv"]), base64.b64decode(envelope["tag"]),
+        )
+        assert plaintext == b'{"a":1}'
+
+    def test_close_stops_worker(self, public_key_pem):
+        register_public_key(KEY_ID, public_key_pem)
+        pool = KeyPool(key_id=KEY_ID, size=2)
+        pool.close()
+
+        assert not pool._worker.is_alive()
+        assert len(pool) == 0
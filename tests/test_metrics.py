@@ -0,0 +1,148 @@
+"""
+Tests for the built-in metrics.
+"""
+
+import math
+import threading
+from urllib.parse import urljoin
+
+import pytest
+import responses
+
+from lynkr import Metrics
+from lynkr.client import LynkrClient
+from lynkr.exceptions import ApiError
+from lynkr.instrumentation import RequestTrace
+from lynkr.metrics import Histogram
+from lynkr.utils.retry import RetryPolicy
+
+SCHEMA_URL = "https://api.lynkr.com/api/v0/schema/"
+EXECUTE_URL = "https://api.lynkr.com/api/v0/execute/"
+
+
+def make_trace(url, duration, service=None, error=None, phases=None, aborted=False):
+    trace = RequestTrace("execute", "POST", url, service=service)
+    trace.phases.update(phases or {})
+    trace.finish(error, aborted)
+    trace.duration = duration
+    return trace
+
+
+class TestHistogram:
+    """Tests for the fixed-bucket histogram."""
+
+    def test_quantiles(self):
+        histogram = Histogram((0.1, 0.2, 0.4))
+        for value in [0.05] * 50 + [0.15] * 45 + [0.3] * 5:
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == pytest.approx(0.1)
+        assert histogram.quantile(0.95) == pytest.approx(0.2)
+        assert 0.2 < histogram.quantile(0.99) <= 0.4
+
+    def test_overflow_reports_largest_bound(self):
+        histogram = Histogram((0.1, 0.2))
+        histogram.observe(5.0)
+
+        assert histogram.quantile(0.99) == 0.2
+        assert histogram.counts == [0, 0, 1]
+
+    def test_empty(self):
+        assert Histogram().quantile(0.5) is None
+
+
+class TestMetrics:
+    """Tests for the Metrics collector."""
+
+    def test_series_per_endpoint_and_service(self):
+        metrics = Metrics()
+        metrics(make_trace(SCHEMA_URL, 0.02))
+        metrics(make_trace(EXECUTE_URL, 0.2, service="gmail", phases={"ttfb": 0.15}))
+        metrics(make_trace(EXECUTE_URL, 0.3, service="gmail", phases={"ttfb": 0.25}))
+        metrics(make_trace(EXECUTE_URL, 0.1, service="slack"))
+
+        snapshot = {(entry["endpoint"], entry["service"]): entry for entry in metrics.snapshot()}
+
+        assert set(snapshot) == {
+            ("/api/v0/schema/", ""),
+            ("/api/v0/execute/", "gmail"),
+            ("/api/v0/execute/", "slack"),
+        }
+        gmail = snapshot[("/api/v0/execute/", "gmail")]
+        assert gmail["count"] == 2
+        assert gmail["sum"] == pytest.approx(0.5)
+        assert gmail["phases"] == {"ttfb": pytest.approx(0.4)}
+        assert gmail["buckets"][math.inf] == 2
+        assert 0.1 < gmail["p50"] <= 0.25
+
+    def test_errors_by_status_code(self):
+        metrics = Metrics()
+        metrics(make_trace(EXECUTE_URL, 0.1, error=ApiError("Bad", status_code=400)))
+        metrics(make_trace(EXECUTE_URL, 0.1, error=ApiError("Bad", status_code=400)))
+        metrics(make_trace(EXECUTE_URL, 30.0, error=ApiError("Timed out")))
+        metrics(make_trace(EXECUTE_URL, 0.1))
+        metrics(make_trace(EXECUTE_URL, 0.1, aborted=True))
+
+        entry, = metrics.snapshot()
+        assert entry["count"] == 5
+        assert entry["errors"] == {"400": 2, "none": 1, "aborted": 1}
+
+    def test_concurrent_record(self):
+        metrics = Metrics()
+
+        def worker():
+            for _ in range(1000):
+                metrics(make_trace(EXECUTE_URL, 0.01, service="svc"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert metrics.snapshot()[0]["count"] == 8000
+
+    def test_render_prometheus(self):
+        metrics = Metrics(buckets=(0.1, 1.0))
+        metrics(make_trace(EXECUTE_URL, 0.05, service='we"ird', phases={"read": 0.01}))
+        metrics(make_trace(EXECUTE_URL, 0.5, service='we"ird', error=ApiError("Bad", status_code=502)))
+
+        text = metrics.render_prometheus()
+        labels = 'endpoint="/api/v0/execute/",service="we\\"ird"'
+
+        assert "# TYPE lynkr_request_duration_seconds histogram" in text
+        assert f'lynkr_request_duration_seconds_bucket{{{labels},le="0.1"}} 1' in text
+        assert f'lynkr_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+        assert f"lynkr_request_duration_seconds_count{{{labels}}} 2" in text
+        assert f'lynkr_request_duration_quantile_seconds{{{labels},quantile="0.5"}} 0.1' in text
+        assert f'lynkr_request_errors_total{{{labels},status_code="502"}} 1' in text
+        assert f'lynkr_request_phase_seconds_total{{{labels},phase="read"}} 0.01' in text
+        assert text.endswith("\n")
+
+    def test_reset(self):
+        metrics = Metrics()
+        metrics(make_trace(EXECUTE_URL, 0.1))
+        metrics.reset()
+
+        assert metrics.snapshot() == []
+
+
+class TestClientMetrics:
+    """Tests for metrics collected by LynkrClient."""
+
+    @responses.activate
+    def test_get_schema(self, api_key, base_url, schema_response):
+        url = urljoin(base_url, "/api/v0/schema/")
+        responses.add(responses.POST, url, json=schema_response)
+        responses.add(responses.POST, url, json={"message": "Rate limited"}, status=429)
+        metrics = Metrics()
+        client = LynkrClient(api_key=api_key, base_url=base_url, metrics=metrics, retry=RetryPolicy(max_attempts=1))
+
+        client.get_schema("create a user")
+        with pytest.raises(ApiError):
+            client.get_schema("create a user")
+
+        snapshot = {entry["service"]: entry for entry in metrics.snapshot()}
+        assert snapshot["service_name"]["count"] == 1
+        assert snapshot[""]["errors"] == {"429": 1}
+        assert metrics in client.hooks
@@ -0,0 +1,121 @@
+"""
+Tests for the retry policy.
+"""
+
+import pytest
+import responses
+from email.utils import formatdate
+from unittest.mock import patch, MagicMock
+from urllib.parse import urljoin
+
+from lynkr.client import LynkrClient
+from lynkr.exceptions import ApiError
+from lynkr.utils import http as http_module
+from lynkr.utils.retry import RetryPolicy, is_idempotent, parse_retry_after
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of waiting."""
+    calls = []
+    monkeypatch.setattr(http_module.time, "sleep", calls.append)
+    return calls
+
+
+class TestRetryPolicy:
+    """Tests for the RetryPolicy class."""
+
+    def test_full_jitter_bounds(self):
+        policy = RetryPolicy(max_attempts=10, backoff_base=1, backoff_cap=5)
+        for attempt, ceiling in ((1, 1), (2, 2), (3, 4), (4, 5), (9, 5)):
+            for _ in range(50):
+                assert 0 <= policy.next_delay(attempt) <= ceiling
+
+    def test_no_delay_after_last_attempt(self):
+        assert RetryPolicy(max_attempts=3).next_delay(3) is None
+
+    def test_retry_after_is_capped(self):
+        policy = RetryPolicy(backoff_cap=10)
+        assert policy.next_delay(1, retry_after=4) == 4
+        assert policy.next_delay(1, retry_after=120) == 10
+
+    def test_invalid_max_attempts(self):
+        with pytest.raises(ValueError):
+            RetryPolicy(max_attempts=0)
+
+    def test_parse_retry_after(self):
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+        assert 0 < parse_retry_after(formatdate(usegmt=True, timeval=__import__("time").time() + 30)) <= 30
+
+    def test_is_idempotent(self):
+        assert is_idempotent("GET", None)
+        assert not is_idempotent("POST", {"Content-Type": "application/json"})
+        assert is_idempotent("POST", {"idempotency-key": "abc"})
+
+
+class TestClientRetries:
+    """Tests for retries through LynkrClient."""
+
+    def test_get_schema_retries_transient_errors(self, client, mock_responses, schema_response, base_url, sleeps):
+        url = urljoin(base_url, "/api/v0/schema/")
+        mock_responses.add(responses.POST, url, json={"message": "unavailable"}, status=503)
+        mock_responses.add(responses.POST, url, json={"message": "slow down"}, status=429, headers={"Retry-After": "2"})
+        mock_responses.add(responses.POST, url, json=schema_response, status=200)
+
+        ref_id, _, _ = client.get_schema("Create a new user")
+
+        assert ref_id == schema_response["ref_id"]
+        assert len(mock_responses.calls) == 3
+        assert len(sleeps) == 2
+        assert sleeps[1] == 2
+
+    def test_get_schema_gives_up(self, client, mock_responses, base_url, sleeps):
+        url = urljoin(base_url, "/api/v0/schema/")
+        mock_responses.add(responses.POST, url, json={"message": "unavailable"}, status=503)
+
+        with pytest.raises(ApiError) as excinfo:
+            client.get_schema("Create a new user")
+
+        assert len(mock_responses.calls) == 3
+        assert [a.status_code for a in excinfo.value.attempts] == [503, 503, 503]
+        assert excinfo.value.attempts[-1].delay is None
+
+    def test_client_errors_not_retried(self, client, mock_responses, base_url, sleeps):
+        mock_responses.add(responses.POST, urljoin(base_url, "/api/v0/schema/"), json={"message": "bad"}, status=400)
+
+        with pytest.raises(ApiError):
+            client.get_schema("Create a new user")
+        assert len(mock_responses.calls) == 1
+
+    @patch("lynkr.client.hybrid_encrypt")
+    @patch("lynkr.client.get_public_key")
+    def test_execute_retried_only_with_idempotency_key(
+        self, mock_load_key, mock_encrypt, client, mock_responses, base_url, sleeps
+    ):
+        mock_load_key.return_value = MagicMock()
+        mock_encrypt.return_value = ({"payload": "p"}, b"")
+        url = urljoin(base_url, "/api/v0/execute/")
+        mock_responses.add(responses.POST, url, json={"message": "unavailable"}, status=503)
+        mock_responses.add(responses.POST, url, json={"data": {"ok": True}}, status=200)
+
+        with pytest.raises(ApiError):
+            client.execute({"name": "Alice"}, ref_id="ref_1")
+        assert len(mock_responses.calls) == 1
+
+        assert client.execute({"name": "Alice"}, ref_id="ref_1", idempotency_key="key-1") == {"ok": True}
+        assert mock_responses.calls[-1].request.headers["Idempotency-Key"] == "key-1"
+
+    def test_on_attempt_reports_timings(self, api_key, base_url, mock_responses, schema_response, sleeps):
+        seen = []
+        client = LynkrClient(api_key=api_key, base_url=base_url, retry=RetryPolicy(on_attempt=seen.append))
+        url = urljoin(base_url, "/api/v0/schema/")
+        mock_responses.add(responses.POST, url, json={"message": "unavailable"}, status=502)
+        mock_responses.add(responses.POST, url, json=schema_response, status=200)
+
+        client.get_schema("Create a new user")
+
+        assert [(a.number, a.status_code) for a in seen] == [(1, 502), (2, 200)]
+        assert all(a.duration >= 0 for a in seen)
+        assert seen[0].delay is not None
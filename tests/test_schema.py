@@ -2,10 +2,12 @@
 Tests for the Schema class.
 """
 
+import pickle
+
 import pytest
 import json
 
-from lynkr.schema import Schema
+from lynkr.schema import FieldSpec, Schema, intern_field
 
 
 class TestSchema:
@@ -67,7 +69,7 @@ class TestSchema:
     def test_init(self, sample_schema):
         """Test initialization."""
         schema = Schema(sample_schema)
-        assert schema._schema == sample_schema
+        assert schema.to_dict() == sample_schema
 
     def test_repr(self, sample_schema):
         """Test string representation."""
@@ -181,4 +183,304 @@ class TestSchema:
         schema = Schema(sample_schema)
         assert schema.is_optional_field("age") is True
         assert schema.is_optional_field("name") is False
-        assert schema.is_optional_field("nonexistent") is False
\ No newline at end of file
+        assert schema.is_optional_field("nonexistent") is False
+
+    def test_compile_is_cached(self, sample_schema):
+        """Test that compiled validators are built once per mode."""
+        schema = Schema(sample_schema)
+        assert schema.compile() is schema.compile()
+        assert schema.compile(fail_fast=True) is not schema.compile()
+
+    def test_validate_fail_fast(self, sample_schema):
+        """Test that fail-fast mode stops at the first error."""
+        schema = Schema(sample_schema)
+        data = {"age": "thirty", "active": "yes"}
+        assert schema.validate(data, fail_fast=True) == ["Missing required field: name"]
+        assert len(schema.validate(data)) == 5
+
+    def test_validate_nested_types(self):
+        """Test nested object properties and array item types."""
+        schema = Schema({
+            "fields": {
+                "address": {
+                    "type": "object",
+                    "properties": {
+                        "city": {"type": "string"},
+                        "zip": {"type": "integer"},
+                    },
+                    "required": ["city"],
+                },
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "contacts": {
+                    "type": "array",
+                    "items": {"type": "object", "properties": {"email": {"type": "string"}}},
+                },
+            },
+            "required_fields": [],
+        })
+
+        assert schema.validate({
+            "address": {"city": "Toronto", "zip": 12345},
+            "tags": ["a", "b"],
+            "contacts": [{"email": "a@example.com"}],
+        }) == []
+        assert schema.validate({
+            "address": {"zip": "M5V"},
+            "tags": ["a", 2],
+            "contacts": [{"email": "a@example.com"}, {"email": 5}, "nope"],
+        }) == [
+            "Missing required field: address.city",
+            "Field 'address.zip' must be an integer",
+            "Field 'tags[1]' must be a string",
+            "Field 'contacts[1].email' must be a string",
+            "Field 'contacts[2]' must be an object",
+        ]
+
+    def test_validate_nested_draft3_required(self):
+        """Test that a boolean "required" on a nested object is not read as a field list."""
+        schema = Schema({
+            "fields": {
+                "address": {
+                    "type": "object",
+                    "required": True,
+                    "properties": {"city": {"type": "string"}},
+                },
+            },
+            "required_fields": ["address"],
+        })
+
+        assert schema.validate({"address": {"city": "Toronto"}}) == []
+        assert schema.validate({"address": {"city": 5}}) == ["Field 'address.city' must be a string"]
+
+    def test_validate_many_rows(self, sample_schema):
+        """Test bulk validation of row-oriented records."""
+        schema = Schema(sample_schema)
+        valid = {"name": "A", "email": "a@example.com", "password": "x"}
+        records = [
+            valid,
+            {"name": "B", "email": "b@example.com"},
+            {**valid, "age": "thirty", "tags": ["x"]},
+            valid,
+        ]
+
+        result = schema.validate_many(records)
+
+        assert not result.ok
+        assert result.n_rows == 4
+        assert result.missing == {"password": [1]}
+        assert result.type_errors == {"age": [2]}
+        assert result.invalid_rows == [1, 2]
+        assert result.errors_for(2) == schema.validate(records[2])
+        assert schema.validate_many([valid, valid]).ok
+
+    def test_validate_many_columns(self, sample_schema):
+        """Test bulk validation of column-oriented records."""
+        schema = Schema(sample_schema)
+        columns = {
+            "name": ["A", "B", None],
+            "email": ["a@example.com", 5, "c@example.com"],
+            "active": [True, False, "yes"],
+        }
+
+        result = schema.validate_many(columns)
+
+        assert result.missing == {"name": [2], "password": [0, 1, 2]}
+        assert result.type_errors == {"email": [1], "active": [2]}
+        assert result.errors_for(1) == [
+            "Missing required field: password",
+            "Field 'email' must be a string",
+        ]
+
+    def test_validate_many_column_length_mismatch(self, sample_schema):
+        """Test that ragged columns are rejected."""
+        from lynkr.exceptions import ValidationError
+
+        with pytest.raises(ValidationError):
+            Schema(sample_schema).validate_many({"name": ["A"], "email": []})
+
+    def test_validate_many_numpy_columns(self, sample_schema):
+        """Test dtype-based checks on NumPy and pandas columns."""
+        np = pytest.importorskip("numpy")
+        pd = pytest.importorskip("pandas")
+        schema = Schema(sample_schema)
+        columns = {
+            "name": np.array(["A", "B", "C"]),
+            "email": pd.Series(["a@example.com", None, "c@example.com"]),
+            "password": np.array(["x", "y", "z"]),
+            "age": np.array([30.0, np.nan, 41.5]),
+            "active": np.array([True, False, True]),
+            "tags": np.array([1, 2, 3]),
+        }
+
+        result = schema.validate_many(columns)
+
+        assert result.missing == {"email": [1]}
+        assert result.type_errors == {"age": [0, 2], "tags": [0, 1, 2]}
+        assert result.errors_for(0) == ["Field 'age' must be an integer", "Field 'tags' must be an array"]
+
+
+class TestSchemaTemplate:
+    """Tests for Schema.template."""
+
+    SCHEMA = {
+        "fields": {
+            "to": {"type": "string"},
+            "count": {"type": "integer"},
+            "urgent": {"type": "boolean"},
+            "tags": {"type": "list"},
+            "api_key": {"type": "string"},
+            "meta": {"type": "object"},
+            "note": {"type": "string"},
+        },
+        "required_fields": ["to", "count", "urgent", "tags", "api_key", "meta"],
+        "sensitive_fields": ["api_key"],
+    }
+
+    def test_placeholders(self):
+        schema = Schema(self.SCHEMA)
+
+        assert schema.template() == {"to": "", "count": 0, "urgent": False, "tags": [], "meta": {}}
+        assert schema.template(include_sensitive=True)["api_key"] == ""
+
+    def test_returns_copies(self):
+        schema = Schema(self.SCHEMA)
+        first = schema.template()
+        first["to"] = "a@example.com"
+        first["tags"].append("x")
+        first["meta"]["k"] = "v"
+
+        assert schema.template()["to"] == ""
+        assert schema.template()["tags"] == []
+        assert schema.template()["meta"] == {}
+
+    def test_template_passes_validate(self):
+        schema = Schema({
+            "fields": {
+                "to": {"type": "string"},
+                "amount": {"type": "number"},
+                "count": {"type": "integer"},
+                "urgent": {"type": "boolean"},
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "meta": {"type": "object", "properties": {"source": {"type": "string"}}},
+            },
+            "required_fields": ["to", "amount", "count", "urgent", "tags", "meta"],
+        })
+
+        template = schema.template()
+
+        assert template == {"to": "", "amount": 0, "count": 0, "urgent": False, "tags": [], "meta": {}}
+        assert schema.validate(template) == []
+
+    def test_json_is_cached(self):
+        schema = Schema(self.SCHEMA)
+
+        assert json.loads(schema.template_json()) == schema.template()
+        assert schema.template_json() is schema.template_json()
+        assert "api_key" in schema.template_json(include_sensitive=True)
+
+    def test_required_fallback(self):
+        schema = Schema({"fields": {"id": {"type": "integer"}}, "required": ["id"]})
+
+        assert schema.template() == {"id": 0}
+
+
+class TestCompactSchema:
+    """Tests for the interned Schema representation."""
+
+    sample_schema = TestSchema.sample_schema
+
+    def test_round_trip_preserves_order_and_types(self):
+        data = {
+            "description": "Create a user",
+            "fields": {
+                "b": {"type": "integer", "default": 1, "minimum": 1.0, "nullable": True},
+                "a": {"type": "object", "properties": {"x": {"type": "string"}}, "required": ["x"]},
+                "c": "string",
+            },
+            "sensitive_fields": ["b"],
+            "required_fields": ["b", "a"],
+            "optional_fields": [{"not": "a name"}],
+        }
+        schema = Schema(data)
+
+        assert schema.to_dict() == data
+        assert json.dumps(schema.to_dict()) == json.dumps(data)
+        result = schema.to_dict()["fields"]["b"]
+        assert type(result["default"]) is int and type(result["minimum"]) is float and result["nullable"] is True
+
+    def test_field_specs_are_shared(self):
+        first = Schema({"fields": {"to": {"type": "string"}, "n": {"type": "integer"}}})
+        second = Schema({"fields": {"subject": {"type": "string"}}})
+
+        assert first._fields["to"] is second._fields["subject"]
+        assert first._fields["to"] is intern_field({"type": "string"})
+        assert first._fields["n"] is not first._fields["to"]
+        assert isinstance(first._fields["to"], FieldSpec)
+        assert intern_field({"default": 1}) is not intern_field({"default": True})
+
+    def test_name_lists_are_shared(self, sample_schema):
+        first = Schema(sample_schema)
+        second = Schema(json.loads(json.dumps(sample_schema)))
+
+        assert first._required is second._required
+        assert first.is_sensitive_field("password")
+        assert not first.is_sensitive_field("email")
+        assert first.is_optional_field("age")
+
+    def test_independent_of_input_and_output(self, sample_schema):
+        data = json.loads(json.dumps(sample_schema))
+        schema = Schema(data)
+        data["fields"]["name"]["type"] = "integer"
+        data["required_fields"].append("age")
+        schema.to_dict()["fields"]["email"]["type"] = "integer"
+
+        assert schema.to_dict() == sample_schema
+        assert schema.get_field_type("name") == "string"
+        assert schema.get_required_fields() == ["name", "email", "password"]
+
+    def test_no_instance_dict(self, sample_schema):
+        schema = Schema(sample_schema)
+
+        assert not hasattr(schema, "__dict__")
+
+    def test_pickle(self, sample_schema):
+        schema = pickle.loads(pickle.dumps(Schema(sample_schema)))
+
+        assert schema.to_dict() == sample_schema
+        assert schema._fields["name"] is intern_field(sample_schema["fields"]["name"])
+
+
+class TestLazySchema:
+    """Tests for schemas created from raw JSON."""
+
+    def test_parsed_on_first_use(self, sample_schema):
+        schema = Schema.from_json(json.dumps(sample_schema).encode())
+
+        assert schema._source is not None
+        assert schema.to_dict() == sample_schema
+        assert schema.to_json() == json.dumps(sample_schema, indent=2)
+        assert schema._source is not None  # to_dict() alone does not build it
+
+        assert schema.get_field_type("age") == "integer"
+        assert schema._source is None
+        assert schema.is_sensitive_field("password")
+        assert schema.validate({"name": "a", "email": "b"}) == ["Missing required field: password"]
+
+    def test_str_and_bytearray(self, sample_schema):
+        for raw in (json.dumps(sample_schema), bytearray(json.dumps(sample_schema).encode())):
+            assert Schema.from_json(raw).get_required_fields() == ["name", "email", "password"]
+
+    def test_invalid_json_fails_on_use(self):
+        schema = Schema.from_json(b"{not json")
+
+        with pytest.raises(ValueError):
+            schema.get_required_fields()
+
+    def test_pickle_stays_lazy(self, sample_schema):
+        raw = json.dumps(sample_schema).encode()
+        schema = pickle.loads(pickle.dumps(Schema.from_json(raw)))
+
+        assert schema._json_bytes() == raw
+        assert schema.to_dict() == sample_schema
+
+    sample_schema = TestSchema.sample_schema
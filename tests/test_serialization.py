@@ -0,0 +1,70 @@
+"""
+Tests for the pluggable JSON backend.
+"""
+
+import json
+
+import pytest
+import responses
+
+from lynkr.exceptions import ConfigurationError
+from lynkr.utils import serialization
+from lynkr.utils.http import HttpClient
+
+
+def installed_backends():
+    names = []
+    for name in serialization.BACKENDS:
+        try:
+            serialization.set_backend(name)
+        except ConfigurationError:
+            continue
+        names.append(name)
+    serialization.set_backend()
+    return names
+
+
+@pytest.fixture(params=installed_backends())
+def backend(request):
+    previous = serialization.get_backend().name
+    yield serialization.set_backend(request.param)
+    serialization.set_backend(previous)
+
+
+class TestSerialization:
+    """Tests for the serialization module."""
+
+    def test_round_trip(self, backend):
+        payload = {"ref_id": "ref_1", "schema": {"fields": {"name": {"value": "Zoë / 東京"}}}, "n": [1, 2.5, None, True]}
+        encoded = serialization.dumps(payload)
+
+        assert isinstance(encoded, bytes)
+        assert json.loads(encoded) == payload
+        assert serialization.loads(encoded) == payload
+        assert serialization.loads(bytearray(encoded)) == payload
+        assert serialization.loads(encoded.decode()) == payload
+
+    def test_matches_stdlib_for_edge_cases(self, backend):
+        payload = {1: "int key", "big": 2 ** 70}
+        assert json.loads(serialization.dumps(payload)) == json.loads(json.dumps(payload))
+
+    def test_invalid_json_raises_value_error(self, backend):
+        with pytest.raises(ValueError):
+            serialization.loads(b"{not json")
+
+    def test_unknown_backend(self):
+        with pytest.raises(ConfigurationError):
+            serialization.set_backend("yaml")
+
+    @responses.activate
+    def test_http_body_sent_as_bytes(self, backend):
+        responses.add(responses.POST, "https://api.lynkr.com/echo", json={"ok": True})
+
+        result = HttpClient().post("https://api.lynkr.com/echo", json={"a": "b"}, headers={"X-Test": "1"})
+
+        request = responses.calls[0].request
+        assert result == {"ok": True}
+        assert isinstance(request.body, bytes)
+        assert json.loads(request.body) == {"a": "b"}
+        assert request.headers["Content-Type"] == "application/json"
+        assert request.headers["X-Test"] == "1"
@@ -0,0 +1,119 @@
+"""
+Tests for incremental decryption of execute responses.
+"""
+
+import base64
+import json
+import os
+
+import pytest
+from cryptography.exceptions import InvalidTag
+
+from lynkr.crypto import encrypt_with_aes
+from lynkr.exceptions import ApiError
+from lynkr.utils.streaming import Base64StreamDecoder, EnvelopeScanner, ResponseStreamDecoder
+
+AES_KEY = b"k" * 32
+
+
+def encrypted_body(plaintext, key=AES_KEY, order=("payload", "iv", "tag"), escape_slashes=False):
+    """Build an encrypted execute response body with the data fields in ``order``."""
+    ciphertext, iv, tag = encrypt_with_aes(plaintext, key)
+    fields = {
+        "payload": base64.b64encode(ciphertext).decode(),
+        "iv": base64.b64encode(iv).decode(),
+        "tag": base64.b64encode(tag).decode(),
+    }
+    body = json.dumps({"status": "ok", "data": {k: fields[k] for k in order}, "meta": [1, {"a": "b"}]})
+    if escape_slashes:
+        body = body.replace("/", "\\/")
+    return body.encode()
+
+
+def split(body, size):
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def decode(body, size, key=AES_KEY):
+    decoder = ResponseStreamDecoder(key)
+    out = b"".join(decoder.feed(chunk) for chunk in split(body, size))
+    return out + decoder.close(), decoder
+
+
+class TestEnvelopeScanner:
+    """Tests for the EnvelopeScanner class."""
+
+    def test_streams_only_the_payload(self):
+        body = b'{"data": {"payload": "abc\\/def", "iv": "x\\"y"}, "other": "payload"}'
+        scanner = EnvelopeScanner()
+        pieces = []
+        for chunk in split(body, 1):
+            pieces.extend(scanner.feed(chunk))
+
+        assert b"".join(pieces) == b"abc/def"
+        assert scanner.captured == {("data", "iv"): 'x"y'}
+        assert scanner.document() == {"data": {"payload": "", "iv": 'x"y'}, "other": "payload"}
+
+    def test_nested_payload_key_is_not_streamed(self):
+        scanner = EnvelopeScanner()
+        pieces = scanner.feed(b'{"result": {"data": {"payload": "keep"}}, "data": [{"payload": "x"}]}')
+
+        assert pieces == []
+        assert not scanner.streamed
+        assert scanner.document()["result"] == {"data": {"payload": "keep"}}
+
+
+class TestBase64StreamDecoder:
+    """Tests for the Base64StreamDecoder class."""
+
+    def test_arbitrary_splits(self):
+        data = os.urandom(1001)
+        encoded = base64.b64encode(data)
+        for size in (1, 3, 5, 64):
+            decoder = Base64StreamDecoder()
+            out = b"".join(decoder.decode(chunk) for chunk in split(encoded, size))
+            assert out + decoder.finalize() == data
+
+
+class TestResponseStreamDecoder:
+    """Tests for the ResponseStreamDecoder class."""
+
+    @pytest.mark.parametrize("size", [1, 7, 4096])
+    def test_round_trip(self, size):
+        plaintext = json.dumps({"rows": list(range(2000))}).encode()
+        out, decoder = decode(encrypted_body(plaintext, escape_slashes=True), size)
+
+        assert out == plaintext
+        assert decoder.encrypted
+        assert decoder.envelope["status"] == "ok"
+
+    def test_iv_after_payload(self):
+        plaintext = b"x" * 5000
+        out, _ = decode(encrypted_body(plaintext, order=("payload", "tag", "iv")), 100)
+        assert out == plaintext
+
+    def test_yields_plaintext_before_the_end(self):
+        plaintext = b"y" * 100000
+        body = encrypted_body(plaintext, order=("iv", "tag", "payload"))
+        decoder = ResponseStreamDecoder(AES_KEY)
+
+        first = decoder.feed(body[: len(body) // 2])
+
+        assert 0 < len(first) < len(plaintext)
+        assert plaintext.startswith(first)
+
+    def test_tampered_tag(self):
+        body = encrypted_body(b"secret", key=b"z" * 32)
+        with pytest.raises(InvalidTag):
+            decode(body, 16)
+
+    def test_unencrypted_response(self):
+        out, decoder = decode(b'{"data": {"ok": true}}', 4)
+
+        assert out == b""
+        assert not decoder.encrypted
+        assert decoder.envelope == {"data": {"ok": True}}
+
+    def test_missing_tag(self):
+        with pytest.raises(ApiError):
+            decode(b'{"data": {"payload": "AAAA", "iv": "AAAAAAAAAAAAAAAA"}}', 8)
@@ -0,0 +1,153 @@
+"""
+Tests for the local stand-in server.
+"""
+
+import asyncio
+import time
+
+import pytest
+import requests
+
+from lynkr.crypto import unregister_public_key
+from lynkr.exceptions import ApiError
+from lynkr.testing import DEFAULT_SCHEMA, EXECUTE_PATH, StandInServer
+from lynkr.utils.retry import RetryPolicy
+
+KEY_ID = "test-stand-in"
+
+
+@pytest.fixture
+def make_server(rsa_private_key):
+    """Start stand-in servers with the test keypair, stopping them afterwards."""
+    servers = []
+
+    def make(**kwargs):
+        server = StandInServer(private_key=rsa_private_key, key_id=KEY_ID, **kwargs).start()
+        servers.append(server)
+        return server
+
+    yield make
+    for server in servers:
+        server.stop()
+    unregister_public_key(KEY_ID)
+
+
+class TestStandInServer:
+    """Tests for StandInServer."""
+
+    def test_get_schema_and_execute(self, make_server):
+        server = make_server(service="resend")
+        with server.client() as client:
+            ref_id, schema, service = client.get_schema("send an email")
+            result = client.execute({"to": "a@example.com"})
+
+        assert ref_id == "ref_1"
+        assert schema.to_dict() == DEFAULT_SCHEMA
+        assert service == "resend"
+        assert result == {"echo": {"ref_id": "ref_1", "schema": {"fields": {"to": {"value": "a@example.com"}}}}, "via": "json"}
+        assert server.stats() == {"schema": 1, "execute": 1, "errors": 0}
+
+    def test_latency(self, make_server):
+        server = make_server(latency=0.05)
+        with server.client() as client:
+            started = time.perf_counter()
+            client.get_schema("send an email")
+
+        assert time.perf_counter() - started >= 0.05
+
+    def test_error_rate(self, make_server):
+        server = make_server(error_rate=1.0, error_status=429)
+        with server.client(retry=RetryPolicy(max_attempts=1)) as client:
+            with pytest.raises(ApiError) as exc_info:
+                client.get_schema("send an email")
+
+        assert exc_info.value.status_code == 429
+        assert server.stats()["errors"] == 1
+
+    def test_partial_error_rate_is_seeded(self, make_server):
+        server = make_server(error_rate=0.5, seed=1)
+        with server.client(retry=RetryPolicy(max_attempts=1)) as client:
+            outcomes = []
+            for _ in range(40):
+                try:
+                    client.get_schema("send an email")
+                    outcomes.append(True)
+                except ApiError:
+                    outcomes.append(False)
+
+        assert 5 < outcomes.count(False) < 35
+        assert server.stats()["errors"] == outcomes.count(False)
+
+    @pytest.mark.parametrize("binary_transport", [False, True])
+    def test_response_size_and_compression(self, make_server, binary_transport):
+        server = make_server(response_size=200_000, compression="gzip")
+        with server.client(binary_transport=binary_transport, compression="gzip") as client:
+            result = client.execute({"body": "x" * 5000}, ref_id="ref_1", compress=True)
+
+        assert len(result["padding"]) == 200_000
+        assert result["via"] == ("binary" if binary_transport else "json")
+
+    def test_requires_api_key(self, make_server):
+        server = make_server()
+        response = requests.post(server.url + EXECUTE_PATH, json={})
+
+        assert response.status_code == 401
+
+    def test_malformed_execute(self, make_server):
+        server = make_server()
+        response = requests.post(server.url + EXECUTE_PATH, json={}, headers={"Authorization": "Bearer x"})
+
+        assert response.status_code == 400
+
+    def test_concurrent_clients(self, make_server):
+        server = make_server(latency=0.01)
+        with server.client(pool_maxsize=8) as client:
+            results = list(client.execute_many(({"n": i} for i in range(32)), ref_id="ref_1", max_concurrency=8))
+
+        assert all(result.ok for result in results)
+        assert server.stats()["execute"] == 32
+
+    def test_async_client(self, make_server):
+        pytest.importorskip("httpx")
+        server = make_server()
+
+        async def run():
+            async with server.async_client() as client:
+                await client.get_schema("send an email")
+                return await asyncio.gather(*(client.execute({"n": i}) for i in range(5)))
+
+        results = asyncio.run(run())
+        assert [result["echo"]["schema"]["fields"]["n"]["value"] for result in results] == list(range(5))
+
+    def test_serve_forever(self, rsa_private_key):
+        import threading
+
+        server = StandInServer(private_key=rsa_private_key, key_id=KEY_ID)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        try:
+            with server.client() as client:
+                ref_id, _, _ = client.get_schema("send an email")
+        finally:
+            server.stop()
+            thread.join()
+            unregister_public_key(KEY_ID)
+
+        assert ref_id == "ref_1"
+        assert not thread.is_alive()
+
+    def test_servers_side_by_side(self):
+        from lynkr.crypto import public_key_fingerprint
+
+        with StandInServer(service="first") as first, StandInServer(service="second") as second:
+            try:
+                with first.client() as first_client, second.client() as second_client:
+                    first_client.get_schema("send an email")
+                    second_client.get_schema("send an email")
+
+                    assert first_client.key_id != second_client.key_id
+                    assert first_client.execute({"to": "a@example.com"})["via"] == "json"
+                    assert second_client.execute({"to": "b@example.com"})["via"] == "json"
+            finally:
+                for server in (first, second):
+                    unregister_public_key(public_key_fingerprint(server.private_key.public_key()))